@@ -0,0 +1,51 @@
+"""
+Compares decoding atomic values with the previous format-string functions (slicing the data for each value)
+and with the precompiled ``struct.Struct`` codec in ``bytes_`` (unpacking at an offset).
+
+    python -m benchmarks.bench_atomic_codec
+"""
+
+import struct
+import timeit
+
+from pycomm3.bytes_ import unpack_dint, unpack_real, unpack_array
+from pycomm3.packets.responses import parse_read_reply
+
+ELEMENTS = 1000
+DINT_REPLY = b'\xc4\x00' + struct.pack(f'<{ELEMENTS}i', *range(ELEMENTS))
+REAL_REPLY = b'\xca\x00' + struct.pack(f'<{ELEMENTS}f', *(i / 4 for i in range(ELEMENTS)))
+
+
+def old_unpack_dint(st):
+    return int(struct.unpack('<i', st[0:4])[0])
+
+
+def old_unpack_real(st):
+    return float(struct.unpack('<f', st[0:4])[0])
+
+
+def old_parse_array(data, func, size=4):
+    data = data[2:]
+    return [func(data[i:i + size]) for i in range(0, len(data), size)]
+
+
+def main(number=200):
+    assert old_parse_array(DINT_REPLY, old_unpack_dint) == parse_read_reply(DINT_REPLY, None, ELEMENTS)[0]
+    assert old_parse_array(REAL_REPLY, old_unpack_real) == unpack_array('REAL', REAL_REPLY, ELEMENTS, 2)
+
+    tests = (
+        ('single DINT', lambda: old_unpack_dint(DINT_REPLY[2:6]), lambda: unpack_dint(DINT_REPLY, 2)),
+        ('single REAL', lambda: old_unpack_real(REAL_REPLY[2:6]), lambda: unpack_real(REAL_REPLY, 2)),
+        (f'DINT[{ELEMENTS}] reply', lambda: old_parse_array(DINT_REPLY, old_unpack_dint),
+         lambda: parse_read_reply(DINT_REPLY, None, ELEMENTS)),
+        (f'REAL[{ELEMENTS}] reply', lambda: old_parse_array(REAL_REPLY, old_unpack_real),
+         lambda: parse_read_reply(REAL_REPLY, None, ELEMENTS)),
+    )
+    for name, old, new in tests:
+        old_time = timeit.timeit(old, number=number) / number
+        new_time = timeit.timeit(new, number=number) / number
+        print(f'{name}: previous {old_time * 1e6:.2f} us, codec {new_time * 1e6:.2f} us ({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
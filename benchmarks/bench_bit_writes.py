@@ -0,0 +1,44 @@
+"""
+Counts the Read Modify Write services and packets needed to write a batch of bits, like acknowledging alarms,
+spread over BOOL arrays and the bits of integer tags.  Nothing is sent.
+
+    python -m benchmarks.bench_bit_writes
+"""
+
+import timeit
+
+from pycomm3 import LogixDriver
+from pycomm3.packets import MultiServiceRequestPacket
+
+TAG_LIST = {
+    'Alarm_Acks': {'tag_name': 'Alarm_Acks', 'instance_id': 1, 'tag_type': 'atomic', 'data_type': 'DWORD',
+                   'dim': 1, 'dimensions': [64, 0, 0]},
+    **{f'Status_{i}': {'tag_name': f'Status_{i}', 'instance_id': i + 2, 'tag_type': 'atomic',
+                       'data_type': data_type, 'dim': 0}
+       for i, data_type in enumerate(('SINT', 'INT', 'DINT', 'LINT') * 25)},
+}
+
+BITS = [*(f'Alarm_Acks[{i}]' for i in range(0, 2048, 2)),
+        *(f'Status_{i}.{bit}' for i in range(100) for bit in range(0, 8, 2))]
+
+
+def main(number=20):
+    for large_packets in (False, True):
+        plc = LogixDriver('0.0.0.0', init_info=False, init_tags=False, large_packets=large_packets)
+        plc._tags = TAG_LIST
+
+        def build():
+            parsed = plc._parse_requested_tags(BITS)
+            for tag_data in parsed.values():
+                tag_data['value'] = True
+            return plc._write_build_requests(parsed)
+
+        requests, bit_writes = build()
+        services = sum(len(r.tags) if isinstance(r, MultiServiceRequestPacket) else 1 for r in requests)
+        build_time = timeit.timeit(build, number=number) / number
+        print(f'connection size {plc.connection_size}, {len(BITS)} bits: {services} services in {len(requests)} '
+              f'packets, built in {build_time * 1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
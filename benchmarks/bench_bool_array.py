@@ -0,0 +1,46 @@
+"""
+Compares decoding a 10,240 bit BOOL array reply with the previous ``bin()`` based ``dword_to_bool_array`` (called for
+each DWORD), with the byte lookup table now used by ``parse_read_reply``, and as a ``BitSet`` of the reply bytes.
+
+    python -m benchmarks.bench_bool_array
+"""
+
+import random
+import struct
+import timeit
+from itertools import chain
+
+from pycomm3.packets.responses import parse_read_reply
+
+DWORDS = 320
+DWORD_REPLY = b'\xd3\x00' + struct.pack(f'<{DWORDS}I', *(random.getrandbits(32) for _ in range(DWORDS)))
+
+
+def old_dword_to_bool_array(dword):
+    bits = [x == '1' for x in bin(dword)[2:]]
+    bools = [False for _ in range(32 - len(bits))] + bits
+    bools.reverse()
+    return bools
+
+
+def old_parse(data):
+    data = data[2:]
+    values = [struct.unpack('<I', data[i:i + 4])[0] for i in range(0, len(data), 4)]
+    return list(chain.from_iterable(old_dword_to_bool_array(val) for val in values))
+
+
+def main(number=200):
+    expected = old_parse(DWORD_REPLY)
+    assert parse_read_reply(DWORD_REPLY, None, DWORDS)[0] == expected
+    assert parse_read_reply(DWORD_REPLY, None, DWORDS, bitset=True)[0] == expected
+
+    old_time = timeit.timeit(lambda: old_parse(DWORD_REPLY), number=number) / number
+    for name, bitset in (('table', False), ('bitset', True)):
+        new_time = timeit.timeit(lambda: parse_read_reply(DWORD_REPLY, None, DWORDS, bitset=bitset),
+                                 number=number) / number
+        print(f'BOOL[{DWORDS * 32}] {name}: previous {old_time * 1e6:.1f} us, {new_time * 1e6:.1f} us '
+              f'({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Compares the number of Write Tag Fragmented requests needed to write large arrays with fragments sized by the
+previous estimate (``connection_size // (element size + 4)`` elements) and by the exact request overhead.
+
+    python -m benchmarks.bench_fragment_size
+"""
+
+from math import ceil
+
+from pycomm3 import LogixDriver
+from pycomm3.const import DATA_TYPE_SIZE
+
+ELEMENTS = 10000
+TAG_LIST = {f'{data_type}_Array': {'tag_name': f'{data_type}_Array', 'instance_id': i + 1, 'tag_type': 'atomic',
+                                   'data_type': data_type, 'dim': 1, 'dimensions': [ELEMENTS, 0, 0]}
+            for i, data_type in enumerate(('SINT', 'INT', 'DINT', 'REAL', 'LINT'))}
+
+
+def main():
+    for large_packets in (False, True):
+        plc = LogixDriver('0.0.0.0', init_info=False, init_tags=False, large_packets=large_packets)
+        plc._tags = TAG_LIST
+        for tag, tag_info in TAG_LIST.items():
+            element_size = DATA_TYPE_SIZE[tag_info['data_type']]
+            request = plc.new_request('write_tag_fragmented')
+            request.add(tag, bytes(element_size * ELEMENTS), ELEMENTS, tag_info)
+
+            estimated = ceil(ELEMENTS / (plc.connection_size // (element_size + 4)))
+            exact = ceil(element_size * ELEMENTS / request.segment_size)
+            print(f'connection size {plc.connection_size}, {ELEMENTS} {tag_info["data_type"]}s: '
+                  f'{estimated} fragments estimated, {exact} fragments exact')
+
+
+if __name__ == '__main__':
+    main()
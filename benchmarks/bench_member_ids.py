@@ -0,0 +1,39 @@
+"""
+Compares the number of read services that fit in a Multiple Service Packet when structure members are
+addressed by name (symbolic segments) and by member id.  Packets are limited by both the request and reply sizes.
+
+    python -m benchmarks.bench_member_ids
+"""
+
+from pycomm3 import LogixDriver
+
+MEMBERS = ['Speed_Setpoint_RPM', 'Actual_Speed_RPM', 'Motor_Current_Amps', 'Fault_Code_Active', 'Run_Hours_Total']
+UDT = {'name': 'MotorData', 'attributes': MEMBERS, 'template': {'structure_size': 20},
+       'internal_tags': {name: {'tag_type': 'atomic', 'data_type': 'DINT', 'offset': i * 4, 'array': 0}
+                         for i, name in enumerate(MEMBERS)}}
+
+TAG_LIST = {f'Conveyor_Motor_{i}': {'tag_name': f'Conveyor_Motor_{i}', 'instance_id': i + 1, 'tag_type': 'struct',
+                                    'data_type': UDT, 'dim': 0}
+            for i in range(200)}
+
+TAGS = [f'Conveyor_Motor_{i}.{member}' for i in range(200) for member in MEMBERS]
+
+
+def services_per_packet(plc):
+    requests = plc._read_build_multi_requests(plc._parse_requested_tags(TAGS))
+    return len(requests), len(TAGS) / len(requests)
+
+
+def main():
+    for large_packets in (False, True):
+        plc = LogixDriver('0.0.0.0', init_info=False, init_tags=False, large_packets=large_packets)
+        plc._tags = TAG_LIST
+        for use_member_ids in (False, True):
+            plc.use_member_ids = use_member_ids
+            packets, per_packet = services_per_packet(plc)
+            print(f'connection size {plc.connection_size}, use_member_ids={use_member_ids}: '
+                  f'{len(TAGS)} reads in {packets} packets, {per_packet:.1f} services per packet')
+
+
+if __name__ == '__main__':
+    main()
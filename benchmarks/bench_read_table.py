@@ -0,0 +1,34 @@
+"""
+Compares turning the results of reading 5000 REAL tags into columns, from the list of ``Tag`` returned by ``read``
+(what callers loading results into a dataframe had to do) and with ``read_table``, which fills the columns
+directly from the driver's result records.  Nothing is sent.
+
+    python -m benchmarks.bench_read_table
+"""
+
+import time
+import timeit
+
+from pycomm3.clx import _TagResult
+from pycomm3.table import PacketTimes, table_columns
+
+TAGS = 5000
+
+
+def main(number=50):
+    packet = PacketTimes(0, time.time(), time.time(), time.perf_counter(), time.perf_counter())
+    results = [_TagResult(f'Temp_{i}', i / 4, 'REAL', None, packet) for i in range(TAGS)]
+
+    def from_tags():
+        tags = [result.to_tag() for result in results]
+        return {'tag': [tag.tag for tag in tags], 'value': [tag.value for tag in tags],
+                'type': [tag.type for tag in tags], 'error': [tag.error for tag in tags]}
+
+    from_tags_time = timeit.timeit(from_tags, number=number) / number
+    table_time = timeit.timeit(lambda: table_columns(results), number=number) / number
+    print(f'{TAGS} REAL tags: Tags to columns {from_tags_time * 1000:.2f} ms, read_table columns '
+          f'{table_time * 1000:.2f} ms ({from_tags_time / table_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark for encoding tag request paths, compares the cached encoding with encoding every request.
+
+    python -m benchmarks.bench_request_path
+"""
+
+import timeit
+
+from pycomm3.packets.requests import _create_tag_rp, _encode_tag_rp
+
+TAG_LIST = {f'Tag{i}': {'instance_id': i} for i in range(500)}
+TAGS = [
+    *(f'Tag{i}' for i in range(0, 500, 5)),
+    *(f'Tag{i}.Member{i % 7}' for i in range(0, 500, 5)),
+    *(f'Tag{i}[{i}].Status.Fault' for i in range(0, 500, 5)),
+    *(f'Ary{i}[{i},{i + 1},{i * 300}]' for i in range(0, 100, 5)),
+]
+
+
+def encode_all(use_instance_ids=True):
+    for tag in TAGS:
+        _create_tag_rp(tag, TAG_LIST, use_instance_ids)
+
+
+def encode_all_uncached(use_instance_ids=True):
+    encode = _encode_tag_rp.__wrapped__
+    for tag in TAGS:
+        base = tag.partition('.')[0]
+        instance_id = TAG_LIST[base]['instance_id'] if use_instance_ids and base in TAG_LIST else None
+        encode(tag, instance_id)
+
+
+def main(number=200):
+    for use_instance_ids in (True, False):
+        uncached = timeit.timeit(lambda: encode_all_uncached(use_instance_ids), number=number)
+        _encode_tag_rp.cache_clear()
+        cached = timeit.timeit(lambda: encode_all(use_instance_ids), number=number)
+        per_tag = 1e6 / (number * len(TAGS))
+        print(f'use_instance_ids={use_instance_ids}: '
+              f'uncached {uncached * per_tag:.2f} us/tag, cached {cached * per_tag:.2f} us/tag '
+              f'({uncached / cached:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
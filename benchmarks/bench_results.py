@@ -0,0 +1,67 @@
+"""
+Compares handling the results of 5000 services with the previous per-service dicts and ``Tag`` results (with
+``_replace`` for writes), and with the slotted ``Service`` and result records now used inside the driver, converted
+to a ``Tag`` for each tag or to ``TagColumns``.  Only the result handling is timed, nothing is sent or parsed.
+
+    python -m benchmarks.bench_results
+"""
+
+import sys
+import timeit
+
+from pycomm3 import Tag
+from pycomm3.clx import _TagResult, _result_columns
+from pycomm3.packets.requests import Service
+
+SERVICES = 5000
+
+
+def old_reads():
+    services = [{'tag': f'Tag_{i}', 'elements': 1, 'tag_info': None, 'rp': b'', 'service': 'read'}
+                for i in range(SERVICES)]
+    for service in services:
+        service['service_status'] = 0
+        service['value'] = 1
+        service['data_type'] = 'DINT'
+    return [Tag(service['tag'], service['value'], service['data_type']) for service in services]
+
+
+def new_services():
+    services = [Service(f'Tag_{i}', 1, None, b'', 'read') for i in range(SERVICES)]
+    for service in services:
+        service.service_status = 0
+        service.value = 1
+        service.data_type = 'DINT'
+    return [_TagResult(service.tag, service.value, service.data_type) for service in services]
+
+
+def old_writes():
+    results = [Tag(f'Tag_{i}', 1, 'DINT') for i in range(SERVICES)]
+    return [result._replace(type=f'{result.type}[2]')._replace(tag=result.tag, value=2) for result in results]
+
+
+def new_writes():
+    results = [_TagResult(f'Tag_{i}', 1, 'DINT') for i in range(SERVICES)]
+    return [_TagResult(result.tag, 2, f'{result.type}[2]', result.error).to_tag() for result in results]
+
+
+def main(number=20):
+    old_service = {'tag': 'Tag_1', 'elements': 1, 'tag_info': None, 'rp': b'', 'service': 'read',
+                   'service_status': 0, 'value': 1, 'data_type': 'DINT'}
+    print(f'service record: dict {sys.getsizeof(old_service)} bytes, '
+          f'Service {sys.getsizeof(Service("Tag_1", 1, None, b"", "read"))} bytes')
+
+    tests = (
+        ('reads as Tags', old_reads, lambda: [result.to_tag() for result in new_services()]),
+        ('reads as TagColumns', old_reads, lambda: _result_columns(new_services())),
+        ('writes', old_writes, new_writes),
+    )
+    for name, old, new in tests:
+        old_time = timeit.timeit(old, number=number) / number
+        new_time = timeit.timeit(new, number=number) / number
+        print(f'{SERVICES} {name}: previous {old_time * 1000:.2f} ms, records {new_time * 1000:.2f} ms '
+              f'({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares decoding and encoding an array of 1000 STRINGs with the previous per-character codec and with
+the ``bytes_`` STRING codec.
+
+    python -m benchmarks.bench_string_codec
+"""
+
+import timeit
+
+from pycomm3.bytes_ import pack_dint, pack_sint, unpack_dint, string_size, encode_strings, decode_strings
+
+ELEMENTS = 1000
+STRING_LENGTH = 82
+SIZE = string_size(STRING_LENGTH)
+VALUES = [f'Serial {i:08} / Lot {i * 7:06} / Station {i % 12}' for i in range(ELEMENTS)]
+
+
+def old_parse_string(data):
+    str_len = unpack_dint(data)
+    str_data = data[4:4 + str_len]
+    return ''.join(chr(v + 256) if v < 0 else chr(v) for v in str_data)
+
+
+def old_string_to_sint_array(string, string_len):
+    sint_array = [b'\x00' for _ in range(string_len)]
+    for i, s in enumerate(string[:string_len]):
+        unsigned = ord(s)
+        sint_array[i] = pack_sint(unsigned - 256 if unsigned > 127 else unsigned)
+    return b''.join(sint_array)
+
+
+def old_decode(data):
+    return [old_parse_string(data[i:i + SIZE]) for i in range(0, len(data), SIZE)]
+
+
+def old_encode(values):
+    string_bytes = b''
+    for val in values:
+        str_bytes = pack_dint(len(val)) + old_string_to_sint_array(val, STRING_LENGTH)
+        string_bytes += str_bytes + b'\x00' * (len(str_bytes) % 4)
+    return string_bytes
+
+
+def main(number=20):
+    data = encode_strings(VALUES, STRING_LENGTH, SIZE)
+    assert old_encode(VALUES) == data
+    assert old_decode(data) == decode_strings(data, ELEMENTS, SIZE) == VALUES
+
+    for name, old, new in (('decode', lambda: old_decode(data), lambda: decode_strings(data, ELEMENTS, SIZE)),
+                           ('encode', lambda: old_encode(VALUES), lambda: encode_strings(VALUES, STRING_LENGTH, SIZE))):
+        old_time = timeit.timeit(old, number=number) / number
+        new_time = timeit.timeit(new, number=number) / number
+        print(f'{name} {ELEMENTS} STRINGs: previous {old_time * 1000:.2f} ms, '
+              f'codec {new_time * 1000:.2f} ms ({old_time / new_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
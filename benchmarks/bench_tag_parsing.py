@@ -0,0 +1,64 @@
+"""
+Micro-benchmark for parsing tag requests, compares parsing with and without the address and tag request caches.
+
+    python -m benchmarks.bench_tag_parsing
+"""
+
+import timeit
+
+from pycomm3 import LogixDriver
+from pycomm3.address import parse_tag_address
+
+UDT = {'name': 'Motor', 'attributes': ['Speed', 'Fault', 'Hist'],
+       'internal_tags': {'Speed': {'tag_type': 'atomic', 'data_type': 'REAL', 'offset': 0},
+                         'Fault': {'tag_type': 'atomic', 'data_type': 'DINT', 'offset': 4},
+                         'Hist': {'tag_type': 'atomic', 'data_type': 'DINT', 'offset': 8, 'array': 10}},
+       'template': {'structure_size': 48}}
+
+TAG_LIST = {
+    **{f'Dint{i}': {'tag_name': f'Dint{i}', 'tag_type': 'atomic', 'data_type': 'DINT', 'dim': 0}
+       for i in range(2000)},
+    **{f'Motor{i}': {'tag_name': f'Motor{i}', 'tag_type': 'struct', 'data_type': UDT, 'dim': 0}
+       for i in range(2000)},
+    **{f'Program:Main.Ary{i}': {'tag_name': f'Program:Main.Ary{i}', 'tag_type': 'atomic', 'data_type': 'DINT',
+                                'dim': 1, 'dimensions': [100, 0, 0]}
+       for i in range(1000)},
+}
+
+TAGS = [
+    *(f'Dint{i}' for i in range(2000)),
+    *(f'Dint{i}.{i % 32}' for i in range(2000)),
+    *(f'Motor{i}.Speed' for i in range(2000)),
+    *(f'Motor{i}.Hist[{i % 10}]' for i in range(2000)),
+    *(f'Program:Main.Ary{i}[{i % 90}]{{10}}' for i in range(1000)),
+    *(f'Program:Main.Ary{i}[{i % 90}].3' for i in range(1000)),
+]
+
+
+def main(number=10):
+    plc = LogixDriver('0.0.0.0', init_info=False, init_tags=False)
+    plc._tags = TAG_LIST
+
+    def clear_caches(addresses=True):
+        plc._tag_request_cache = (None, {})
+        if addresses:
+            parse_tag_address.cache_clear()
+
+    def timed(clear=None):
+        def run():
+            if clear is not None:
+                clear()
+            plc._parse_requested_tags(TAGS)
+        return min(timeit.repeat(run, number=1, repeat=number))
+
+    results = {
+        'uncached': timed(clear_caches),
+        'addresses cached': timed(lambda: clear_caches(addresses=False)),
+        'cached': timed(),
+    }
+
+    print(f'{len(TAGS)} tags: ' + ', '.join(f'{name} {time * 1000:.1f} ms' for name, time in results.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares the time spent preparing the requests for writing 500 tags with ``write`` (parsing the tags and building
+the requests every call) and with a plan from ``prepare_write`` (only packing the new values).  Nothing is sent.
+
+    python -m benchmarks.bench_write_plan
+"""
+
+import timeit
+
+from pycomm3 import LogixDriver
+
+TAG_LIST = {
+    **{f'Setpoint_{i}': {'tag_name': f'Setpoint_{i}', 'instance_id': i + 1, 'tag_type': 'atomic',
+                         'data_type': 'REAL', 'dim': 0}
+       for i in range(400)},
+    **{f'Recipe_{i}': {'tag_name': f'Recipe_{i}', 'instance_id': i + 1000, 'tag_type': 'atomic',
+                       'data_type': 'DINT', 'dim': 1, 'dimensions': [20, 0, 0]}
+       for i in range(100)},
+}
+
+TAGS = [*(f'Setpoint_{i}' for i in range(400)), *(f'Recipe_{i}{{20}}' for i in range(100))]
+
+
+def values(cycle):
+    return [*(cycle + i / 10 for i in range(400)), *([cycle + i] * 20 for i in range(100))]
+
+
+def main(number=50):
+    plc = LogixDriver('0.0.0.0', init_info=False, init_tags=False)
+    plc._tags = TAG_LIST
+    new_values = values(1)
+
+    def build():
+        parsed = plc._parse_requested_tags(TAGS)
+        for tag, value in zip(TAGS, new_values):
+            parsed[tag]['value'] = value
+        return plc._write_build_requests(parsed)
+
+    plan = plc.prepare_write(*TAGS)
+    write_time = timeit.timeit(build, number=number) / number
+    plan_time = timeit.timeit(lambda: plan._pack(new_values), number=number) / number
+    print(f'{len(TAGS)} tags in {len(plan._requests)} requests: write {write_time * 1000:.2f} ms, '
+          f'plan {plan_time * 1000:.2f} ms ({write_time / plan_time:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
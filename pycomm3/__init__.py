@@ -27,7 +27,7 @@
 __version_info__ = (0, 5, 3)
 __version__ = '.'.join(f'{x}' for x in __version_info__)
 
-from typing import NamedTuple, Any, Union, Optional
+from typing import NamedTuple, Any, Union, Optional, List
 
 
 class PycommError(Exception):
@@ -68,4 +68,22 @@ class Tag(NamedTuple):
                f"type={_mkstr(self.type)}, error={_mkstr(self.error)})"
 
 
+from .table import PacketTimes
+
+
+class TagColumns(NamedTuple):
+    """
+    The results of reading many tags with a list for each field of ``Tag``, the same index of each list is for the
+    same tag.  Returned by ``read`` with ``columnar=True``.  ``packet`` is when the request each tag was read in was
+    sent and its reply received, ``None`` if the tag was not sent.
+    """
+    tag: List[str]
+    value: List[Any]
+    type: List[Optional[str]]
+    error: List[Optional[str]]
+    packet: List[Optional[PacketTimes]]
+
+
+from .bitset import BitSet
 from .clx import LogixDriver
+from .multi_plc import MultiPLCReader, PLCReadResult
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# address.py - Parsing of Logix tag addresses
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+from . import RequestError
+
+ADDRESS_CACHE_SIZE = 16384  # max number of parsed addresses to cache
+
+_ADDRESS = re.compile(r'''
+    (?P<tag>
+        (?P<program>Program:[A-Za-z_]\w*\.)?
+        [A-Za-z_][\w:]*(?:\[\d+(?:,\d+){0,2}\])?    # base tag, module tags like Local:1:I contain colons
+        (?:\.[A-Za-z_]\w*(?:\[\d+(?:,\d+){0,2}\])?)*  # members
+    )
+    (?:\.(?P<bit>\d{1,2}))?
+    (?:{(?P<elements>\d+)})?
+''', re.VERBOSE)
+
+
+class TagAddress(NamedTuple):
+    #: the tag without any bit or element count, e.g. ``'Program:Main.Motors[1].Status'``
+    tag: str
+    #: name of the base tag, including the program if program-scoped, e.g. ``'Program:Main.Motors'``
+    base: str
+    #: indexes of the base tag, e.g. ``(1, )``
+    base_index: Tuple[int, ...]
+    #: each member of the tag as ``(name, indexes)``, e.g. ``(('Status', ()), )``
+    members: Tuple[Tuple[str, Tuple[int, ...]], ...]
+    #: bit number if addressing a bit of an integer, e.g. ``'DINT1.3'``
+    bit: Optional[int]
+    #: number of elements requested with the ``{n}`` suffix, defaults to 1
+    elements: int
+    #: name of the program if the tag is program-scoped
+    program: Optional[str] = None
+
+    @property
+    def index(self) -> Tuple[int, ...]:
+        """
+        Indexes of the last segment of the tag
+        """
+        return self.members[-1][1] if self.members else self.base_index
+
+    @property
+    def array_tag(self) -> str:
+        """
+        The tag without the indexes of the last segment, e.g. ``'Motors[1].Values'`` for ``'Motors[1].Values[3]'``
+        """
+        return self.tag[:self.tag.rfind('[')] if self.tag.endswith(']') else self.tag
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def parse_tag_address(address: str) -> TagAddress:
+    """
+    Parses a tag address like the ones used by :meth:`~pycomm3.LogixDriver.read`,
+    ``[Program:<program>.]<tag>[<indexes>][.<member>[<indexes>]...][.<bit>][{<elements>}]``.
+    Results are cached, so parsing the same address again is only a lookup.
+
+    :param address: a tag address, e.g. ``'Program:Main.Motors[1].Status.3'``
+    :return: the parsed address
+    :raises RequestError: if the address is not valid
+    """
+    match = _ADDRESS.fullmatch(address)
+    if match is None:
+        raise RequestError(f'Invalid tag address: {address}')
+
+    tag, program, bit, elements = match.group('tag', 'program', 'bit', 'elements')
+    if elements is not None and not int(elements):
+        raise RequestError(f'Invalid element count: {address}')
+    if program is not None:
+        program = program[8:-1]
+
+    # the address has been validated, so it's safe to just split it into segments
+    segments = []
+    for segment in (tag[9 + len(program):] if program else tag).split('.'):
+        if segment[-1] == ']':
+            name, _, index = segment[:-1].partition('[')
+            segments.append((name, tuple(map(int, index.split(',')))))
+        else:
+            segments.append((segment, ()))
+
+    (base, base_index), *members = segments
+    if program is not None:
+        base = f'Program:{program}.{base}'
+
+    return TagAddress(tag, base, base_index, tuple(members), None if bit is None else int(bit),
+                      1 if elements is None else int(elements), program)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+#
+# bitset.py - Compact values for BOOL arrays
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from collections.abc import Sequence
+from itertools import chain
+from typing import Iterator, List, Union
+
+from .bytes_ import BYTE_BITS
+
+
+class BitSet(Sequence):
+    """
+    A compact, read-only array of bools, stored as the bytes read from the PLC.  The first element is the least
+    significant bit of the first byte, the same order as the bits of the DWORDs of a BOOL array.  Indexing and
+    iterating return ``bool`` like the list it replaces, and it compares equal to a list of the same bools.
+
+    Returned for BOOL arrays when the driver is created with ``bitset_bool_arrays=True``.
+    """
+    __slots__ = ('_data', )
+
+    def __init__(self, data: bytes = b''):
+        self._data = bytes(data)
+
+    def __len__(self) -> int:
+        return len(self._data) * 8
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[bool, List[bool]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('BitSet index out of range')
+
+        return bool(self._data[index >> 3] >> (index & 7) & 1)
+
+    def __iter__(self) -> Iterator[bool]:
+        return chain.from_iterable(map(BYTE_BITS.__getitem__, self._data))
+
+    def __bytes__(self) -> bytes:
+        return self._data
+
+    def __eq__(self, other):
+        if isinstance(other, BitSet):
+            return self._data == other._data
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._data)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self._data!r})'
+
+    def count(self, value: bool = True) -> int:
+        """
+        Returns the number of bits set, or not set if ``value`` is False
+        """
+        ones = bin(int.from_bytes(self._data, 'little')).count('1')
+        return ones if value else len(self) - ones
+
+    def indices(self, value: bool = True) -> List[int]:
+        """
+        Returns the indexes of the bits set, or not set if ``value`` is False
+        """
+        return [i for i, bit in enumerate(self) if bit == value]
@@ -25,112 +25,160 @@
 #
 
 import struct
+from itertools import chain
+
+
+_SINT = struct.Struct('b')
+_USINT = struct.Struct('B')
+_INT = struct.Struct('<h')
+_UINT = struct.Struct('<H')
+_DINT = struct.Struct('<i')
+_UDINT = struct.Struct('<I')
+_REAL = struct.Struct('<f')
+_LREAL = struct.Struct('<d')
+_LINT = struct.Struct('<q')
+_ULINT = struct.Struct('<Q')
+_LONG = struct.Struct('<l')
+_ULONG = struct.Struct('<L')
 
 
 def pack_sint(n):
-    return struct.pack('b', n)
+    return _SINT.pack(n)
 
 
 def pack_usint(n):
-    return struct.pack('B', n)
+    return _USINT.pack(n)
 
 
 def pack_int(n):
     """pack 16 bit into 2 bytes little endian"""
-    return struct.pack('<h', n)
+    return _INT.pack(n)
 
 
 def pack_uint(n):
     """pack 16 bit into 2 bytes little endian"""
-    return struct.pack('<H', n)
+    return _UINT.pack(n)
 
 
 def pack_dint(n):
     """pack 32 bit into 4 bytes little endian"""
-    return struct.pack('<i', n)
+    return _DINT.pack(n)
 
 
 def pack_udint(n):
     """pack 32 bit into 4 bytes little endian"""
-    return struct.pack('<I', n)
+    return _UDINT.pack(n)
 
 
 def pack_real(r):
-    """unpack 4 bytes little endian to int"""
-    return struct.pack('<f', r)
+    """pack a float into 4 bytes little endian"""
+    return _REAL.pack(r)
+
+
+def pack_lreal(r):
+    """pack a float into 8 bytes little endian"""
+    return _LREAL.pack(r)
 
 
 def pack_lint(l):
-    """unpack 4 bytes little endian to int"""
-    return struct.pack('<q', l)
+    """pack 64 bit into 8 bytes little endian"""
+    return _LINT.pack(l)
 
 
 def pack_ulint(l):
-    """unpack 4 bytes little endian to int"""
-    return struct.pack('<Q', l)
+    """pack 64 bit into 8 bytes little endian"""
+    return _ULINT.pack(l)
 
 
 def pack_long(l):
-    return struct.pack('<l', l)
+    return _LONG.pack(l)
 
 
 def pack_ulong(l):
-    return struct.pack('<L', l)
+    return _ULONG.pack(l)
 
 
-def unpack_bool(st):
-    return not st[0] == 0
+def unpack_bool(st, offset=0):
+    return st[offset] != 0
 
 
-def unpack_sint(st):
-    return int(struct.unpack('b', bytes([st[0]]))[0])
+def unpack_sint(st, offset=0):
+    return _SINT.unpack_from(st, offset)[0]
 
 
-def unpack_usint(st):
-    return int(struct.unpack('B', bytes([st[0]]))[0])
+def unpack_usint(st, offset=0):
+    return st[offset]
 
 
-def unpack_int(st):
+def unpack_int(st, offset=0):
     """unpack 2 bytes little endian to int"""
-    return int(struct.unpack('<h', st[0:2])[0])
+    return _INT.unpack_from(st, offset)[0]
 
 
-def unpack_uint(st):
+def unpack_uint(st, offset=0):
     """unpack 2 bytes little endian to int"""
-    return int(struct.unpack('<H', st[0:2])[0])
+    return _UINT.unpack_from(st, offset)[0]
 
 
-def unpack_dint(st):
+def unpack_dint(st, offset=0):
     """unpack 4 bytes little endian to int"""
-    return int(struct.unpack('<i', st[0:4])[0])
+    return _DINT.unpack_from(st, offset)[0]
 
 
-def unpack_udint(st):
+def unpack_udint(st, offset=0):
     """unpack 4 bytes little endian to int"""
-    return int(struct.unpack('<I', st[0:4])[0])
+    return _UDINT.unpack_from(st, offset)[0]
 
 
-def unpack_real(st):
-    """unpack 4 bytes little endian to int"""
-    return float(struct.unpack('<f', st[0:4])[0])
+def unpack_real(st, offset=0):
+    """unpack 4 bytes little endian to float"""
+    return _REAL.unpack_from(st, offset)[0]
 
 
-def unpack_lint(st):
-    """unpack 4 bytes little endian to int"""
-    return int(struct.unpack('<q', st[0:8])[0])
+def unpack_lreal(st, offset=0):
+    """unpack 8 bytes little endian to float"""
+    return _LREAL.unpack_from(st, offset)[0]
 
 
-def unpack_ulint(st):
-    """unpack 4 bytes little endian to int"""
-    return int(struct.unpack('<Q', st[0:8])[0])
+def unpack_lint(st, offset=0):
+    """unpack 8 bytes little endian to int"""
+    return _LINT.unpack_from(st, offset)[0]
+
 
+def unpack_ulint(st, offset=0):
+    """unpack 8 bytes little endian to int"""
+    return _ULINT.unpack_from(st, offset)[0]
 
-def unpack_long(st):
-    return int(struct.unpack('<l', st[0:4])[0])
 
+def unpack_long(st, offset=0):
+    return _LONG.unpack_from(st, offset)[0]
 
-def unpack_ulong(st):
-    return int(struct.unpack('<L', st[0:4])[0])
+
+def unpack_ulong(st, offset=0):
+    return _ULONG.unpack_from(st, offset)[0]
+
+
+# the bools for each bit of every possible byte value, least significant bit first
+BYTE_BITS = [tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256)]
+
+
+def unpack_bool_array(data, offset=0, size=None):
+    """unpack ``size`` bytes starting at ``offset`` of ``data`` to a list of bools, 8 per byte"""
+    end = len(data) if size is None else offset + size
+    return list(chain.from_iterable(map(BYTE_BITS.__getitem__, data[offset:end])))
+
+
+def pack_array(data_type, values, count):
+    """pack the first ``count`` of ``values`` of an atomic ``data_type``"""
+    return struct.pack(f'<{count}{PACK_DATA_FORMAT[data_type]}', *values[:count])
+
+
+def unpack_array(data_type, data, count, offset=0):
+    """unpack ``count`` values of an atomic ``data_type`` starting at ``offset`` of ``data`` to a list"""
+    values = struct.unpack_from(f'<{count}{PACK_DATA_FORMAT[data_type]}', data, offset)
+    if data_type == 'BOOL':
+        return [value != 0 for value in values]
+    return list(values)
 
 
 def print_bytes_line(msg):
@@ -159,6 +207,42 @@ def print_bytes_msg(msg, info=''):
     return out
 
 
+# each character of a Logix STRING is a single byte, latin-1 maps every byte value to the same code point
+STRING_ENCODING = 'latin-1'
+
+_STRING_LEN = struct.Struct('<i')
+
+
+def string_size(string_length):
+    """size of a STRING type, the DINT length and the characters padded to a 4-byte boundary"""
+    return (4 + string_length + 3) & ~3
+
+
+def encode_string(value, string_length, size, encoding=STRING_ENCODING):
+    """encode a str to a STRING of ``size`` bytes, truncating it to ``string_length`` characters"""
+    data = value.encode(encoding)[:string_length]
+    return _STRING_LEN.pack(len(data)) + data + bytes(size - 4 - len(data))
+
+
+def encode_strings(values, string_length, size, encoding=STRING_ENCODING):
+    """encode a list of str to an array of STRINGs, each ``size`` bytes"""
+    return b''.join([encode_string(value, string_length, size, encoding) for value in values])
+
+
+def decode_string(data, offset=0, encoding=STRING_ENCODING):
+    """decode the STRING at ``offset`` of ``data`` to a str"""
+    length = _STRING_LEN.unpack_from(data, offset)[0]
+    return str(data[offset + 4:offset + 4 + length], encoding, 'replace')
+
+
+def decode_strings(data, count, size, offset=0, encoding=STRING_ENCODING):
+    """decode an array of ``count`` STRINGs, each ``size`` bytes, starting at ``offset`` of ``data`` to a list of str"""
+    view = memoryview(data)
+    unpack = _STRING_LEN.unpack_from
+    return [str(view[i + 4:i + 4 + unpack(view, i)[0]], encoding, 'replace')
+            for i in range(offset, offset + count * size, size)]
+
+
 def _short_string_encode(string):
     def _char(char):
         unsigned = ord(char)
@@ -172,21 +256,58 @@ PACK_DATA_FUNCTION = {
     'BOOL': pack_sint,
     'SINT': pack_sint,    # Signed 8-bit integer
     'INT': pack_int,     # Signed 16-bit integer
-    'UINT': pack_uint,    # Unsigned 16-bit integer
-    'USINT': pack_usint,  # Unsigned Byte Integer
     'DINT': pack_dint,    # Signed 32-bit integer
+    'LINT': pack_lint,    # Signed 64-bit integer
+    'USINT': pack_usint,  # Unsigned 8-bit integer
+    'UINT': pack_uint,    # Unsigned 16-bit integer
+    'UDINT': pack_udint,  # Unsigned 32-bit integer
+    'ULINT': pack_ulint,  # Unsigned 64-bit integer
     'REAL': pack_real,    # 32-bit floating point
-    'LINT': pack_lint,
+    'LREAL': pack_lreal,  # 64-bit floating point
+    'STIME': pack_dint,   # Synchronous time
+    'DATE': pack_uint,
+    'TIME_OF_DAY': pack_udint,
     'BYTE': pack_sint,     # byte string 8-bits
     'WORD': pack_uint,     # byte string 16-bits
     'DWORD': pack_udint,    # byte string 32-bits
     'LWORD': pack_ulint,    # byte string 64-bits
+    'FTIME': pack_dint,   # Duration high resolution
+    'LTIME': pack_lint,   # Duration long
+    'ITIME': pack_int,    # Duration short
+    'TIME': pack_dint,    # Duration in milliseconds
     'SHORT_STRING': _short_string_encode,  # + b'\x00' * (MICRO800_STRING_LEN - len(x))
 }
 
 
-def _short_string_decode(str_data):
-    string = ''.join(chr(v + 256) if v < 0 else chr(v) for v in str_data[1:])
+# struct format characters for each data type, all little endian
+PACK_DATA_FORMAT = {
+    'BOOL': 'b',
+    'SINT': 'b',
+    'INT': 'h',
+    'DINT': 'i',
+    'LINT': 'q',
+    'USINT': 'B',
+    'UINT': 'H',
+    'UDINT': 'I',
+    'ULINT': 'Q',
+    'REAL': 'f',
+    'LREAL': 'd',
+    'STIME': 'i',
+    'DATE': 'H',
+    'TIME_OF_DAY': 'I',
+    'BYTE': 'b',
+    'WORD': 'H',
+    'DWORD': 'I',
+    'LWORD': 'Q',
+    'FTIME': 'i',
+    'LTIME': 'q',
+    'ITIME': 'h',
+    'TIME': 'i',
+}
+
+
+def _short_string_decode(str_data, offset=0):
+    string = ''.join(chr(v + 256) if v < 0 else chr(v) for v in str_data[offset + 1:])
     return string
 
 
@@ -194,33 +315,30 @@ UNPACK_DATA_FUNCTION = {
     'BOOL': unpack_bool,
     'SINT': unpack_sint,    # Signed 8-bit integer
     'INT': unpack_int,     # Signed 16-bit integer
-    'UINT': unpack_uint,    # Unsigned 16-bit integer
-    'USINT': unpack_usint,  # Unsigned Byte Integer
     'DINT': unpack_dint,    # Signed 32-bit integer
-    'REAL': unpack_real,    # 32-bit floating point,
-    'LINT': unpack_lint,
+    'LINT': unpack_lint,    # Signed 64-bit integer
+    'USINT': unpack_usint,  # Unsigned 8-bit integer
+    'UINT': unpack_uint,    # Unsigned 16-bit integer
+    'UDINT': unpack_udint,  # Unsigned 32-bit integer
+    'ULINT': unpack_ulint,  # Unsigned 64-bit integer
+    'REAL': unpack_real,    # 32-bit floating point
+    'LREAL': unpack_lreal,  # 64-bit floating point
+    'STIME': unpack_dint,   # Synchronous time
+    'DATE': unpack_uint,
+    'TIME_OF_DAY': unpack_udint,
     'BYTE': unpack_sint,     # byte string 8-bits
     'WORD': unpack_uint,     # byte string 16-bits
     'DWORD': unpack_udint,    # byte string 32-bits
     'LWORD': unpack_ulint,    # byte string 64-bits
+    'FTIME': unpack_dint,   # Duration high resolution
+    'LTIME': unpack_lint,   # Duration long
+    'ITIME': unpack_int,    # Duration short
+    'TIME': unpack_dint,    # Duration in milliseconds
     'SHORT_STRING': _short_string_decode,
 }
 
 
-DATA_FUNCTION_SIZE = {
-    'BOOL': 1,
-    'SINT': 1,    # Signed 8-bit integer
-    'USINT': 1,  # Unisgned 8-bit integer
-    'INT': 2,     # Signed 16-bit integer
-    'UINT': 2,    # Unsigned 16-bit integer
-    'DINT': 4,    # Signed 32-bit integer
-    'REAL': 4,    # 32-bit floating point
-    'LINT': 8,
-    'BYTE': 1,     # byte string 8-bits
-    'WORD': 2,     # byte string 16-bits
-    'DWORD': 4,    # byte string 32-bits
-    'LWORD': 8    # byte string 64-bits
-}
+DATA_FUNCTION_SIZE = {data_type: struct.calcsize(f'<{fmt}') for data_type, fmt in PACK_DATA_FORMAT.items()}
 
 
 UNPACK_PCCC_DATA_FUNCTION = {
@@ -26,26 +26,41 @@
 #
 
 import socket
+import struct
 import logging
+import threading
+import time
+from collections import defaultdict
 from functools import wraps
 from os import urandom
-from typing import Union, List, Sequence, Tuple, Optional
+from typing import Union, List, Sequence, Tuple, Optional, Iterator, Any
 
 from autologging import logged
 
 from . import DataError, CommError
-from . import Tag, RequestError
+from . import Tag, TagColumns, RequestError
 from .bytes_ import (pack_usint, pack_udint, pack_uint, pack_dint, unpack_uint, unpack_udint, )
-from .bytes_ import (unpack_dint, pack_sint, PACK_DATA_FUNCTION)
+from .bytes_ import (unpack_dint, pack_sint, PACK_DATA_FUNCTION, PACK_DATA_FORMAT, STRING_ENCODING, string_size,
+                     encode_string, encode_strings, pack_array)
 from .const import (DATA_TYPE, TAG_SERVICES_REQUEST, EXTENDED_SYMBOL, PATH_SEGMENTS, ELEMENT_ID, CLASS_CODE, CLASS_ID,
                     INSTANCE_ID, FORWARD_CLOSE, FORWARD_OPEN, LARGE_FORWARD_OPEN, CONNECTION_MANAGER_INSTANCE, PRIORITY,
                     TIMEOUT_MULTIPLIER, TIMEOUT_TICKS, TRANSPORT_CLASS, UNCONNECTED_SEND, PRODUCT_TYPES, VENDORS, STATES)
 from .const import (SUCCESS, INSUFFICIENT_PACKETS, BASE_TAG_BIT, MIN_VER_INSTANCE_IDS, REQUEST_PATH_SIZE,
-                    KEYSWITCH, TEMPLATE_MEMBER_INFO_LEN, EXTERNAL_ACCESS, DATA_TYPE_SIZE)
-from .packets import REQUEST_MAP, RequestPacket, get_service_status
-from .socket_ import Socket
+                    KEYSWITCH, TEMPLATE_MEMBER_INFO_LEN, EXTERNAL_ACCESS, DATA_TYPE_SIZE, BITS_PER_INT_TYPE)
+from .packets import REQUEST_MAP, RequestPacket, get_service_status, request_path_size
+from .address import TagAddress, parse_tag_address, ADDRESS_CACHE_SIZE
+from .coalesce import ReadCoalescer
+from .write_plan import WritePlan, ValueSlot, BitSlot
+from .table import PacketTimes, table_builder, table_columns
+from .socket_ import BaseSocket, Socket
 
 
+_READ_SERVICE_OVERHEAD = 12  # bytes added to a reply for each read service
+_READ_REPLY_OVERHEAD = 8  # sequence count, service, status, and data type of a Read Tag reply
+_MULTI_REPLY_OVERHEAD = 8  # sequence count, service, status, and service count of a Multiple Service Packet reply
+_MULTI_REQUEST_OVERHEAD = 12  # sequence count, service, path, service count, and offset of a Multiple Service Packet
+_WRITE_SERVICE_OVERHEAD = 6  # bytes added to a Multiple Service Packet reply for each write service
+
 # re_bit = re.compile(r'(?P<base>^.*)\.(?P<bit>([0-2][0-9])|(3[01])|[0-9])$')
 
 
@@ -73,14 +88,31 @@ def with_forward_open(func):
     return wrapped
 
 
+def synchronized(func):
+    """Decorator to hold the driver lock while the method is executing"""
+
+    @wraps(func)
+    def wrapped(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+
+    return wrapped
+
+
 @logged
 class LogixDriver:
     """
     An Ethernet/IP Client library for reading and writing tags in ControlLogix and CompactLogix PLCs.
+
+    The driver is thread-safe, a single instance may be shared by multiple threads.  Access to the connection is
+    serialized so requests from different threads are never interleaved.
     """
 
     def __init__(self, path: str, *args,  large_packets: bool = True, debug: bool = False, micro800: bool = False,
-                 init_info: bool = True, init_tags: bool = True, init_program_tags: bool = False, **kwargs):
+                 init_info: bool = True, init_tags: bool = True, init_program_tags: bool = False,
+                 sock: Optional[BaseSocket] = None, coalesce_window: float = 0, adaptive_fragments: bool = False,
+                 pipeline_depth: int = 1, string_encoding: str = STRING_ENCODING,
+                 bitset_bool_arrays: bool = False, **kwargs):
         """
         :param path: CIP path to intended target
 
@@ -117,6 +149,27 @@ class LogixDriver:
         :param init_program_tags: if True, uploads all program-scoped tag definitions on connect
         :param debug:  enables certain debugging features, like printing the raw bytes for each packet sent/received
         :param micro800: set to True if connecting to a Micro800 series PLC, it will disable unsupported features
+        :param sock: transport to use for the connection, defaults to a blocking TCP :class:`~pycomm3.socket_.Socket`.
+                     Any :class:`~pycomm3.socket_.BaseSocket` may be used, like a ``Socket`` with custom options, an
+                     :class:`~pycomm3.socket_.AsyncioSocket`, a :class:`~pycomm3.socket_.LoopbackSocket`,
+                     or a :class:`~pycomm3.replay.RecordingSocket`/:class:`~pycomm3.replay.ReplaySocket`.
+        :param coalesce_window: if set, calls to :meth:`.read` from different threads within this many seconds
+                                (e.g. ``0.002``) are combined and sent as a single read.  Duplicate tags are only
+                                read once and reads of elements from the same array are merged into one ranged read.
+                                Disabled by default, it may also be changed later with the ``coalesce_window`` attribute.
+        :param adaptive_fragments: if True, the largest reply received from the target while reading fragmented tags
+                                   is used to limit the size of requests, instead of only the connection size.
+                                   Useful if the target (or a module routing to it) replies with less data than
+                                   the connection size allows.
+        :param pipeline_depth: the number of fragment requests to send before waiting for their replies when reading
+                               or writing a fragmented tag.  The default of 1 waits for each reply before sending the
+                               next request.  Higher values reduce the number of round trips for large arrays, but
+                               the target must support multiple outstanding requests on a connection.
+        :param string_encoding: the encoding of the characters in STRING tags (and custom string types),
+                                ``'latin-1'`` by default.  The length of a STRING is a number of bytes, values
+                                encoded with multi-byte encodings (like ``'utf-8'``) are truncated to that many bytes.
+        :param bitset_bool_arrays: return the values of BOOL arrays (and BOOL array members of structures) as a
+                                   :class:`~pycomm3.BitSet` of the bytes read instead of a list of bools
 
         .. tip::
 
@@ -128,7 +181,15 @@ class LogixDriver:
         """
 
         self._sequence_number = 1
-        self._sock = None
+        self._lock = threading.RLock()
+        self._coalescer = ReadCoalescer(self._read, self._lock)
+        self.coalesce_window = coalesce_window
+        self.adaptive_fragments = adaptive_fragments
+        self._max_reply_size = None
+        self.pipeline_depth = pipeline_depth
+        self.string_encoding = string_encoding
+        self.bitset_bool_arrays = bitset_bool_arrays
+        self._sock = sock
         # self.__direct_connections = direct_connection
         self.debug = debug
         self._micro800 = micro800
@@ -158,19 +219,29 @@ class LogixDriver:
         self._data_types = {}
         self._program_names = set()
         self._tags = {}
+        self._tag_request_cache = (None, {})
 
         self.use_instance_ids = True
+        self.use_member_ids = False
 
         if init_tags or init_info:
-            self.open()
-            if init_info:
-                self.get_plc_info()
-                self.use_instance_ids = (self.info.get('version_major', 0) >= MIN_VER_INSTANCE_IDS) and not micro800
-                if not micro800:
-                    self.get_plc_name()
-
-            if init_tags:
-                self.get_tag_list(program='*' if init_program_tags else None)
+            try:
+                self.open()
+                if init_info:
+                    self.get_plc_info()
+                    self.use_instance_ids = (self.info.get('version_major', 0) >= MIN_VER_INSTANCE_IDS) and not micro800
+                    if not micro800:
+                        self.get_plc_name()
+
+                if init_tags:
+                    self.get_tag_list(program='*' if init_program_tags else None)
+            except Exception:
+                # don't leave the connection open if the driver could not be created
+                try:
+                    self.close()
+                except CommError:
+                    self.__log.exception('Error closing connection.')
+                raise
 
     def __enter__(self):
         self.open()
@@ -248,6 +319,23 @@ class LogixDriver:
     def connection_size(self):
         return 4000 if self.attribs['extended forward open'] else 500
 
+    @property
+    def max_message_size(self) -> int:
+        """
+        The largest request or reply allowed, including the sequence count.  This is the connection size unless
+        ``adaptive_fragments`` is enabled and the target has been observed replying with less.
+        """
+        if self.adaptive_fragments and self._max_reply_size is not None:
+            return min(self._max_reply_size, self.connection_size)
+        return self.connection_size
+
+    def _observe_reply_size(self, size: int):
+        """
+        Records the size of a reply the target filled as much as it could, i.e. a fragment of a larger reply
+        """
+        if self._max_reply_size is None or size > self._max_reply_size:
+            self._max_reply_size = size
+
     def new_request(self, command: str) -> RequestPacket:
         """
         Creates a new request packet for the given command.
@@ -272,6 +360,7 @@ class LogixDriver:
         return cls(self)
 
     @property
+    @synchronized
     def _sequence(self) -> int:
         """
         Increment and return the sequence id used with connected messages
@@ -332,6 +421,7 @@ class LogixDriver:
         except Exception as err:
             raise DataError(err)
 
+    @synchronized
     def open(self):
         """
         Creates a new Ethernet/IP socket connection to target device and registers a CIP session.
@@ -354,6 +444,7 @@ class LogixDriver:
             except Exception as e:
                 raise CommError(e)
 
+    @synchronized
     def _register_session(self) -> Optional[int]:
         """
         Registers a new CIP session with the target.
@@ -381,6 +472,7 @@ class LogixDriver:
         self.__log.warning('Session has not been registered.')
         return None
 
+    @synchronized
     def _forward_open(self):
         """
         Opens a new connection with the target PLC using the *Forward Open* or *Extended Forward Open* service.
@@ -434,6 +526,7 @@ class LogixDriver:
         self.__log.warning(f"forward_open failed - {response.error}")
         return False
 
+    @synchronized
     def close(self):
         """
         Closes the current connection and un-registers the session.
@@ -455,7 +548,6 @@ class LogixDriver:
             errs.append(err)
             self.__log.warning(f"close() -> _sock.close Err: {err}")
 
-        self._sock = None
         self._target_is_connected = False
         self._session = 0
         self._connection_opened = False
@@ -463,6 +555,22 @@ class LogixDriver:
         if errs:
             raise CommError(' - '.join(str(e) for e in errs))
 
+    @synchronized
+    def _drop_connection(self):
+        """
+        Closes the socket without closing the connection or un-registering the session, used when the transport
+        failed and no more packets can be exchanged with the target.  The connection may be opened again.
+        """
+        try:
+            if self._sock:
+                self._sock.close()
+        except Exception as err:
+            self.__log.warning(f"_drop_connection() -> _sock.close Err: {err}")
+
+        self._target_is_connected = False
+        self._session = 0
+        self._connection_opened = False
+
     def _un_register_session(self):
         """
         Un-registers the current session with the target.
@@ -573,6 +681,7 @@ class LogixDriver:
             raise DataError(err)
 
     @with_forward_open
+    @synchronized
     def get_tag_list(self, program: str = None, cache: bool = True) -> List[dict]:
         """
         Reads the tag list from the controller and the definition for each tag.  Definitions include tag name, tag type
@@ -685,28 +794,28 @@ class LogixDriver:
         idx = count = instance = 0
         try:
             while idx < tags_returned_length:
-                instance = unpack_dint(tags_returned[idx:idx + 4])
+                instance = unpack_dint(tags_returned, idx)
                 idx += 4
-                tag_length = unpack_uint(tags_returned[idx:idx + 2])
+                tag_length = unpack_uint(tags_returned, idx)
                 idx += 2
                 tag_name = tags_returned[idx:idx + tag_length]
                 idx += tag_length
-                symbol_type = unpack_uint(tags_returned[idx:idx + 2])
+                symbol_type = unpack_uint(tags_returned, idx)
                 idx += 2
                 count += 1
-                symbol_address = unpack_udint(tags_returned[idx:idx + 4])
+                symbol_address = unpack_udint(tags_returned, idx)
                 idx += 4
-                symbol_object_address = unpack_udint(tags_returned[idx:idx + 4])
+                symbol_object_address = unpack_udint(tags_returned, idx)
                 idx += 4
-                software_control = unpack_udint(tags_returned[idx:idx + 4])
+                software_control = unpack_udint(tags_returned, idx)
                 idx += 4
                 access = tags_returned[idx] & 0b_0011
                 idx += 1
-                dim1 = unpack_udint(tags_returned[idx:idx + 4])
+                dim1 = unpack_udint(tags_returned, idx)
                 idx += 4
-                dim2 = unpack_udint(tags_returned[idx:idx + 4])
+                dim2 = unpack_udint(tags_returned, idx)
                 idx += 4
-                dim3 = unpack_udint(tags_returned[idx:idx + 4])
+                dim3 = unpack_udint(tags_returned, idx)
                 idx += 4
 
                 tag_list.append({'instance_id': instance,
@@ -933,42 +1042,252 @@ class LogixDriver:
         return self._cache['id:udt'][instance_id]
 
     @with_forward_open
-    def read(self, *tags: str) -> Union[Tag, List[Tag]]:
+    def read(self, *tags: str, columnar: bool = False) -> Union[Tag, List[Tag], TagColumns]:
         """
 
         :param tags: one or many tags to read
-        :return: one or many ``Tag`` objects
+        :param columnar: return the results as a ``TagColumns``, a list of each field for all of the tags,
+                         instead of a ``Tag`` for each tag
+        :return: one or many ``Tag`` objects, or a ``TagColumns`` if ``columnar``
+        """
+
+        results = self._read_results(tags)
+        if columnar:
+            return _result_columns(results)
+
+        if len(tags) > 1:
+            return [result.to_tag() for result in results]
+        else:
+            return results[0].to_tag()
+
+    @with_forward_open
+    def read_table(self, *tags: str, output: str = 'dict') -> Any:
         """
+        Reads the tags like :meth:`.read`, returning the results as a table with a row for each tag instead of
+        creating a ``Tag`` for each one.  The columns are:
+
+            - ``tag``: the tag names
+            - ``value``: the values read, ``None`` for tags that failed.  If every tag was read successfully and they
+              are all the same atomic type (e.g. all REAL), the values are stored in an ``array`` of that type.
+            - ``type``: the data types
+            - ``error``: the errors, ``None`` for successful reads
+            - ``packet``: the index of the request the tag was read in, -1 if it was not sent
+            - ``sent``, ``received``: the time (like ``time.time()``) the request was sent and its reply received
+            - ``sent_monotonic``, ``received_monotonic``: the same times from ``time.perf_counter()``, for measuring
+              the time between samples without changes to the system clock
+
+        >>> table = plc.read_table('Temp1', 'Temp2', 'Temp3', output='pandas')
 
+        :param tags: one or many tags to read
+        :param output: the type of table to return: ``'dict'`` for a dict of ``{column: values}``, ``'arrow'`` for a
+                       ``pyarrow.Table``, or ``'pandas'`` for a ``pandas.DataFrame``.  pyarrow and pandas are optional
+                       and must be installed to use them.
+        :return: the table of results
+        :raises RequestError: if ``output`` is invalid or the library it requires is not installed
+        """
+        builder = table_builder(output)
+        return builder(table_columns(self._read_results(tags)))
+
+    @with_forward_open
+    def read_stream(self, tag: str) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        Reads a tag using the *Read Tag Fragmented* service, yielding the values from each fragment as it
+        is received instead of waiting for the entire tag to be read.  Useful for large arrays, the values can
+        be processed while the rest of the array is being transferred.  Other requests may be sent between
+        fragments, the connection is not held for the whole read.
+
+        >>> for offset, values in plc.read_stream('BigArray{10000}'):
+        ...     process(offset, values)
+
+        :param tag: the tag to read, reading a single bit is not supported
+        :return: an iterator of ``(offset, values)`` tuples, ``offset`` is the index of the first value in
+                 ``values`` relative to the first element requested
+        :raises RequestError: if the tag request is invalid
+        :raises DataError: if reading any fragment fails
+        """
+        request_data = self._parse_requested_tags([tag])[tag]
+        if request_data.get('error') is not None:
+            raise RequestError(request_data['error'])
+        if request_data['bit'] is not None:
+            raise RequestError(f'Reading a bit is not supported by read_stream: {tag}')
+
+        request = self.new_request('read_tag_fragmented')
+        request.add(request_data['plc_tag'], request_data['elements'], request_data['tag_info'])
+        return request.stream()
+
+    def _read_results(self, tags):
+        if self.coalesce_window:
+            return self._coalescer.read(tags, self.coalesce_window)
+        return self._read(tags)
+
+    def _read(self, tags):
         parsed_requests = self._parse_requested_tags(tags)
-        requests = self._read_build_requests(parsed_requests)
+        reads, splits = self._split_large_reads(_fold_array_reads(self._plan_struct_reads(parsed_requests)))
+        requests = self._read_build_requests(reads)
         read_results = self._send_requests(requests)
+        for tag_data in splits:
+            head, tail = tag_data['split']
+            read_results[(tag_data['plc_tag'], tag_data['elements'])] = _join_split_read(
+                read_results[(head['plc_tag'], head['elements'])], read_results[(tail['plc_tag'], tail['elements'])],
+                tag_data['plc_tag'], tag_data['elements'])
+
+        # if reading the whole structure failed, fallback to reading the members individually
+        retry = {tag: tag_data for tag, tag_data in parsed_requests.items()
+                 if 'member' in tag_data and not _get_read_result(read_results, tag_data['member'][0])}
+        if retry:
+            for tag_data in retry.values():
+                del tag_data['member']
+            read_results.update(self._send_requests(self._read_build_requests(_fold_array_reads(retry)),
+                                                    len(requests)))
 
         results = []
 
         for tag in tags:
             try:
                 request_data = parsed_requests[tag]
-                result = read_results[(request_data['plc_tag'], request_data['elements'])]
+                if request_data.get('error') is not None:
+                    results.append(_TagResult(tag, None, None, request_data['error']))
+                    continue
+                result = _get_read_result(read_results, request_data)
                 if request_data.get('bit') is None:
                     results.append(result)
                 else:
                     if result:
-                        typ, bit = request_data['bit']
-                        if typ == 'bit':
-                            val = bool(result.value & (1 << bit))
-                        else:
-                            val = result.value[bit % 32]
-                        results.append(Tag(tag, val, 'BOOL'))
+                        results.append(_TagResult(tag, _bit_value(request_data['bit'], result.value), 'BOOL', None,
+                                                  result.packet))
                     else:
-                        results.append(Tag(tag, None, None, result.error))
+                        results.append(_TagResult(tag, None, None, result.error, result.packet))
             except Exception as err:
-                results.append(Tag(tag, None, None, f'Invalid tag request - {err}'))
+                results.append(_TagResult(tag, None, None, f'Invalid tag request - {err}'))
 
-        if len(tags) > 1:
-            return results
-        else:
-            return results[0]
+        return results
+
+    def _plan_struct_reads(self, parsed_tags):
+        """
+        Finds requests for multiple members of the same structure and decides if it is cheaper to read the whole
+        structure once and extract the members from it.  The structure is read if the bytes sent and received
+        will be less than or equal to reading each member separately, it will also always use fewer services.
+        Each member request that will be extracted is updated with a ``member`` key of
+        ``(structure request, member name, index)``.
+
+        :return: a dict of the parsed tag requests to send, like ``parsed_tags``
+        """
+        if self._micro800:
+            return parsed_tags
+
+        reads = {}
+        structs = defaultdict(list)
+        for tag, tag_data in parsed_tags.items():
+            member_read = self._struct_member_read(tag_data)
+            if member_read is None:
+                reads[tag] = tag_data
+            else:
+                structs[member_read[0]].append((tag, tag_data, member_read))
+
+        for parent, members in structs.items():
+            _, parent_info, _, _ = members[0][2]
+            parent_size = _tag_return_size(parent_info) + 2  # structure handle
+            parent_cost = parent_size + self._read_request_size(parent)
+            members_cost = sum(_tag_return_size(tag_data['tag_info']) * tag_data['elements'] +
+                               self._read_request_size(tag_data['plc_tag'])
+                               for _, tag_data, _ in members)
+
+            # the structure must fit in a Multiple Service Packet reply, else it would be a fragmented read
+            max_response_size = self.max_message_size - _MULTI_REPLY_OVERHEAD
+            if len(members) < 2 or parent_cost > members_cost or parent_size > max_response_size:
+                reads.update((tag, tag_data) for tag, tag_data, _ in members)
+                continue
+
+            parent_data = {'plc_tag': parent, 'bit': None, 'elements': 1, 'tag_info': parent_info}
+            reads[parent] = parent_data
+            for _, tag_data, (_, _, member, index) in members:
+                tag_data['member'] = (parent_data, member, index)
+
+        return reads
+
+    def _split_large_reads(self, parsed_tags):
+        """
+        Large reads are sent by themselves using the *Read Tag Fragmented* service, with the last fragment usually
+        only partially full.  Reads of large arrays are split into a read of the elements that fill whole fragments
+        and a read of the remaining elements, so that the remaining elements are sent in a Multiple Service Packet
+        with the other reads instead of in a packet of their own.  Each split request is updated with a ``split``
+        key of ``(head request, tail request)``.
+
+        :return: a tuple of (dict of parsed tag requests to send, list of the split requests)
+        """
+        if self._micro800 or len(parsed_tags) < 2:
+            return parsed_tags, []
+
+        reads = {}
+        splits = []
+        max_response_size = self.max_message_size - _MULTI_REPLY_OVERHEAD
+        for tag, tag_data in parsed_tags.items():
+            array_index = _array_read_index(tag_data)
+            if array_index is None:
+                reads[tag] = tag_data
+                continue
+
+            element_size = _element_size(tag_data['tag_info'])
+            fragment_elements = (self.max_message_size - _read_reply_size(tag_data['tag_info'], 0)) // element_size
+            tail_elements = tag_data['elements'] % fragment_elements if fragment_elements else 0
+            if (element_size * tag_data['elements'] + _READ_SERVICE_OVERHEAD <= max_response_size or
+                    not tail_elements or element_size * tail_elements + _READ_SERVICE_OVERHEAD > max_response_size):
+                reads[tag] = tag_data
+                continue
+
+            base, idx = array_index
+            head_elements = tag_data['elements'] - tail_elements
+            head = {'plc_tag': f'{base}[{idx}]', 'bit': None, 'elements': head_elements,
+                    'tag_info': tag_data['tag_info']}
+            tail = {'plc_tag': f'{base}[{idx + head_elements}]', 'bit': None, 'elements': tail_elements,
+                    'tag_info': tag_data['tag_info']}
+            reads[f'{head["plc_tag"]}{{{head_elements}}}'] = head
+            tag_data['split'] = (head, tail)
+            splits.append(tag_data)
+
+        # add the remaining elements last, to fill the room left in the requests for the other reads
+        for tag_data in splits:
+            _, tail = tag_data['split']
+            reads[f'{tail["plc_tag"]}{{{tail["elements"]}}}'] = tail
+
+        return reads, splits
+
+    def _struct_member_read(self, tag_data):
+        """
+        If the request is for a member of a structure that can be extracted from a read of the whole structure,
+        returns ``(structure tag, structure tag info, member name, member index)`` else None.
+        Only atomic and string members directly within the structure are supported.
+        """
+        if tag_data.get('error') is not None:
+            return None
+
+        address = parse_tag_address(tag_data['plc_tag'])
+        if len(address.members) != 1:
+            return None
+
+        parent_info = self._tags.get(address.base)
+        if parent_info is None or parent_info['tag_type'] != 'struct' or parent_info['data_type'].get('string'):
+            return None
+        if bool(parent_info.get('dim')) != bool(address.base_index):
+            return None
+
+        member_info = tag_data['tag_info']
+        (member, member_index), = address.members
+        if member not in parent_info['data_type']['attributes'] or len(member_index) > 1:
+            return None
+        if member_info['tag_type'] == 'atomic':
+            if member_info['data_type'] == 'DWORD' or member_info['data_type'] not in DATA_TYPE_SIZE:
+                return None
+        elif not member_info['data_type'].get('string'):
+            return None
+
+        index = member_index[0] if member_index else 0
+        length = member_info.get('array') or 1
+        if index + tag_data['elements'] > length:
+            return None
+
+        base = address.tag.rpartition('.')[0]
+        return base, parent_info, member, index
 
     def _read_build_requests(self, parsed_tags):
         if len(parsed_tags) == 1 or self._micro800:
@@ -980,35 +1299,41 @@ class LogixDriver:
     def _read_build_multi_requests(self, parsed_tags):
         """
         creates a list of multi-request packets
+
+        Each read is added to the first request with enough room left for it, requests are closed once
+        a read no longer fits in the request message.
         """
         requests = []
-        response_size = 0
-        current_request = self.new_request('multi_request')
-        requests.append(current_request)
+        open_requests = []  # [request, response size]
+        max_response_size = self.max_message_size - _MULTI_REPLY_OVERHEAD
         tags_in_requests = set()
         for tag, tag_data in parsed_tags.items():
             if tag_data.get('error') is None and (tag_data['plc_tag'], tag_data['elements']) not in tags_in_requests:
                 tags_in_requests.add((tag_data['plc_tag'], tag_data['elements']))
-                return_size = _tag_return_size(tag_data['tag_info']) * tag_data['elements']
-                if return_size > self.connection_size:
+                return_size = _element_size(tag_data['tag_info']) * tag_data['elements'] + _READ_SERVICE_OVERHEAD
+                if return_size > max_response_size:
                     _request = self.new_request('read_tag_fragmented')
                     _request.add(tag_data['plc_tag'], tag_data['elements'], tag_data['tag_info'])
                     requests.append(_request)
                 else:
                     try:
-                        if response_size + return_size < self.connection_size:
-                            if current_request.add_read(tag_data['plc_tag'], tag_data['elements'], tag_data['tag_info']):
-                                response_size += return_size
-                            else:
-                                response_size = return_size
-                                current_request = self.new_request('multi_request')
-                                current_request.add_read(tag_data['plc_tag'], tag_data['elements'], tag_data['tag_info'])
-                                requests.append(current_request)
+                        for open_request in open_requests:
+                            if open_request[1] + return_size <= max_response_size:
+                                break
                         else:
-                            response_size = return_size
+                            open_request = None
+
+                        if open_request is not None and open_request[0].add_read(tag_data['plc_tag'],
+                                                                                 tag_data['elements'],
+                                                                                 tag_data['tag_info']):
+                            open_request[1] += return_size
+                        else:
+                            if open_request is not None:
+                                open_requests.remove(open_request)  # the request message is full
                             current_request = self.new_request('multi_request')
                             current_request.add_read(tag_data['plc_tag'], tag_data['elements'], tag_data['tag_info'])
                             requests.append(current_request)
+                            open_requests.append([current_request, return_size])
                     except RequestError:
                         self.__log.exception(f'Failed to build request for {tag} - skipping')
                         continue
@@ -1024,8 +1349,8 @@ class LogixDriver:
         """
 
         if parsed_tag.get('error') is None:
-            return_size = _tag_return_size(parsed_tag['tag_info']) * parsed_tag['elements']
-            if return_size > self.connection_size:
+            return_size = _read_reply_size(parsed_tag['tag_info'], parsed_tag['elements'])
+            if return_size > self.max_message_size:
                 request = self.new_request('read_tag_fragmented')
             else:
                 request = self.new_request('read_tag')
@@ -1038,7 +1363,15 @@ class LogixDriver:
         return None
 
     @with_forward_open
-    def write(self, *tags_values: Tuple[str, Union[int, float, str, bool]]) -> Union[Tag, List[Tag]]:
+    def write(self, *tags_values: Tuple[str, Union[int, float, str, bool]], verify: bool = False) -> Union[Tag, List[Tag]]:
+        """
+
+        :param tags_values: one or many 2-element tuples of (tag name, value)
+        :param verify: read the tags back after writing them and compare to the values written, the reads are sent
+                       in the same packets as the writes when there is room.  If a value read back does not match,
+                       the ``error`` of its ``Tag`` is set.
+        :return: one or many ``Tag`` objects
+        """
         tags = (tag for (tag, value) in tags_values)
         parsed_requests = self._parse_requested_tags(tags)
 
@@ -1053,37 +1386,111 @@ class LogixDriver:
             else:
                 bit_tags.add(tag)
 
-        requests, bit_writes = self._write_build_requests(parsed_requests)
+        requests, bit_writes = self._write_build_requests(parsed_requests, force_multi=verify)
+        if verify:
+            requests += self._verify_build_reads(requests, parsed_requests)
         write_results = self._send_requests(requests)
+        results = self._write_results(tags_values, parsed_requests, write_results)
+        if verify:
+            for result, (tag, _) in zip(results, tags_values):
+                _verify_write(result, parsed_requests[tag], bit_writes, write_results, self.string_encoding)
+
+        if len(tags_values) > 1:
+            return [result.to_tag() for result in results]
+        else:
+            return results[0].to_tag()
+
+    def prepare_write(self, *tags: str) -> WritePlan:
+        """
+        Prepares a plan for writing new values to the same tags repeatedly.  The tags are parsed and the requests
+        built once, :meth:`WritePlan.execute` then only packs the values into the requests and sends them.
+
+        >>> plan = plc.prepare_write('setpoint1', 'setpoint2', 'recipe_values{50}')
+        >>> plan.execute(1.5, 25, [0] * 50)
+
+        Atomic tags, arrays of atomic types, bits, and strings are supported.  Other structures and arrays too large
+        for a single request are not.
+
+        :param tags: the tags to write, each call to ``execute`` will be given a value for each tag in the same order
+        :return: the plan to write the tags
+        :raises RequestError: if a tag is invalid or not supported
+        """
+        parsed_requests = self._parse_requested_tags(tags)
+        for tag, tag_data in parsed_requests.items():
+            if tag_data.get('error') is not None:
+                raise RequestError(f'Invalid tag request {tag} - {tag_data["error"]}')
+            tag_data['value'] = _placeholder_value(tag_data)
+
+        requests, bit_writes = self._write_build_requests(parsed_requests)
+        buffers = {}
+        for request in requests:
+            buffers.update(request.value_buffers())
+
+        value_slots = {}
+        bit_slots = {}
+        for i, tag in enumerate(tags):
+            tag_data = parsed_requests[tag]
+            service = TAG_SERVICES_REQUEST['Write Tag' if tag_data['bit'] is None else 'Read Modify Write Tag']
+            try:
+                buffer, end = buffers[(tag_data['plc_tag'], tag_data['elements'], service)]
+            except KeyError:
+                raise RequestError(f'Failed to build request for {tag}')
+
+            if tag_data['bit'] is None:
+                pack, size = _value_packer(tag_data, self.string_encoding)
+                value_slots[i] = ValueSlot(buffer, end - size, pack)
+            else:
+                typ, bit = tag_data['bit']
+                if tag_data['plc_tag'] not in bit_slots:
+                    mask_size = DATA_TYPE_SIZE[tag_data['tag_info']['data_type']]
+                    bit_slots[tag_data['plc_tag']] = BitSlot(buffer, end - 2 * mask_size, mask_size, [])
+                bit_slots[tag_data['plc_tag']].bits.append((i, bit % 32 if typ == 'bool_array' else bit))
+
+        return WritePlan(self, tags, parsed_requests, requests, value_slots, list(bit_slots.values()))
+
+    @with_forward_open
+    def _execute_write_plan(self, plan: WritePlan, values: Sequence[Any]) -> Union[Tag, List[Tag]]:
+        with self._lock:  # the messages are shared by every execution of the plan
+            plan._pack(values)
+            write_results = self._send_requests(plan._requests)
+
+        results = [result.to_tag() for result in
+                   self._write_results(list(zip(plan.tags, values)), plan._parsed_requests, write_results)]
+        return results if len(results) > 1 else results[0]
+
+    def _write_results(self, tags_values, parsed_requests, write_results):
         results = []
         for tag, value in tags_values:
             try:
                 request_data = parsed_requests[tag]
-                bit = parsed_requests[tag].get('bit')
-                result = write_results[(request_data['plc_tag'], request_data['elements'])]
-
-                if request_data['elements'] > 1:
-                    result = result._replace(type=f'{result.type}[{request_data["elements"]}]')
-                if bit is not None:
-                    result = result._replace(tag=tag, type='BOOL', value=value)
+                if request_data.get('error') is not None:
+                    results.append(_TagResult(tag, None, None, request_data['error']))
+                    continue
+                result = write_results[_write_key(request_data)]
+
+                if request_data.get('bit') is not None:
+                    results.append(_TagResult(tag, value, 'BOOL', result.error, result.packet))
+                elif request_data['elements'] > 1:
+                    results.append(_TagResult(request_data['plc_tag'], value,
+                                              f'{result.type}[{request_data["elements"]}]', result.error,
+                                              result.packet))
                 else:
-                    result = result._replace(tag=request_data['plc_tag'], value=value)
-                results.append(result)
+                    results.append(_TagResult(request_data['plc_tag'], value, result.type, result.error,
+                                              result.packet))
             except Exception as err:
-                results.append(Tag(tag, None, None, f'Invalid tag request - {err}'))
+                results.append(_TagResult(tag, None, None, f'Invalid tag request - {err}'))
 
-        if len(tags_values) > 1:
-            return results
-        else:
-            return results[0]
+        return results
 
-    def _write_build_requests(self, parsed_tags):
-        bit_writes = {}
-        if len(parsed_tags) == 1 or self._micro800:
-            requests = (self._write_build_single_request(parsed_tags[tag], bit_writes) for tag in parsed_tags)
+    def _write_build_requests(self, parsed_tags, force_multi=False):
+        bit_writes = _group_bit_writes(parsed_tags)
+        value_tags = {tag: tag_data for tag, tag_data in parsed_tags.items() if tag_data.get('bit') is None}
+        if (len(parsed_tags) == 1 and not force_multi) or self._micro800:
+            requests = [self._write_build_single_request(tag_data) for tag_data in value_tags.values()]
+            requests.extend(self._write_build_bit_request(tag, bit_write) for tag, bit_write in bit_writes.items())
             return [r for r in requests if r is not None], bit_writes
         else:
-            return self._write_build_multi_requests(parsed_tags, bit_writes), bit_writes
+            return self._write_build_multi_requests(value_tags, bit_writes), bit_writes
 
     def _write_build_multi_requests(self, parsed_tags, bit_writes):
         requests = []
@@ -1095,19 +1502,17 @@ class LogixDriver:
             if tag_data.get('error') is None and (tag_data['plc_tag'], tag_data['elements']) not in tags_in_requests:
                 tags_in_requests.add((tag_data['plc_tag'], tag_data['elements']))
 
-                string = _make_string_bytes(tag_data)
+                string = _make_string_bytes(tag_data, self.string_encoding)
                 if string is not None:
                     tag_data['value'] = string
 
-                if _bit_request(tag_data, bit_writes):
-                    continue
-
                 tag_data['write_value'] = writable_value(tag_data['value'], tag_data['elements'],
                                                          tag_data['tag_info']['data_type'])
 
-                if len(tag_data['write_value']) > self.connection_size:
+                if self._write_size(tag_data) + _MULTI_REQUEST_OVERHEAD >= self.max_message_size:
                     _request = self.new_request('write_tag_fragmented')
-                    _request.add(tag_data['plc_tag'], tag_data['value'], tag_data['elements'], tag_data['tag_info'])
+                    _request.add(tag_data['plc_tag'], tag_data['write_value'], tag_data['elements'],
+                                 tag_data['tag_info'])
                     requests.append(_request)
                     continue
 
@@ -1123,74 +1528,126 @@ class LogixDriver:
                     self.__log.exception(f'Failed to build request for {tag} - skipping')
                     continue
 
-        if bit_writes:
-            for tag in bit_writes:
-                try:
-                    value = bit_writes[tag]['or_mask'], bit_writes[tag]['and_mask']
-                    if not current_request.add_write(tag, value, tag_info=bit_writes[tag]['tag_info'], bits_write=True):
-                        current_request = self.new_request('multi_request')
-                        requests.append(current_request)
-                        current_request.add_write(tag, value, tag_info=bit_writes[tag]['tag_info'], bits_write=True)
-                except RequestError:
-                    self.__log.exception(f'Failed to build request for {tag} - skipping')
-                    continue
+        # bits are written after the other values, so bits of a word also being written are applied to the new value.
+        # each service is added to the first request with room for it, the bits may be written in any order
+        open_requests = [current_request]
+        for tag, bit_write in bit_writes.items():
+            try:
+                value = bit_write['or_mask'], bit_write['and_mask']
+                for request in open_requests:
+                    if request.add_write(tag, value, tag_info=bit_write['tag_info'], bits_write=True):
+                        break
+                else:
+                    current_request = self.new_request('multi_request')
+                    requests.append(current_request)
+                    open_requests.append(current_request)
+                    current_request.add_write(tag, value, tag_info=bit_write['tag_info'], bits_write=True)
+            except RequestError:
+                self.__log.exception(f'Failed to build request for {tag} - skipping')
+                continue
 
         return requests
 
-    def _write_build_single_request(self, parsed_tag, bit_writes):
+    def _write_build_single_request(self, parsed_tag):
         if parsed_tag.get('error') is None:
 
-            string = _make_string_bytes(parsed_tag)
+            string = _make_string_bytes(parsed_tag, self.string_encoding)
             if string is not None:
                 parsed_tag['value'] = string
 
-            if not _bit_request(parsed_tag, bit_writes):
-                parsed_tag['write_value'] = writable_value(parsed_tag['value'], parsed_tag['elements'],
-                                                         parsed_tag['tag_info']['data_type'])
-                if len(parsed_tag['write_value']) > self.connection_size:
-                    request = self.new_request('write_tag_fragmented')
-                else:
-                    request = self.new_request('write_tag')
-
-                request.add(parsed_tag['plc_tag'], parsed_tag['write_value'], parsed_tag['elements'],
-                            parsed_tag['tag_info'])
-                return request
+            parsed_tag['write_value'] = writable_value(parsed_tag['value'], parsed_tag['elements'],
+                                                     parsed_tag['tag_info']['data_type'])
+            if self._write_size(parsed_tag) + 2 > self.max_message_size:  # sequence count
+                request = self.new_request('write_tag_fragmented')
             else:
-                try:
-                    tag = parsed_tag['plc_tag']
-                    value = bit_writes[tag]['or_mask'], bit_writes[tag]['and_mask']
-                    request = self.new_request('write_tag')
-                    request.add(tag, value, tag_info=bit_writes[tag]['tag_info'], bits_write=True)
-                    return request
-                except RequestError:
-                    self.__log.exception(f'Failed to build request for {tag} - skipping')
-                    return None
+                request = self.new_request('write_tag')
+
+            request.add(parsed_tag['plc_tag'], parsed_tag['write_value'], parsed_tag['elements'],
+                        parsed_tag['tag_info'])
+            return request
         else:
             self.__log.error(f'Skipping making request, error: {parsed_tag["error"]}')
             return None
 
-    def _get_tag_info(self, base, attrs) -> Optional[dict]:
-
-        def _recurse_attrs(attrs, data):
-            cur, *remain = attrs
-            curr_tag = _strip_array(cur)
-            if not len(remain):
-                return data.get(curr_tag)
-            else:
-                if curr_tag in data:
-                    return _recurse_attrs(remain, data[curr_tag]['data_type']['internal_tags'])
-                else:
-                    return None
+    def _write_build_bit_request(self, tag, bit_write):
         try:
-            data = self._tags.get(_strip_array(base))
-            if not len(attrs):
-                return data
+            value = bit_write['or_mask'], bit_write['and_mask']
+            request = self.new_request('write_tag')
+            request.add(tag, value, tag_info=bit_write['tag_info'], bits_write=True)
+            return request
+        except RequestError:
+            self.__log.exception(f'Failed to build request for {tag} - skipping')
+            return None
+
+    def _verify_build_reads(self, write_requests, parsed_tags):
+        """
+        Adds reads of the written tags to the write requests for verifying the values written.  Services in a
+        Multiple Service Packet are processed in order, so each read is added to the first request with room for it
+        that is not before the request writing the tag.  Reads that do not fit are built into new requests.
+
+        :return: the new read requests, to be sent after ``write_requests``
+        """
+        requests_for_tags = {}
+        for i, request in enumerate(write_requests):
+            for tag in ([service.tag for service in request.tags] if request.type_ == 'multi' else [request.tag]):
+                requests_for_tags[tag] = i  # bits and values of the same word use the last request
+
+        open_requests = []  # [index, request, response size]
+        max_response_size = self.max_message_size - _MULTI_REPLY_OVERHEAD
+        for i, request in enumerate(write_requests):
+            if request.type_ == 'multi':
+                open_requests.append([i, request, len(request.tags) * _WRITE_SERVICE_OVERHEAD])
+
+        reads = {}
+        for tag, tag_data in parsed_tags.items():
+            if tag_data.get('error') is not None or tag_data['plc_tag'] not in requests_for_tags:
+                continue
+            elements = 1 if tag_data.get('bit') is not None else tag_data['elements']
+            if (tag_data['plc_tag'], elements) in reads:
+                continue
+
+            return_size = _element_size(tag_data['tag_info']) * elements + _READ_SERVICE_OVERHEAD
+            for open_request in open_requests:
+                index, request, response_size = open_request
+                if (index >= requests_for_tags[tag_data['plc_tag']] and response_size + return_size <= max_response_size
+                        and request.add_read(tag_data['plc_tag'], elements, tag_data['tag_info'])):
+                    open_request[2] += return_size
+                    reads[(tag_data['plc_tag'], elements)] = None
+                    break
             else:
-                return _recurse_attrs(attrs, data['data_type']['internal_tags'])
+                reads[(tag_data['plc_tag'], elements)] = {'plc_tag': tag_data['plc_tag'], 'elements': elements,
+                                                          'tag_info': tag_data['tag_info']}
 
-        except Exception as err:
-            self.__log.exception(f'Failed to lookup tag data for {base}, {attrs}')
-            raise
+        remaining = {key: tag_data for key, tag_data in reads.items() if tag_data is not None}
+        return self._read_build_requests(remaining) if remaining else []
+
+    def _read_request_size(self, tag) -> int:
+        """
+        Returns the size of a Read Tag service for ``tag`` inside a Multiple Service Packet: service, request path,
+        element count, and the offset to the service
+        """
+        return 1 + request_path_size(self, tag) + 2 + 2
+
+    def _write_size(self, tag_data) -> int:
+        """
+        Returns the size of a Write Tag service for the request: service, request path, data type, element count
+        and value
+        """
+        data_type_size = 4 if tag_data['tag_info']['tag_type'] == 'struct' else 2  # structures include the handle
+        return (1 + request_path_size(self, tag_data['plc_tag']) + data_type_size + 2 +
+                len(tag_data['write_value']))
+
+    def _get_tag_info(self, address: TagAddress) -> Optional[dict]:
+        """
+        Returns the definition of the tag or member being addressed, or None if it does not exist
+        """
+        data = self._tags.get(address.base)
+        for member, _ in address.members:
+            if data is None or data['tag_type'] != 'struct':
+                return None
+            data = data['data_type']['internal_tags'].get(member)
+
+        return data
 
     def _parse_requested_tags(self, tags):
         requests = {}
@@ -1214,75 +1671,97 @@ class LogixDriver:
         return requests
 
     def _parse_tag_request(self, tag: str) -> Optional[Tuple[str, Optional[int], int, dict]]:
-        try:
-            if tag.endswith('}') and '{' in tag:
-                tag, _tmp = tag.split('{')
-                elements = int(_tmp[:-1])
-            else:
-                elements = 1
-
-            bit = None
-
-            base, *attrs = tag.split('.')
-            if base.startswith('Program:'):
-                base = f'{base}.{attrs.pop(0)}'
-            if len(attrs) and attrs[-1].isdigit():
-                _bit = attrs.pop(-1)
-                bit = ('bit', int(_bit))
-                if not len(attrs):
-                    tag = base
-                else:
-                    tag = f"{base}.{''.join(attrs)}"
+        # results depend on the tag definitions, so the cache is replaced with the tag list
+        tag_list, cache = self._tag_request_cache
+        if tag_list is not self._tags:
+            tag_list, cache = self._tag_request_cache = (self._tags, {})
 
-            tag_info = self._get_tag_info(base, attrs)
+        parsed = cache.get(tag)
+        if parsed is None:
+            parsed = self._parse_tag_address(tag)
+            if len(cache) < ADDRESS_CACHE_SIZE:
+                cache[tag] = parsed
+
+        return parsed
+
+    def _parse_tag_address(self, tag: str) -> Tuple[str, Optional[int], int, dict]:
+        try:
+            address = parse_tag_address(tag)
+            tag_info = self._get_tag_info(address)
+            if tag_info is None:
+                raise RequestError(f'Tag not found: {address.tag}')
+            plc_tag, elements = address.tag, address.elements
+            bit = None if address.bit is None else ('bit', address.bit)
+            if bit is not None:
+                data_type = tag_info['data_type']
+                bits = BITS_PER_INT_TYPE.get(data_type) if isinstance(data_type, str) else None
+                if bits is None:  # only integers and bit strings have bits, not REALs, times, or structures
+                    type_name = data_type if isinstance(data_type, str) else data_type.get('name')
+                    raise RequestError(f'Bits of {type_name} cannot be accessed: {tag}')
+                if address.bit >= bits:
+                    raise RequestError(f'Bit out of range for {data_type}: {tag}')
 
             if tag_info['data_type'] == 'DWORD' and elements == 1:
-                _tag, idx = _get_array_index(tag)
-                tag = f'{_tag}[{idx // 32}]'
+                idx = address.index[-1] if address.index else 0
+                plc_tag = f'{address.array_tag}[{idx // 32}]'
                 bit = ('bool_array', idx)
-                elements = 1
 
-            return tag, bit, elements, tag_info
+            return plc_tag, bit, elements, tag_info
 
         except Exception as err:
             # something went wrong parsing the tag path
-            raise RequestError('Failed to parse tag request', tag)
+            raise RequestError(f'Failed to parse tag request - {err}') from err
 
     @staticmethod
-    def _send_requests(requests):
+    def _send_requests(requests, first_packet=0):
+        """
+        Sends the requests, returning the result of each read or write.  The time each request was sent and its reply
+        received is recorded on the results, along with the index of the request starting from ``first_packet``.
+        Fragmented requests are sent as multiple packets, the times are from sending the first until the last reply.
+        """
 
         def _mkkey(t=None, r=None):
+            # writes are kept separate from reads of the same tag, and bit writes from writes of the whole value
             if t is not None:
-                return t['tag'], t['elements']
+                if t.service == 'write':
+                    return t.tag, 'bits' if t.bits_write else t.elements, 'write'
+                return t.tag, t.elements
             else:
+                if r.type_ == 'write':
+                    return r.tag, 'bits' if getattr(r, 'bits_write', False) else r.elements, 'write'
                 return r.tag, r.elements
 
         results = {}
 
-        for request in requests:
+        for index, request in enumerate(requests, first_packet):
+            sent, sent_monotonic = time.time(), time.perf_counter()
             try:
                 response = request.send()
             except Exception as err:
+                response, error = None, str(err)
+            packet = PacketTimes(index, sent, time.time(), sent_monotonic, time.perf_counter())
+
+            if response is None:
                 if request.type_ != 'multi':
-                    results[_mkkey(r=request)] = Tag(request.tag, None, None, str(err))
+                    results[_mkkey(r=request)] = _TagResult(request.tag, None, None, error, packet)
                 else:
                     for tag in request.tags:
-                        results[_mkkey(t=tag)] = Tag(tag['tag'], None, None, str(err))
+                        results[_mkkey(t=tag)] = _TagResult(tag.tag, None, None, error, packet)
             else:
                 if request.type_ != 'multi':
                     if response:
-                        results[_mkkey(r=request)] = Tag(request.tag,
-                                                         response.value if request.type_ == 'read' else request.value,
-                                                         response.data_type if request.type_ == 'read' else request.data_type)
+                        results[_mkkey(r=request)] = _TagResult(
+                            request.tag, response.value if request.type_ == 'read' else request.value,
+                            response.data_type if request.type_ == 'read' else request.data_type, None, packet)
                     else:
-                        results[_mkkey(r=request)] = Tag(request.tag, None, None, response.error)
+                        results[_mkkey(r=request)] = _TagResult(request.tag, None, None, response.error, packet)
                 else:
                     for tag in response.tags:
-                        if tag['service_status'] == SUCCESS:
-                            results[_mkkey(t=tag)] = Tag(tag['tag'], tag['value'], tag['data_type'])
+                        if tag.service_status == SUCCESS:
+                            results[_mkkey(t=tag)] = _TagResult(tag.tag, tag.value, tag.data_type, None, packet)
                         else:
-                            results[_mkkey(t=tag)] = Tag(tag['tag'], None, None,
-                                                         tag.get('error', 'Unknown Service Error'))
+                            results[_mkkey(t=tag)] = _TagResult(tag.tag, None, None,
+                                                                tag.error or 'Unknown Service Error', packet)
         return results
 
 
@@ -1402,94 +1881,372 @@ def writable_value(value, elements, data_type):
         return value
 
     try:
-        pack_func = PACK_DATA_FUNCTION[data_type]
         if elements > 1:
+            if data_type in PACK_DATA_FORMAT:
+                return pack_array(data_type, value, elements)
+            pack_func = PACK_DATA_FUNCTION[data_type]
             return b''.join(pack_func(value[i]) for i in range(elements))
         else:
-            return pack_func(value)
+            return PACK_DATA_FUNCTION[data_type](value)
     except Exception as err:
         raise RequestError('Unable to create a writable value', err)
 
 
-def _strip_array(tag):
-    if '[' in tag:
-        return tag[:tag.find('[')]
-    return tag
+def _array_length(tag_info):
+    """
+    Returns the number of elements if the tag or member is a single dimension array, else None
+    """
+    if 'dim' in tag_info:
+        return tag_info['dimensions'][0] if tag_info['dim'] == 1 else None
+    return tag_info.get('array') or None
 
 
-def _get_array_index(tag):
-    if tag.endswith(']') and '[' in tag:
-        tag, _tmp = tag.split('[')
-        idx = int(_tmp[:-1])
-    else:
-        idx = 0
+def _array_read_index(tag_data):
+    """
+    Returns the ``(array tag, starting index)`` for a read of elements from a single dimension array or None
+    if the read cannot be merged with others.  Bool arrays are excluded since they are read as DWORDs.
+    """
+    if tag_data.get('error') is not None:
+        return None
+
+    tag_info = tag_data['tag_info']
+    if tag_info['tag_type'] == 'atomic' and (tag_info['data_type'] not in DATA_TYPE_SIZE or
+                                             tag_info['data_type'] == 'DWORD'):
+        return None
 
-    return tag, idx
+    length = _array_length(tag_info)
+    if length is None:
+        return None
 
+    address = parse_tag_address(tag_data['plc_tag'])
+    if len(address.index) > 1:
+        return None
+    base, idx = address.array_tag, address.index[0] if address.index else 0
 
-def _tag_return_size(tag_info):
-    if tag_info['tag_type'] == 'atomic':
-        size = DATA_TYPE_SIZE[tag_info['data_type']]
-    else:
-        size = tag_info['data_type']['template']['structure_size']
+    if idx + tag_data['elements'] > length:
+        return None
+
+    return base, idx
+
+
+def _fold_array_reads(parsed_tags):
+    """
+    Merges reads of overlapping or adjacent elements from the same array into a single read of the whole range.
+    Reads separated by a small gap are also merged if reading the unused elements in between is smaller than
+    the overhead of another service in the reply.  Large ranges will be read with a fragmented read.  Each merged
+    tag request is updated with a ``read`` key of ``(plc_tag, elements, offset)`` for the ranged read its value
+    will be extracted from.
+
+    :return: a dict of the parsed tag requests to send, like ``parsed_tags``
+    """
+    reads = {}
+    arrays = defaultdict(list)
+    for tag, tag_data in parsed_tags.items():
+        array_index = _array_read_index(tag_data)
+        if array_index is None:
+            reads[tag] = tag_data
+        else:
+            base, idx = array_index
+            arrays[base].append((idx, tag, tag_data))
+
+    for base, array_reads in arrays.items():
+        array_reads.sort(key=lambda x: x[0])
+        max_gap = _READ_SERVICE_OVERHEAD // _element_size(array_reads[0][2]['tag_info'])
+        runs = []
+        for idx, tag, tag_data in array_reads:
+            end = idx + tag_data['elements']
+            if runs and idx <= runs[-1][1] + max_gap:
+                runs[-1][1] = max(runs[-1][1], end)
+                runs[-1][2].append((idx, tag, tag_data))
+            else:
+                runs.append([idx, end, [(idx, tag, tag_data)]])
+
+        for start, end, run in runs:
+            if len({(idx, tag_data['elements']) for idx, _, tag_data in run}) == 1:
+                reads.update((tag, tag_data) for _, tag, tag_data in run)
+                continue
+
+            plc_tag, elements = f'{base}[{start}]', end - start
+            reads[f'{plc_tag}{{{elements}}}'] = {'plc_tag': plc_tag, 'bit': None, 'elements': elements,
+                                                 'tag_info': run[0][2]['tag_info']}
+            for idx, _, tag_data in run:
+                tag_data['read'] = (plc_tag, elements, idx - start)
+
+    return reads
+
+
+class _TagResult:
+    """
+    The result of a request inside the driver, only converted to a ``Tag`` (or ``TagColumns``) when returned.
+    ``packet`` is the ``PacketTimes`` of the request was sent in, None if it was not sent.
+    """
+    __slots__ = ('tag', 'value', 'type', 'error', 'packet')
+
+    def __init__(self, tag, value, type_=None, error=None, packet=None):
+        self.tag = tag
+        self.value = value
+        self.type = type_
+        self.error = error
+        self.packet = packet
+
+    def __bool__(self):
+        return self.value is not None and self.error is None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.tag!r}, {self.value!r}, {self.type!r}, {self.error!r})'
+
+    def to_tag(self) -> Tag:
+        return Tag(self.tag, self.value, self.type, self.error)
 
-    return size + 12  # account for service overhead
+
+def _result_columns(results) -> TagColumns:
+    """
+    Returns the results as a ``TagColumns``
+    """
+    return TagColumns([result.tag for result in results], [result.value for result in results],
+                      [result.type for result in results], [result.error for result in results],
+                      [result.packet for result in results])
+
+
+def _get_read_result(read_results, tag_data):
+    """
+    Returns the result for a tag request, extracting it from the result of a merged or structure read if needed
+    """
+    if 'member' in tag_data:
+        parent_data, member, index = tag_data['member']
+        return _extract_member(_get_read_result(read_results, parent_data), tag_data, member, index)
+
+    if 'read' in tag_data:
+        plc_tag, elements, offset = tag_data['read']
+        return _extract_elements(read_results[(plc_tag, elements)], tag_data['plc_tag'], offset, tag_data['elements'])
+
+    return read_results[(tag_data['plc_tag'], tag_data['elements'])]
+
+
+def _join_split_read(head, tail, tag, elements):
+    """
+    Joins the results of the reads of a split read back into the result for the whole read
+    """
+    if not head:
+        return _TagResult(tag, None, None, head.error, head.packet)
+    if not tail:
+        return _TagResult(tag, None, None, tail.error, tail.packet)
+
+    data_type = head.type[:head.type.rfind('[')]
+    tail_value = tail.value if isinstance(tail.value, list) else [tail.value]
+    return _TagResult(tag, head.value + tail_value, f'{data_type}[{elements}]', None, tail.packet)
+
+
+def _extract_member(result, tag_data, member, index):
+    """
+    Extracts the value of a member from the result of reading the whole structure
+    """
+    tag, elements, tag_info = tag_data['plc_tag'], tag_data['elements'], tag_data['tag_info']
+    if not result:
+        return _TagResult(tag, None, None, result.error, result.packet)
+
+    value = result.value[member]
+    data_type = tag_info['data_type'] if tag_info['tag_type'] == 'atomic' else tag_info['data_type']['name']
+    if tag_info.get('array'):
+        if elements > 1:
+            return _TagResult(tag, value[index: index + elements], f'{data_type}[{elements}]', None, result.packet)
+        value = value[index]
+
+    return _TagResult(tag, value, data_type, None, result.packet)
 
 
-def _string_to_sint_array(string, string_len):
-    sint_array = [b'\x00' for _ in range(string_len)]
-    if len(string) > string_len:
-        string = string[:string_len]
+def _extract_elements(result, tag, offset, elements):
+    """
+    Extracts the elements for a single tag request from the result of a merged array read
+    """
+    if not result:
+        return _TagResult(tag, None, None, result.error, result.packet)
 
-    for i, s in enumerate(string):
-        unsigned = ord(s)
-        sint_array[i] = pack_sint(unsigned - 256 if unsigned > 127 else unsigned)
+    data_type = result.type[:result.type.rfind('[')]
+    if elements == 1:
+        return _TagResult(tag, result.value[offset], data_type, None, result.packet)
 
-    return b''.join(sint_array)
+    return _TagResult(tag, result.value[offset: offset + elements], f'{data_type}[{elements}]', None,
+                      result.packet)
 
 
-def _make_string_bytes(tag_data):
-    if tag_data['tag_info']['tag_type'] == 'struct':
-        string_length = tag_data['tag_info']['data_type'].get('string')
+def _element_size(tag_info):
+    if tag_info['tag_type'] == 'atomic':
+        return DATA_TYPE_SIZE[tag_info['data_type']]
     else:
+        return tag_info['data_type']['template']['structure_size']
+
+
+def _read_reply_size(tag_info, elements):
+    """
+    Returns the size of a Read Tag reply, structures also include the structure handle
+    """
+    handle_size = 2 if tag_info['tag_type'] == 'struct' else 0
+    return _READ_REPLY_OVERHEAD + handle_size + _element_size(tag_info) * elements
+
+
+def _tag_return_size(tag_info):
+    return _element_size(tag_info) + _READ_SERVICE_OVERHEAD
+
+
+def _make_string_bytes(tag_data, encoding=STRING_ENCODING):
+    """
+    Returns the value of ``tag_data`` encoded for writing to a STRING (or custom string type) tag, or None if the tag
+    is not a string.  Each string is padded to the size of the string type.
+    """
+    data_type = tag_data['tag_info']['data_type']
+    if tag_data['tag_info']['tag_type'] != 'struct' or not data_type.get('string'):
         return None
 
-    if tag_data['elements'] > 1:
-        string_bytes = b''
-        for val in tag_data['value']:
-            str_data = _string_to_sint_array(val, string_length)
-            str_bytes = pack_dint(len(val)) + str_data
-            string_bytes += str_bytes + b'\x00' * (len(str_bytes) % 4)  # pad data to 4-byte boundaries
+    string_length = data_type['string']
+    size = data_type.get('template', {}).get('structure_size') or string_size(string_length)
+    try:
+        if tag_data['elements'] > 1:
+            return encode_strings(tag_data['value'], string_length, size, encoding)
+        else:
+            return encode_string(tag_data['value'], string_length, size, encoding)
+    except UnicodeError as err:
+        raise RequestError('Unable to create a writable value', err)
+
+
+def _placeholder_value(tag_data):
+    """
+    Returns a value for building the request to write ``tag_data``, the same size as any other value for the tag
+    """
+    if tag_data['bit'] is not None:
+        return False
+
+    tag_info = tag_data['tag_info']
+    if tag_info['tag_type'] == 'struct':
+        if not tag_info['data_type'].get('string'):
+            raise RequestError(f'Structures are not supported by write plans: {tag_data["plc_tag"]}')
+        value = ''
     else:
-        str_data = _string_to_sint_array(tag_data['value'], string_length)
-        string_bytes = pack_dint(len(tag_data['value'])) + str_data
+        if tag_info['data_type'] not in PACK_DATA_FORMAT:
+            raise RequestError(f'Unsupported data type {tag_info["data_type"]}: {tag_data["plc_tag"]}')
+        value = 0
 
-    return string_bytes + b'\x00' * (len(string_bytes) % 4)  # pad data to 4-byte boundaries
+    return [value] * tag_data['elements'] if tag_data['elements'] > 1 else value
 
 
-def _bit_request(tag_data, bit_requests):
-    if tag_data.get('bit') is None:
-        return None
+def _value_packer(tag_data, encoding=STRING_ENCODING):
+    """
+    Returns ``(function to pack a value into a buffer, size of the packed value)`` for writing to ``tag_data``
+    """
+    tag_info, elements = tag_data['tag_info'], tag_data['elements']
+    if tag_info['tag_type'] == 'struct':
+        def pack_string(buffer, offset, value):
+            data = _make_string_bytes({'tag_info': tag_info, 'elements': elements, 'value': value}, encoding)
+            buffer[offset:offset + len(data)] = data
+
+        placeholder = {'tag_info': tag_info, 'elements': elements, 'value': [''] * elements if elements > 1 else ''}
+        return pack_string, len(_make_string_bytes(placeholder))
+
+    fmt = struct.Struct(f'<{elements}{PACK_DATA_FORMAT[tag_info["data_type"]]}')
+    if elements > 1:
+        def pack_values(buffer, offset, value):
+            fmt.pack_into(buffer, offset, *value[:elements])
+
+        return pack_values, fmt.size
+
+    return fmt.pack_into, fmt.size
+
+
+def _write_key(tag_data):
+    """
+    Returns the key of the result for writing ``tag_data`` from ``_send_requests``
+    """
+    if tag_data.get('bit') is not None:
+        return tag_data['plc_tag'], 'bits', 'write'
+    return tag_data['plc_tag'], tag_data['elements'], 'write'
 
-    if tag_data['plc_tag'] not in bit_requests:
-        bit_requests[tag_data['plc_tag']] = {'and_mask': 0xFFFFFFFF,
-                                             'or_mask': 0x00000000,
-                                             'bits': [],
-                                             'tag_info': tag_data['tag_info']}
 
-    bits_ = bit_requests[tag_data['plc_tag']]
-    typ_, bit = tag_data['bit']
-    bits_['bits'].append(bit)
+def _bit_value(bit, value):
+    """
+    Returns the value of a bit from the value of the word containing it, ``bit`` is the ``bit`` of a parsed tag
+    """
+    typ, bit = bit
+    if typ == 'bit':
+        return bool(value & (1 << bit))
+    else:
+        return value[bit % 32]
 
-    if typ_ == 'bool_array':
-        bit = bit % 32
 
-    if tag_data['value']:
-        bits_['or_mask'] |= (1 << bit)
+def _verify_write(result, tag_data, bit_writes, results, encoding=STRING_ENCODING):
+    """
+    Compares the value read back after writing a tag to the value written, setting the error of ``result``
+    if they do not match or the tag could not be read.  Values are compared as they were encoded for the write,
+    so floats are not affected by rounding.
+    """
+    if not result:
+        return result
+
+    elements = 1 if tag_data.get('bit') is not None else tag_data['elements']
+    read_result = results.get((tag_data['plc_tag'], elements))
+    if read_result is None or not read_result:
+        error = read_result.error if read_result is not None else 'tag not read'
+        result.error = f'Write verification failed - {error}'
+        return result
+
+    try:
+        if tag_data.get('bit') is not None:
+            verified = _bit_value(tag_data['bit'], read_result.value) == bool(tag_data['value'])
+        else:
+            written = tag_data['write_value']
+            string = _make_string_bytes({**tag_data, 'value': read_result.value}, encoding)
+            read_back = writable_value(read_result.value if string is None else string,
+                                       elements, tag_data['tag_info']['data_type'])
+            bit_write = bit_writes.get(tag_data['plc_tag'])
+            if bit_write is not None:  # bits of the word were written after the value
+                mask = (1 << 8 * len(written)) - 1
+                written = (int.from_bytes(written, 'little') | bit_write['or_mask']) & bit_write['and_mask'] & mask
+                read_back = int.from_bytes(read_back, 'little') & mask
+            verified = read_back == written
+    except Exception as err:
+        verified, error = False, err
     else:
-        bits_['and_mask'] &= ~(1 << bit)
+        error = f'read back {read_result.value!r}'
+
+    if not verified:
+        result.error = f'Write verification failed - {error}'
+    return result
+
+
+def _group_bit_writes(parsed_tags):
+    """
+    Groups the requests to write bits by the word containing them, so each word is written with a single
+    Read Modify Write service no matter how many of its bits are written.  The masks are the size of the word,
+    e.g. 1 byte for a SINT or 8 bytes for a LINT, and bits of BOOL arrays are grouped by the DWORD containing them.
+    If the same bit is written more than once, the last value is used.  Bits of types other than integers and
+    bit strings, and bits outside of the word, are rejected when the tag is parsed and never reach here.
+
+    :return: ``{word tag: {'tag_info', 'or_mask', 'and_mask', 'bits'}}``, with ``bits`` the requested tags
+    """
+    bit_writes = {}
+    for tag, tag_data in parsed_tags.items():
+        if tag_data.get('error') is not None or tag_data.get('bit') is None:
+            continue
+
+        mask_size = DATA_TYPE_SIZE[tag_data['tag_info']['data_type']]
+        typ, bit = tag_data['bit']
+        if typ == 'bool_array':
+            bit = bit % 32
+
+        word = bit_writes.get(tag_data['plc_tag'])
+        if word is None:
+            word = bit_writes[tag_data['plc_tag']] = {'tag_info': tag_data['tag_info'], 'or_mask': 0,
+                                                      'and_mask': (1 << mask_size * 8) - 1, 'bits': []}
+
+        mask = 1 << bit
+        if tag_data['value']:
+            word['or_mask'] |= mask
+            word['and_mask'] |= mask
+        else:
+            word['or_mask'] &= ~mask
+            word['and_mask'] &= ~mask
+        word['bits'].append(tag)
 
-    return True
+    return bit_writes
 
 
 def _parse_connection_path(path, micro800):
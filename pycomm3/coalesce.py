@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+#
+# coalesce.py - Combine concurrent read requests into a single set of packets
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+from autologging import logged
+
+if TYPE_CHECKING:
+    from .clx import _TagResult
+
+
+class _Batch:
+    """
+    A group of read requests from one or more callers that will be sent together
+    """
+
+    def __init__(self):
+        self.tags: Dict[str, None] = {}  # dict used as an ordered set
+        self.callers = 0
+        self.results: Optional[Dict[str, '_TagResult']] = None
+        self.error: Optional[Exception] = None
+        self.done = threading.Event()
+
+
+@logged
+class ReadCoalescer:
+    """
+    Holds read requests made at the same time by different threads for a short window, then sends them
+    all as one read.  Duplicate tags are only read once and the results are returned to every caller that requested them.
+
+    The first caller to arrive becomes the leader of a new batch, it waits for ``window`` seconds and then until the
+    driver is available.  Any callers that arrive while the leader is waiting join its batch instead of sending
+    their own requests.  Once the leader has the driver, the batch is closed and the next caller will start a new one.
+
+    A caller already holding the driver lock does not join a batch, since the leader could not send the batch
+    until the caller released the lock, it reads its tags immediately instead.
+    """
+
+    def __init__(self, read_func: Callable[[Sequence[str]], List['_TagResult']], lock):
+        """
+        :param read_func: function to read a list of tags, returning a list of results in the same order
+        :param lock: the lock held while the driver is sending requests
+        """
+        self._read_func = read_func
+        self._driver_lock = lock
+        self._lock = threading.Lock()
+        self._batch: Optional[_Batch] = None
+
+    def read(self, tags: Sequence[str], window: float) -> List['_TagResult']:
+        """
+        Reads the tags, combined with any other reads requested within ``window`` seconds
+
+        :param tags: the tags to read
+        :param window: number of seconds to wait for other requests before sending
+        :return: a list of results, one for each of ``tags``
+        """
+        if _is_owned(self._driver_lock):
+            return self._read_func(tags)
+
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch()
+            batch.tags.update(dict.fromkeys(tags))
+            batch.callers += 1
+
+        if leader:
+            self._send_batch(batch, window)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+
+        return [batch.results[tag] for tag in tags]
+
+    def _send_batch(self, batch, window):
+        try:
+            time.sleep(window)
+            with self._driver_lock:
+                with self._lock:
+                    self._batch = None
+                tags = list(batch.tags)
+                self.__log.debug(f'Sending {len(tags)} tags for {batch.callers} read request(s)')
+                batch.results = dict(zip(tags, self._read_func(tags)))
+        except Exception as err:
+            batch.error = err
+            with self._lock:
+                if self._batch is batch:
+                    self._batch = None
+        finally:
+            batch.done.set()
+
+
+def _is_owned(lock) -> bool:
+    """
+    Returns True if ``lock`` is an RLock held by the current thread
+    """
+    is_owned = getattr(lock, '_is_owned', None)  # private, but it is the same check used by threading.Condition
+    return is_owned is not None and is_owned()
@@ -230,9 +230,24 @@ DATA_TYPE_SIZE = {
     'SINT': 1,
     'INT': 2,
     'DINT': 4,
+    'LINT': 8,
+    'USINT': 1,
+    'UINT': 2,
+    'UDINT': 4,
+    'ULINT': 8,
     'REAL': 4,
+    'LREAL': 8,
+    'STIME': 4,
+    'DATE': 2,
+    'TIME_OF_DAY': 4,
+    'BYTE': 1,
+    'WORD': 2,
     'DWORD': 4,
-    'LINT': 8,
+    'LWORD': 8,
+    'FTIME': 4,
+    'LTIME': 8,
+    'ITIME': 2,
+    'TIME': 4,
     'SHORT_STRING': 84,
 }
 
@@ -245,6 +260,7 @@ BITS_PER_INT_TYPE = {
     'UINT': 16,  # Unsigned 16-bit integer
     'UDINT': 32,  # Unsigned 32-bit integer
     'ULINT': 64,  # Unsigned 64-bit integer
+    'BYTE': 8,  # byte string 8-bits
     'WORD': 16,  # byte string 16-bits
     'DWORD': 32,  # byte string 32-bits
     'LWORD': 64,  # byte string 64-bits
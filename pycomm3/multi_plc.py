@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# multi_plc.py - Concurrent reads from many PLCs
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence
+
+from autologging import logged
+
+from . import Tag, CommError
+from .clx import LogixDriver
+from .socket_ import BaseSocket
+
+
+class PLCReadResult(NamedTuple):
+    path: str
+    tags: Optional[List[Tag]]
+    error: Optional[str] = None
+    timestamp: Optional[float] = None
+    elapsed: Optional[float] = None
+
+    def __bool__(self):
+        return self.error is None and self.tags is not None and all(self.tags)
+
+
+@logged
+class MultiPLCReader:
+    """
+    Reads tags from many PLCs concurrently using a bounded pool of worker threads.
+
+    A :class:`~pycomm3.LogixDriver` is kept open for each PLC between calls to :meth:`.read`, so only the first
+    read requires connecting and uploading the tag list.  If a read from a PLC fails with a :class:`~pycomm3.CommError`
+    or the connection is lost, it is closed and will be reopened on the next read, the tag definitions are kept so they
+    do not need to be uploaded again.  Other errors, like tags that do not exist, are returned in the result and the
+    connection is kept open.
+
+    >>> with MultiPLCReader({'10.20.30.100': ['tag1', 'tag2'], '10.20.30.101/1': ['tag1', 'tag3']}) as reader:
+    ...     results = reader.read()
+    >>> results['10.20.30.100']
+    PLCReadResult(path='10.20.30.100', tags=[Tag(tag='tag1', ...), Tag(tag='tag2', ...)], error=None, ...)
+    """
+
+    def __init__(self, plc_tags: Mapping[str, Sequence[str]], max_workers: Optional[int] = None,
+                 sock_factory: Optional[Callable[[str], BaseSocket]] = None, **driver_kwargs):
+        """
+        :param plc_tags: a dict of ``{plc path: [tags to read]}``
+        :param max_workers: max number of PLCs read at the same time, defaults to the number of PLCs (up to 32)
+        :param sock_factory: called with the path of a PLC to create the transport each time a connection is opened,
+                             a transport cannot be shared by connections so the ``sock`` argument is not allowed
+        :param driver_kwargs: keyword arguments used when creating each :class:`~pycomm3.LogixDriver`
+        """
+        if 'sock' in driver_kwargs:
+            raise ValueError('sock cannot be shared between connections, use sock_factory instead')
+        self.plc_tags = {path: list(tags) for path, tags in plc_tags.items()}
+        self._sock_factory = sock_factory
+        self._driver_kwargs = driver_kwargs
+        self._drivers: Dict[str, LogixDriver] = {}
+        self._tag_definitions: Dict[str, dict] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or min(32, len(self.plc_tags)) or 1,
+                                            thread_name_prefix='pycomm3-reader')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def read(self) -> Dict[str, PLCReadResult]:
+        """
+        Reads the tags from every PLC at the same time.
+
+        :return: a dict of ``{plc path: PLCReadResult}``, the ``timestamp`` is the wall-clock time the read was
+                 started and ``elapsed`` is the number of seconds it took
+        """
+        futures = {path: self._executor.submit(self._read_plc, path, tags) for path, tags in self.plc_tags.items()}
+        return {path: future.result() for path, future in futures.items()}
+
+    def _read_plc(self, path, tags) -> PLCReadResult:
+        timestamp = time.time()
+        start = time.perf_counter()
+        try:
+            plc = self._get_driver(path)
+            results = plc.read(*tags)
+            if len(tags) == 1:
+                results = [results]
+            if not plc.connected:  # the connection was lost during the read
+                self._close_driver(path)
+            return PLCReadResult(path, results, None, timestamp, time.perf_counter() - start)
+        except Exception as err:
+            self.__log.exception(f'Failed to read tags from {path}')
+            if isinstance(err, CommError):
+                self._close_driver(path)
+            return PLCReadResult(path, None, str(err), timestamp, time.perf_counter() - start)
+
+    def _get_driver(self, path) -> LogixDriver:
+        plc = self._drivers.get(path)
+        if plc is None or not plc.connected:
+            kwargs = dict(self._driver_kwargs)
+            if self._sock_factory is not None:
+                kwargs['sock'] = self._sock_factory(path)
+            if path in self._tag_definitions:
+                plc = LogixDriver(path, **{**kwargs, 'init_tags': False})
+                plc._tags, plc._data_types = self._tag_definitions[path]
+                plc.open()
+            else:
+                plc = LogixDriver(path, **kwargs)
+                plc.open()
+                self._tag_definitions[path] = (plc.tags, plc.data_types)
+            self._drivers[path] = plc
+
+        return plc
+
+    def _close_driver(self, path):
+        plc = self._drivers.pop(path, None)
+        if plc is not None:
+            try:
+                plc.close()
+            except Exception:
+                self.__log.exception(f'Error closing connection to {path}')
+
+    def close(self):
+        """
+        Closes the connections to all PLCs and stops the worker threads.
+        """
+        for path in list(self._drivers):
+            self._close_driver(path)
+        self._executor.shutdown()
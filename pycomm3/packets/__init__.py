@@ -41,7 +41,7 @@ from .responses import (ResponsePacket, SendUnitDataResponsePacket, SendRRDataRe
 from .requests import (RequestPacket, SendUnitDataRequestPacket, SendRRDataRequestPacket, ListIdentityRequestPacket,
                        RegisterSessionRequestPacket, UnRegisterSessionRequestPacket, ReadTagServiceRequestPacket,
                        MultiServiceRequestPacket, ReadTagFragmentedServiceRequestPacket, WriteTagServiceRequestPacket,
-                       WriteTagFragmentedServiceRequestPacket)
+                       WriteTagFragmentedServiceRequestPacket, request_path_size)
 
 from collections import defaultdict
 
@@ -24,6 +24,9 @@
 # SOFTWARE.
 #
 
+from functools import lru_cache
+from typing import List
+
 from autologging import logged
 
 from . import Packet
@@ -31,12 +34,20 @@ from . import (ResponsePacket, SendUnitDataResponsePacket, ReadTagServiceRespons
                UnRegisterSessionResponsePacket, ListIdentityResponsePacket, SendRRDataResponsePacket,
                MultiServiceResponsePacket, ReadTagFragmentedServiceResponsePacket, WriteTagServiceResponsePacket,
                WriteTagFragmentedServiceResponsePacket)
-from .. import CommError, RequestError
-from ..bytes_ import pack_uint, pack_udint, pack_dint, print_bytes_msg, pack_usint, PACK_DATA_FUNCTION
+from .responses import parse_read_reply
+from .. import CommError, DataError, RequestError
+from ..address import parse_tag_address
+from ..bytes_ import pack_uint, pack_udint, pack_dint, print_bytes_msg, pack_usint, unpack_uint, PACK_DATA_FUNCTION
 from ..const import (ENCAPSULATION_COMMAND, INSUFFICIENT_PACKETS, DATA_ITEM, ADDRESS_ITEM, EXTENDED_SYMBOL, ELEMENT_ID,
                      TAG_SERVICES_REQUEST, CLASS_CODE, CLASS_ID, INSTANCE_ID, DATA_TYPE, DATA_TYPE_SIZE)
 
 
+_SEQUENCE_PLACEHOLDER = b'\x00\x00'  # connected messages get their sequence number when they are sent
+REQUEST_PATH_CACHE_SIZE = 4096  # max number of encoded request paths to cache
+MEMBER_ID_CACHE_SIZE = 1024  # max number of structure templates to cache the member ids of
+_CONNECTED_DATA_OFFSET = 44  # start of the sequence count in a send_unit_data reply
+
+
 @logged
 class RequestPacket(Packet):
     _message_type = None
@@ -57,6 +68,13 @@ class RequestPacket(Packet):
     def message(self) -> bytes:
         return b''.join(self._msg)
 
+    @property
+    def _message_buffers(self) -> List[bytes]:
+        """
+        The message data as a list of buffers, used to build the packet without joining the message data
+        """
+        return self._msg
+
     def _build_header(self, command, length) -> bytes:
         """ Build the encapsulate message header
 
@@ -77,32 +95,49 @@ class RequestPacket(Packet):
         except Exception as e:
             raise CommError(e)
 
-    def _build_common_packet_format(self, addr_data=None) -> bytes:
+    def _build_common_packet_format(self, addr_data=None) -> List[bytes]:
+        """
+        Builds the common packet format items for the message, returned as a list of buffers
+        so the message data is not copied before being sent.
+        """
         addr_data = b'\x00\x00' if addr_data is None else pack_uint(len(addr_data)) + addr_data
-        msg = self.message
-        return b''.join([
-            b'\x00\x00\x00\x00',  # Interface Handle: shall be 0 for CIP
-            self._timeout,
-            b'\x02\x00',  # Item count: should be at list 2 (Address and Data)
-            self._address_type,
-            addr_data,
-            self._message_type,
-            pack_uint(len(msg)),
-            msg
-        ])
+        msg = self._message_buffers
+        return [
+            b''.join((
+                b'\x00\x00\x00\x00',  # Interface Handle: shall be 0 for CIP
+                self._timeout,
+                b'\x02\x00',  # Item count: should be at list 2 (Address and Data)
+                self._address_type,
+                addr_data,
+                self._message_type,
+                pack_uint(sum(len(m) for m in msg)),
+            )),
+            *msg
+        ]
 
     def _send(self, message):
         """
                 socket send
+                :param message: the packet as bytes or a list of buffers
                 :return: true if no error otherwise false
                 """
         try:
             if self._plc.debug:
-                self.__log.debug(print_bytes_msg(message, '>>> SEND >>>'))
+                self.__log.debug(print_bytes_msg(_join(message), '>>> SEND >>>'))
             self._plc._sock.send(message)
         except Exception as e:
+            self._plc._drop_connection()  # the target may have received part of the message
             raise CommError(e)
 
+    def _send_receive(self, message):
+        """
+        Sends the message and receives the reply while holding the driver lock,
+        so requests from multiple threads cannot interleave on the socket.
+        """
+        with self._plc._lock:
+            self._send(message)
+            return self._receive()
+
     def _receive(self):
         """
         socket receive
@@ -111,6 +146,7 @@ class RequestPacket(Packet):
         try:
             reply = self._plc._sock.receive()
         except Exception as e:
+            self._plc._drop_connection()  # a late reply would be received in place of the next one
             raise CommError(e)
         else:
             if self._plc.debug:
@@ -128,16 +164,57 @@ class SendUnitDataRequestPacket(RequestPacket):
 
     def __init__(self, plc):
         super().__init__(plc)
-        self._msg = [pack_uint(plc._sequence), ]
+        self._msg = [_SEQUENCE_PLACEHOLDER, ]
 
     def _build_request(self):
+        self._msg[0] = pack_uint(self._plc._sequence)
         msg = self._build_common_packet_format(addr_data=self._plc._target_cid)
-        header = self._build_header(ENCAPSULATION_COMMAND['send_unit_data'], len(msg))
-        return header + msg
+        header = self._build_header(ENCAPSULATION_COMMAND['send_unit_data'], sum(len(m) for m in msg))
+        return [header, *msg]
 
-    def send(self):
-        self._send(self._build_request())
+    def _send_request(self):
+        """
+        Builds and sends the request, returning the reply.  The sequence number is assigned while
+        holding the driver lock so that requests are always sent in sequence order.
+        """
+        with self._plc._lock:
+            self._send(self._build_request())
+            return self._receive_reply(self._msg[0])
+
+    def _receive_reply(self, sequence):
+        """
+        Receives the reply to the request sent with the packed sequence count ``sequence``.  If the reply is for a
+        different request, the connection is dropped since the replies are out of sync with the requests.
+        """
         reply = self._receive()
+        if (reply[:2] == ENCAPSULATION_COMMAND['send_unit_data'] and
+                len(reply) >= _CONNECTED_DATA_OFFSET + 2 and
+                reply[_CONNECTED_DATA_OFFSET:_CONNECTED_DATA_OFFSET + 2] != sequence):
+            self._plc._drop_connection()
+            raise CommError(f'Reply sequence count {unpack_uint(reply, _CONNECTED_DATA_OFFSET)} does not match '
+                            f'the request ({unpack_uint(sequence)})')
+        return reply
+
+    def _send_pipelined(self, messages):
+        """
+        Sends a request for each message before receiving any of the replies, returning the replies in order.
+        The driver lock is held for all of them, so no other requests are sent in between.
+        """
+        if len(messages) == 1:
+            self._msg = messages[0]
+            return [self._send_request()]
+
+        with self._plc._lock:
+            sequences = []
+            for message in messages:
+                self._msg = message
+                self._send(self._build_request())
+                sequences.append(self._msg[0])
+            # every reply is received before returning, if any fail the connection is dropped
+            return [self._receive_reply(sequence) for sequence in sequences]
+
+    def send(self):
+        reply = self._send_request()
         return SendUnitDataResponsePacket(reply)
 
 
@@ -156,7 +233,7 @@ class ReadTagServiceRequestPacket(SendUnitDataRequestPacket):
         self.tag = tag
         self.elements = elements
         self.tag_info = tag_info
-        request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids)
+        request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids, self._plc.use_member_ids)
         if request_path is None:
             self.error = 'Invalid Tag Request Path'
 
@@ -168,9 +245,10 @@ class ReadTagServiceRequestPacket(SendUnitDataRequestPacket):
 
     def send(self):
         if not self.error:
-            self._send(self._build_request())
-            reply = self._receive()
-            return ReadTagServiceResponsePacket(reply, elements=self.elements, tag_info=self.tag_info, tag=self.tag)
+            reply = self._send_request()
+            return ReadTagServiceResponsePacket(reply, elements=self.elements, tag_info=self.tag_info, tag=self.tag,
+                                                encoding=self._plc.string_encoding,
+                                                bitset=self._plc.bitset_bool_arrays)
         else:
             response = ReadTagServiceResponsePacket(tag=self.tag)
             response._error = self.error
@@ -194,28 +272,14 @@ class ReadTagFragmentedServiceRequestPacket(SendUnitDataRequestPacket):
         self.tag = tag
         self.elements = elements
         self.tag_info = tag_info
-        self.request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids)
+        self.request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids,
+                                           self._plc.use_member_ids)
         if self.request_path is None:
             self.error = 'Invalid Tag Request Path'
 
     def send(self):
         if not self.error:
-            offset = 0
-            responses = []
-            while offset is not None:
-                self._msg.extend([bytes([TAG_SERVICES_REQUEST['Read Tag Fragmented']]),
-                                 self.request_path,
-                                 pack_uint(self.elements),
-                                 pack_dint(offset)])
-                self._send(self._build_request())
-                reply = self._receive()
-                response = ReadTagFragmentedServiceResponsePacket(reply, self.tag_info, self.elements)
-                responses.append(response)
-                if response.service_status == INSUFFICIENT_PACKETS:
-                    offset += len(response.bytes_)
-                    self._msg = [pack_uint(self._plc._sequence)]
-                else:
-                    offset = None
+            responses = list(self._send_fragments())
             if all(responses):
                 final_response = responses[-1]
                 final_response.bytes_ = b''.join(resp.bytes_ for resp in responses)
@@ -226,6 +290,86 @@ class ReadTagFragmentedServiceRequestPacket(SendUnitDataRequestPacket):
         failed_response._error = self.error or 'One or more fragment responses failed'
         return failed_response
 
+    def stream(self):
+        """
+        Reads the tag one fragment at a time, decoding and yielding the values from each fragment as it is received.
+        Elements split between fragments are held until the rest of the element is received.
+
+        :return: a generator of ``(offset, values)`` tuples, where ``offset`` is the index of the first value
+        :raises RequestError: if the request path could not be created
+        :raises DataError: if a fragment could not be read
+        """
+        if self.error:
+            raise RequestError(self.error)
+
+        size = self._element_size()
+        if size is None:
+            raise RequestError(f'Unsupported data type for streaming: {self.tag_info["data_type"]}')
+
+        offset = 0
+        remainder = b''
+        for response in self._send_fragments():
+            if not response:
+                raise DataError(f'Failed to read fragment of {self.tag} - {response.error}')
+
+            data = remainder + response.bytes_ if remainder else response.bytes_
+            count = len(data) // size
+            if count:
+                value, _ = parse_read_reply(response._data_type + data[:count * size], self.tag_info, count,
+                                            self._plc.string_encoding, self._plc.bitset_bool_arrays)
+                values = value if count > 1 or self.tag_info['data_type'] == 'DWORD' else [value]
+                yield offset, values
+                offset += len(values)
+            remainder = data[count * size:]
+
+    def _element_size(self):
+        if self.tag_info['tag_type'] == 'struct':
+            return self.tag_info['data_type']['template']['structure_size']
+        return DATA_TYPE_SIZE.get(self.tag_info['data_type'])
+
+    def _fragment_message(self, offset):
+        return [_SEQUENCE_PLACEHOLDER,
+                bytes([TAG_SERVICES_REQUEST['Read Tag Fragmented']]),
+                self.request_path,
+                pack_uint(self.elements),
+                pack_dint(offset)]
+
+    def _send_fragments(self):
+        """
+        Sends a request for each fragment of the tag, yielding each response as it is received.
+        Stops after the last fragment or the first failed response.
+
+        Once the size of a fragment is known from the first reply, the requests for the following fragments
+        are pipelined, up to ``pipeline_depth`` requests are sent before waiting for their replies.
+        If a fragment is shorter than expected, the replies pipelined after it (already received) are discarded and
+        the remaining fragments are requested again from the correct offset.
+        """
+        element_size = self._element_size()
+        total_size = element_size * self.elements if element_size else None
+        fragment_size = None
+        offset = 0
+        while offset is not None:
+            if fragment_size and total_size and self._plc.pipeline_depth > 1:
+                offsets = range(offset, total_size, fragment_size)[:self._plc.pipeline_depth]
+            else:
+                offsets = [offset]
+
+            replies = self._send_pipelined([self._fragment_message(_offset) for _offset in offsets])
+            for _offset, reply in zip(offsets, replies):
+                if _offset != offset:
+                    break
+                response = ReadTagFragmentedServiceResponsePacket(reply, self.tag_info, self.elements,
+                                                                  encoding=self._plc.string_encoding,
+                                                                  bitset=self._plc.bitset_bool_arrays)
+                yield response
+                if response and response.service_status == INSUFFICIENT_PACKETS:
+                    self._plc._observe_reply_size(len(reply) - _CONNECTED_DATA_OFFSET)
+                    fragment_size = max(fragment_size or 0, len(response.bytes_))
+                    offset += len(response.bytes_)
+                else:
+                    offset = None
+                    break
+
 
 @logged
 class WriteTagServiceRequestPacket(SendUnitDataRequestPacket):
@@ -239,13 +383,15 @@ class WriteTagServiceRequestPacket(SendUnitDataRequestPacket):
         self.tag_info = None
         self.value = None
         self.data_type = None
+        self.bits_write = False
 
     def add(self, tag, value, elements=1, tag_info=None, bits_write=None):
         self.tag = tag
         self.elements = elements
         self.tag_info = tag_info
         self.value = value
-        request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids)
+        self.bits_write = bool(bits_write)
+        request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids, self._plc.use_member_ids)
         if request_path is None:
             self.error = 'Invalid Tag Request Path'
             
@@ -261,10 +407,20 @@ class WriteTagServiceRequestPacket(SendUnitDataRequestPacket):
             )
             self.data_type = data_type
 
+    def value_buffers(self):
+        """
+        Converts the message to a bytearray so the value written may be replaced in place.
+
+        :return: ``{(tag, elements, service): (buffer, end of the value)}``, empty if the request could not be built
+        """
+        if self.error:
+            return {}
+        self._msg[1] = bytearray(self._msg[1])
+        return {(self.tag, self.elements, self._msg[1][0]): (self._msg[1], len(self._msg[1]))}
+
     def send(self):
         if not self.error:
-            self._send(self._build_request())
-            reply = self._receive()
+            reply = self._send_request()
             return WriteTagServiceResponsePacket(reply)
         else:
             response = WriteTagServiceResponsePacket()
@@ -288,6 +444,9 @@ class WriteTagFragmentedServiceRequestPacket(SendUnitDataRequestPacket):
         self.data_type = None
 
     def add(self, tag, value, elements=1, tag_info=None):
+        """
+        :param value: the packed value to write, as bytes
+        """
         if tag_info['tag_type'] != 'atomic':
             raise RequestError('Fragmented write of structures is not supported')
 
@@ -296,40 +455,48 @@ class WriteTagFragmentedServiceRequestPacket(SendUnitDataRequestPacket):
         self.elements = elements
         self.data_type = tag_info['data_type']
         self.tag_info = tag_info
-        self.request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids)
+        self.request_path = _create_tag_rp(self.tag, self._plc.tags, self._plc.use_instance_ids,
+                                           self._plc.use_member_ids)
         if self.request_path is None:
             self.error = 'Invalid Tag Request Path'
 
+    def value_buffers(self):
+        raise RequestError(f'Fragmented writes are not supported by write plans: {self.tag}')
+
+    @property
+    def segment_size(self) -> int:
+        """
+        Number of bytes of the value sent in each fragment, the most whole elements that fit in a request after
+        the sequence count, service, request path, data type, element count, and offset.
+        """
+        element_size = DATA_TYPE_SIZE[self.data_type]
+        overhead = len(_SEQUENCE_PLACEHOLDER) + 1 + len(self.request_path) + 8
+        return (self._plc.max_message_size - overhead) // element_size * element_size
+
     def send(self):
         if not self.error:
             responses = []
-            segment_size = self._plc.connection_size // (DATA_TYPE_SIZE[self.data_type] + 4)
-            pack_func = PACK_DATA_FUNCTION[self.data_type]
-            segments = (self.value[i:i+segment_size]
-                        for i in range(0, len(self.value), segment_size))
-
-            offset = 0
+            segment_size = self.segment_size
             elements_packed = pack_uint(self.elements)
             data_type_packed = pack_uint(DATA_TYPE[self.data_type])
-            for segment in segments:
-                segment_bytes = b''.join(pack_func(s) for s in segment)
-                self._msg.extend((
-                    bytes([TAG_SERVICES_REQUEST["Write Tag Fragmented"]]),
-                    self.request_path,
-                    data_type_packed,
-                    elements_packed,
-                    pack_dint(offset),
-                    segment_bytes
-                ))
-
-                self._send(self._build_request())
-                reply = self._receive()
-                response = WriteTagFragmentedServiceResponsePacket(reply)
-                responses.append(response)
-                offset += len(segment_bytes)
-                self._msg = [pack_uint(self._plc._sequence), ]
-
-            if all(responses):
+            messages = [[_SEQUENCE_PLACEHOLDER,
+                         bytes([TAG_SERVICES_REQUEST["Write Tag Fragmented"]]),
+                         self.request_path,
+                         data_type_packed,
+                         elements_packed,
+                         pack_dint(offset),
+                         self.value[offset:offset + segment_size]]
+                        for offset in range(0, len(self.value), segment_size)]
+
+            # the offset of every fragment is known up front, so all of them may be pipelined
+            depth = max(self._plc.pipeline_depth, 1)
+            for i in range(0, len(messages), depth):
+                replies = self._send_pipelined(messages[i:i + depth])
+                responses.extend(WriteTagFragmentedServiceResponsePacket(reply) for reply in replies)
+                if not all(responses):
+                    break
+
+            if responses and all(responses):
                 final_response = responses[-1]
                 return final_response
 
@@ -338,6 +505,29 @@ class WriteTagFragmentedServiceRequestPacket(SendUnitDataRequestPacket):
         return failed_response
 
 
+class Service:
+    """
+    A service in a Multiple Service Packet, the status and read value of its reply are set when the response is parsed
+    """
+    __slots__ = ('tag', 'elements', 'tag_info', 'rp', 'service', 'value', 'data_type', 'bits_write',
+                 'service_status', 'error')
+
+    def __init__(self, tag, elements, tag_info, rp, service, value=None, data_type=None, bits_write=False):
+        self.tag = tag
+        self.elements = elements
+        self.tag_info = tag_info
+        self.rp = rp
+        self.service = service
+        self.value = value
+        self.data_type = data_type
+        self.bits_write = bits_write
+        self.service_status = None
+        self.error = None
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.service}, {self.tag!r}, {self.elements})'
+
+
 @logged
 class MultiServiceRequestPacket(SendUnitDataRequestPacket):
     type_ = 'multi'
@@ -361,13 +551,17 @@ class MultiServiceRequestPacket(SendUnitDataRequestPacket):
     def message(self) -> bytes:
         return self._message
 
+    @property
+    def _message_buffers(self) -> List[bytes]:
+        return [self._msg[0], memoryview(self._message)[len(self._msg[0]):]]  # replace the sequence placeholder
+
     def build_message(self, tags):
         rp_list, errors = [], []
         for tag in tags:
-            if tag['rp'] is None:
-                errors.append(f'Unable to create request path {tag["tag"]}')
+            if tag.rp is None:
+                errors.append(f'Unable to create request path {tag.tag}')
             else:
-                rp_list.append(tag['rp'])
+                rp_list.append(tag.rp)
 
         offset = len(rp_list) * 2 + 2
         offsets = []
@@ -378,15 +572,30 @@ class MultiServiceRequestPacket(SendUnitDataRequestPacket):
         msg = self._msg + [pack_uint(len(rp_list))] + offsets + rp_list
         return b''.join(msg)
 
+    def value_buffers(self):
+        """
+        Converts the message to a bytearray so the values written may be replaced in place.
+
+        :return: ``{(tag, elements, service): (buffer, end of the service)}``, the value is at the end of each
+                 write service
+        """
+        self._message = bytearray(self._message)
+        offset = sum(len(m) for m in self._msg) + 2 + 2 * len(self.tags)  # service count and offsets
+        buffers = {}
+        for tag in self.tags:
+            offset += len(tag.rp)
+            buffers[(tag.tag, tag.elements, tag.rp[0])] = (self._message, offset)
+        return buffers
+
     def add_read(self, tag, elements=1, tag_info=None):
 
-        request_path = _create_tag_rp(tag, self._plc.tags, self._plc.use_instance_ids)
+        request_path = _create_tag_rp(tag, self._plc.tags, self._plc.use_instance_ids, self._plc.use_member_ids)
         if request_path is not None:
 
             request_path = bytes([TAG_SERVICES_REQUEST['Read Tag']]) + request_path + pack_uint(elements)
-            _tag = {'tag': tag, 'elements': elements, 'tag_info': tag_info, 'rp': request_path, 'service': 'read'}
+            _tag = Service(tag, elements, tag_info, request_path, 'read')
             message = self.build_message(self.tags + [_tag])
-            if len(message) < self._plc.connection_size:
+            if len(message) < self._plc.max_message_size:
                 self._message = message
                 self.tags.append(_tag)
                 return True
@@ -397,7 +606,7 @@ class MultiServiceRequestPacket(SendUnitDataRequestPacket):
             raise RequestError('Failed to create request path')
 
     def add_write(self, tag, value, elements=1, tag_info=None, bits_write=None):
-        request_path = _create_tag_rp(tag, self._plc.tags, self._plc.use_instance_ids)
+        request_path = _create_tag_rp(tag, self._plc.tags, self._plc.use_instance_ids, self._plc.use_member_ids)
         if request_path is not None:
             if bits_write:
                 data_type = tag_info['data_type']
@@ -405,11 +614,10 @@ class MultiServiceRequestPacket(SendUnitDataRequestPacket):
             else:
                 request_path, data_type = _make_write_data_tag(tag_info, value, elements, request_path)
 
-            _tag = {'tag': tag, 'elements': elements, 'tag_info': tag_info, 'rp': request_path, 'service': 'write',
-                    'value': value, 'data_type': data_type}
+            _tag = Service(tag, elements, tag_info, request_path, 'write', value, data_type, bool(bits_write))
 
             message = self.build_message(self.tags + [_tag])
-            if len(message) < self._plc.connection_size:
+            if len(message) < self._plc.max_message_size:
                 self._message = message
                 self.tags.append(_tag)
                 return True
@@ -422,10 +630,9 @@ class MultiServiceRequestPacket(SendUnitDataRequestPacket):
 
     def send(self):
         if not self._msg_errors:
-            request = self._build_request()
-            self._send(request)
-            reply = self._receive()
-            return MultiServiceResponsePacket(reply, tags=self.tags)
+            reply = self._send_request()
+            return MultiServiceResponsePacket(reply, tags=self.tags, encoding=self._plc.string_encoding,
+                                              bitset=self._plc.bitset_bool_arrays)
         else:
             self.error = f'Failed to create request path for: {", ".join(self._msg_errors)}'
             response = MultiServiceResponsePacket()
@@ -462,12 +669,13 @@ def _make_write_data_bit(tag_info, value, request_path):
         raise RequestError(f'Invalid data type {tag_info["data_type"]} for writing bits')
 
     or_mask, and_mask = value
+    full_mask = (1 << mask_size * 8) - 1
     request_path = b''.join((
         bytes([TAG_SERVICES_REQUEST["Read Modify Write Tag"]]),
         request_path,
         pack_uint(mask_size),
-        pack_udint(or_mask)[:mask_size],
-        pack_udint(and_mask)[:mask_size]
+        (or_mask & full_mask).to_bytes(mask_size, 'little'),
+        (and_mask & full_mask).to_bytes(mask_size, 'little'),
     ))
 
     return request_path
@@ -483,9 +691,8 @@ class SendRRDataRequestPacket(RequestPacket):
 
     def send(self):
         msg = self._build_common_packet_format()
-        header = self._build_header(ENCAPSULATION_COMMAND['send_rr_data'], len(msg))
-        self._send(header + msg)
-        reply = self._receive()
+        header = self._build_header(ENCAPSULATION_COMMAND['send_rr_data'], sum(len(m) for m in msg))
+        reply = self._send_receive([header, *msg])
         return SendRRDataResponsePacket(reply)
 
 
@@ -497,8 +704,7 @@ class RegisterSessionRequestPacket(RequestPacket):
     def send(self):
         msg = self.message
         header = self._build_header(ENCAPSULATION_COMMAND['register_session'], len(msg))
-        self._send(header + msg)
-        reply = self._receive()
+        reply = self._send_receive([header, msg])
         return RegisterSessionResponsePacket(reply)
 
 
@@ -509,7 +715,8 @@ class UnRegisterSessionRequestPacket(RequestPacket):
 
     def send(self):
         header = self._build_header(ENCAPSULATION_COMMAND['unregister_session'], 0)
-        self._send(header)
+        with self._plc._lock:
+            self._send(header)
         return UnRegisterSessionResponsePacket(b'')
 
 
@@ -520,26 +727,103 @@ class ListIdentityRequestPacket(RequestPacket):
 
     def send(self):
         msg = self._build_header(ENCAPSULATION_COMMAND['list_identity'], 0)
-        self._send(msg)
-        reply = self._receive()
+        reply = self._send_receive(msg)
         return ListIdentityResponsePacket(reply)
 
 
-def _create_tag_rp(tag, tag_cache, use_instance_ids):
+def _join(message) -> bytes:
+    return message if isinstance(message, bytes) else b''.join(message)
+
+
+def request_path_size(plc, tag) -> int:
+    """
+    Returns the size of the request path the driver will use for ``tag``, or 0 if it cannot be created
+    """
+    request_path = _create_tag_rp(tag, plc.tags, plc.use_instance_ids, plc.use_member_ids)
+    return 0 if request_path is None else len(request_path)
+
+
+def _create_tag_rp(tag, tag_cache, use_instance_ids, use_member_ids=False):
     """
 
     It returns the request packed wrapped around the tag passed.
     If any error it returns none
+
+    Encoded request paths are cached, the path only depends on the tag, the instance id used for the
+    base tag, and the member ids, so changes to the tag list will never return a stale path.
+    """
+    base = tag.partition('.')[0].partition('[')[0]
+    instance_id = tag_cache[base]['instance_id'] if use_instance_ids and base in tag_cache else None
+    member_ids = _find_member_ids(tag, tag_cache) if use_member_ids else None
+    return _encode_tag_rp(tag, instance_id, member_ids)
+
+
+def _find_member_ids(tag, tag_cache):
+    """
+    Returns the member ids (index of the member in the structure template) for each member in the tag,
+    or None if any of the members are not found in the tag definitions.
+    """
+    try:
+        address = parse_tag_address(tag)
+    except RequestError:
+        return None
+
+    if not address.members:
+        return None
+
+    member_ids = []
+    data = tag_cache.get(address.base)
+    for member, _ in address.members:
+        if data is None or data['tag_type'] != 'struct':
+            return None
+        members = data['data_type']['internal_tags']
+        member_id = _member_id_map(members).get(member)
+        if member_id is None:
+            return None
+        member_ids.append(member_id)
+        data = members[member]
+
+    return tuple(member_ids)
+
+
+_member_id_maps = {}
+
+
+def _member_id_map(members) -> dict:
     """
+    Returns a dict of ``{member name: member id}`` for the ``internal_tags`` of a structure, only created
+    once for each structure definition.  The map is kept with the members it was made from, so an id
+    reused by a new definition (like after uploading the tag list again) creates a new map.
+    """
+    members_id = id(members)
+    cached = _member_id_maps.get(members_id)
+    if cached is None or cached[0] is not members:
+        if len(_member_id_maps) >= MEMBER_ID_CACHE_SIZE:
+            _member_id_maps.clear()
+        cached = _member_id_maps[members_id] = (members, {name: i for i, name in enumerate(members)})
+    return cached[1]
+
+
+@lru_cache(maxsize=REQUEST_PATH_CACHE_SIZE)
+def _encode_tag_rp(tag, instance_id, member_ids=None):
     tags = tag.split('.')
     if tags:
         base, *attrs = tags
+        if member_ids:
+            # program scope is in the symbolic path, the member ids are for the last attributes
+            attrs, member_attrs = attrs[:-len(member_ids)], attrs[-len(member_ids):]
+        else:
+            member_attrs = ()
 
-        if use_instance_ids and base in tag_cache:
+        if instance_id is not None:
+            _, index = _find_tag_index(base)
+            if index is None:
+                return None
             rp = [CLASS_ID['8-bit'],
                   CLASS_CODE['Symbol Object'],
                   INSTANCE_ID['16-bit'], b'\x00',
-                  pack_uint(tag_cache[base]['instance_id'])]
+                  pack_uint(instance_id),
+                  *index]
         else:
             base_tag, index = _find_tag_index(base)
             base_len = len(base_tag)
@@ -570,6 +854,12 @@ def _create_tag_rp(tag, tag_cache, use_instance_ids):
                 attr_path += index
             rp += attr_path
 
+        for attr, member_id in zip(member_attrs, member_ids or ()):
+            _, index = _find_tag_index(attr)
+            if index is None:
+                return None
+            rp += _encode_tag_index([member_id]) + index
+
         # At this point the Request Path is completed,
         request_path = b''.join(rp)
         request_path = bytes([len(request_path) // 2]) + request_path
@@ -24,12 +24,14 @@
 # SOFTWARE.
 #
 
-from itertools import tee, zip_longest, chain
+from itertools import zip_longest, chain
 
 from autologging import logged
 
 from . import Packet
-from ..bytes_ import unpack_uint, unpack_usint, unpack_dint, UNPACK_DATA_FUNCTION
+from ..bytes_ import (unpack_uint, unpack_dint, unpack_array, UNPACK_DATA_FUNCTION, STRING_ENCODING, string_size,
+                      decode_string, decode_strings, unpack_bool_array, BYTE_BITS)
+from ..bitset import BitSet
 from ..const import (SUCCESS, INSUFFICIENT_PACKETS, TAG_SERVICES_REPLY, SERVICE_STATUS,EXTEND_CODES,
                      MULTI_PACKET_SERVICES, REPLY_START, STRUCTURE_READ_REPLY,
                      DATA_TYPE, DATA_TYPE_SIZE)
@@ -83,7 +85,7 @@ class ResponsePacket(Packet):
                 self._error = 'No Reply From PLC'
             else:
                 self.command = self.raw[:2]
-                self.command_status = unpack_dint(self.raw[8:12])  # encapsulation status check
+                self.command_status = unpack_dint(self.raw, 8)  # encapsulation status check
         except Exception as err:
             self._error = f'Failed to parse reply - {err}'
 
@@ -103,7 +105,7 @@ class SendUnitDataResponsePacket(ResponsePacket):
         try:
             super()._parse_reply()
             self.service = self.raw[46]
-            self.service_status = unpack_usint(self.raw[48:49])
+            self.service_status = self.raw[48]
             self.data = self.raw[REPLY_START:]
         except Exception as err:
             self._error = f'Failed to parse reply - {err}'
@@ -125,18 +127,22 @@ class SendUnitDataResponsePacket(ResponsePacket):
 
 @logged
 class ReadTagServiceResponsePacket(SendUnitDataResponsePacket):
-    def __init__(self, raw_data: bytes = None, tag_info=None, elements=1, tag=None, *args,  **kwargs):
+    def __init__(self, raw_data: bytes = None, tag_info=None, elements=1, tag=None, *args,
+                 encoding=STRING_ENCODING, bitset=False, **kwargs):
         self.value = None
         self.elements = elements
         self.data_type = None
         self.tag_info = tag_info
         self.tag = tag
+        self.encoding = encoding
+        self.bitset = bitset
         super().__init__(raw_data, *args, **kwargs)
 
     def _parse_reply(self):
         try:
             super()._parse_reply()
-            self.value, self.data_type = parse_read_reply(self.data, self.tag_info, self.elements)
+            self.value, self.data_type = parse_read_reply(self.data, self.tag_info, self.elements, self.encoding,
+                                                          self.bitset)
         except Exception as err:
             self.__log.exception('Failed parsing reply data')
             self.value = None
@@ -151,12 +157,15 @@ class ReadTagServiceResponsePacket(SendUnitDataResponsePacket):
 
 @logged
 class ReadTagFragmentedServiceResponsePacket(SendUnitDataResponsePacket):
-    def __init__(self, raw_data: bytes = None, tag_info=None, elements=1, *args,  **kwargs):
+    def __init__(self, raw_data: bytes = None, tag_info=None, elements=1, *args, encoding=STRING_ENCODING,
+                 bitset=False, **kwargs):
         self.value = None
         self.elements = elements
         self.data_type = None
         self.tag_info = tag_info
         self.bytes_ = None
+        self.encoding = encoding
+        self.bitset = bitset
         super().__init__(raw_data, *args, **kwargs)
 
     def _parse_reply(self):
@@ -171,7 +180,7 @@ class ReadTagFragmentedServiceResponsePacket(SendUnitDataResponsePacket):
     def parse_bytes(self):
         try:
             self.value, self.data_type = parse_read_reply(self._data_type + self.bytes_,
-                                                          self.tag_info, self.elements)
+                                                          self.tag_info, self.elements, self.encoding, self.bitset)
         except Exception as err:
             self.__log.exception('Failed parsing reply data')
             self.value = None
@@ -191,38 +200,38 @@ class WriteTagFragmentedServiceResponsePacket(SendUnitDataResponsePacket):
 @logged
 class MultiServiceResponsePacket(SendUnitDataResponsePacket):
 
-    def __init__(self, raw_data: bytes = None, tags=None, *args, **kwargs):
+    def __init__(self, raw_data: bytes = None, tags=None, *args, encoding=STRING_ENCODING, bitset=False, **kwargs):
         self.tags = tags
         self.values = None
         self.request_statuses = None
+        self.encoding = encoding
+        self.bitset = bitset
         super().__init__(raw_data, *args, **kwargs)
 
     def _parse_reply(self):
         super()._parse_reply()
         num_replies = unpack_uint(self.data)
-        offset_data = self.data[2:2 + 2 * num_replies]
-        offsets = (unpack_uint(offset_data[i:i+2]) for i in range(0, len(offset_data), 2))
-        start, end = tee(offsets)  # split offsets into start/end indexes
-        next(end)   # advance end by 1 so 2nd item is the end index for the first item
-        reply_data = [self.data[i:j] for i, j in zip_longest(start, end)]
+        offsets = unpack_array('UINT', self.data, num_replies, 2)
+        reply_data = [self.data[i:j] for i, j in zip_longest(offsets, offsets[1:])]
         values = []
 
         for data, tag in zip(reply_data, self.tags):
             service = unpack_uint(data)
             service_status = data[2]
-            tag['service_status'] = service_status
+            tag.service_status = service_status
             if service_status != SUCCESS:
-                tag['error'] = f'{get_service_status(service_status)} - {get_extended_status(data, 2)}'
+                tag.error = f'{get_service_status(service_status)} - {get_extended_status(data, 2)}'
 
             if service == TAG_SERVICES_REPLY['Read Tag']:
                 if service_status == SUCCESS:
-                    value, dt = parse_read_reply(data[4:], tag['tag_info'], tag['elements'])
+                    value, dt = parse_read_reply(data[4:], tag.tag_info, tag.elements,
+                                                 self.encoding, self.bitset)
                 else:
                     value, dt = None, None
 
                 values.append(value)
-                tag['value'] = value
-                tag['data_type'] = dt
+                tag.value = value
+                tag.data_type = dt
 
         self.values = values
 
@@ -237,7 +246,7 @@ class SendRRDataResponsePacket(ResponsePacket):
         try:
             super()._parse_reply()
             self.service = self.raw[40]
-            self.service_status = unpack_usint(self.raw[42:43])
+            self.service_status = self.raw[42]
             self.data = self.raw[44:]
         except Exception as err:
             self._error = f'Failed to parse reply - {err}'
@@ -265,7 +274,7 @@ class RegisterSessionResponsePacket(ResponsePacket):
     def _parse_reply(self):
         try:
             super()._parse_reply()
-            self.session = unpack_dint(self.raw[4:8])
+            self.session = unpack_dint(self.raw, 4)
         except Exception as err:
             self._error = f'Failed to parse reply - {err}'
 
@@ -307,30 +316,26 @@ class ListIdentityResponsePacket(ResponsePacket):
         ))
 
 
-def parse_read_reply(data, data_type, elements):
+def parse_read_reply(data, data_type, elements, encoding=STRING_ENCODING, bitset=False):
     if data[:2] == STRUCTURE_READ_REPLY:
-        data = data[4:]
         size = data_type['data_type']['template']['structure_size']
         dt_name = data_type['data_type']['name']
-        if elements > 1:
-            value = [parse_read_reply_struct(data[i: i + size], data_type['data_type'])
-                     for i in range(0, len(data), size)]
+        if data_type['data_type'].get('string'):
+            value = decode_strings(data, elements, size, 4, encoding) if elements > 1 else decode_string(data, 4, encoding)
+        elif elements > 1:
+            value = [parse_read_reply_struct(data, data_type['data_type'], encoding, i, bitset)
+                     for i in range(4, len(data), size)]
         else:
-            value = parse_read_reply_struct(data, data_type['data_type'])
+            value = parse_read_reply_struct(data, data_type['data_type'], encoding, 4, bitset)
     else:
-        datatype = DATA_TYPE[unpack_uint(data[:2])]
+        datatype = DATA_TYPE[unpack_uint(data)]
         dt_name = datatype
-        if elements > 1:
-            func = UNPACK_DATA_FUNCTION[datatype]
-            size = DATA_TYPE_SIZE[datatype]
-            data = data[2:]
-            value = [func(data[i:i + size]) for i in range(0, len(data), size)]
-            if datatype == 'DWORD':
-                value = list(chain.from_iterable(dword_to_bool_array(val) for val in value))
+        if datatype == 'DWORD':
+            value = _bool_array(data, 2, len(data) - 2, bitset)
+        elif elements > 1:
+            value = unpack_array(datatype, data, (len(data) - 2) // DATA_TYPE_SIZE[datatype], 2)
         else:
-            value = UNPACK_DATA_FUNCTION[datatype](data[2:])
-            if datatype == 'DWORD':
-                value = dword_to_bool_array(value)
+            value = UNPACK_DATA_FUNCTION[datatype](data, 2)
 
     if dt_name == 'DWORD':
         dt_name = f'BOOL[{elements * 32}]'
@@ -340,66 +345,63 @@ def parse_read_reply(data, data_type, elements):
     return value, dt_name
 
 
-def parse_read_reply_struct(data, data_type):
+def parse_read_reply_struct(data, data_type, encoding=STRING_ENCODING, start=0, bitset=False):
+    """
+    parses the structure at ``start`` of ``data``
+    """
     values = {}
     size = data_type['template']['structure_size']
 
     if data_type.get('string'):
-        return parse_string(data)
+        return decode_string(data, start, encoding)
 
     for tag, type_def in data_type['internal_tags'].items():
         datatype = type_def['data_type']
         array = type_def.get('array')
-        offset = type_def['offset']
+        offset = start + type_def['offset']
         if type_def['tag_type'] == 'atomic':
-            dt_len = DATA_TYPE_SIZE[datatype]
-            func = UNPACK_DATA_FUNCTION[datatype]
-            if array:
-                ary_data = data[offset:offset + (dt_len * array)]
-                value = [func(ary_data[i:i + dt_len]) for i in range(0, array * dt_len, dt_len)]
-                if datatype == 'DWORD':
-                    value = list(chain.from_iterable(dword_to_bool_array(val) for val in value))
+            if datatype == 'DWORD':
+                value = _bool_array(data, offset, 4 * (array or 1), bitset)
+            elif array:
+                value = unpack_array(datatype, data, array, offset)
+            elif datatype == 'BOOL':
+                bit = type_def.get('bit', 0)
+                value = bool(data[offset] & (1 << bit))
             else:
-                if datatype == 'BOOL':
-                    bit = type_def.get('bit', 0)
-                    value = bool(data[offset] & (1 << bit))
-                else:
-                    value = func(data[offset:offset + dt_len])
-                    if datatype == 'DWORD':
-                        value = dword_to_bool_array(value)
+                value = UNPACK_DATA_FUNCTION[datatype](data, offset)
 
             values[tag] = value
         elif datatype.get('string'):
-            str_size = datatype.get('string') + 4
-            str_size += str_size % 4
+            str_size = datatype.get('template', {}).get('structure_size') or string_size(datatype['string'])
             if array:
-                array_data = data[offset:offset + (str_size * array)]
-                values[tag] = [parse_string(array_data[i:i+str_size]) for i in range(0, len(array_data), str_size)]
+                values[tag] = decode_strings(data, array, str_size, offset, encoding)
             else:
-                values[tag] = parse_string(data[offset:offset + str_size])
+                values[tag] = decode_string(data, offset, encoding)
         else:
             if array:
-                ary_data = data[offset:offset + (size * array)]
-                values[tag] = [parse_read_reply_struct(ary_data[i:i + size], datatype) for i in
-                               range(0, len(ary_data), size)]
+                values[tag] = [parse_read_reply_struct(data, datatype, encoding, i, bitset) for i in
+                               range(offset, offset + size * array, size)]
             else:
-                values[tag] = parse_read_reply_struct(data[offset:offset + size], datatype)
+                values[tag] = parse_read_reply_struct(data, datatype, encoding, offset, bitset)
 
     return {k: v for k, v in values.items() if k in data_type['attributes']}
 
 
-def parse_string(data):
-    str_len = unpack_dint(data)
-    str_data = data[4:4+str_len]
-    string = ''.join(chr(v + 256) if v < 0 else chr(v) for v in str_data)
-    return string
+def parse_string(data, encoding=STRING_ENCODING):
+    return decode_string(data, 0, encoding)
 
 
 def dword_to_bool_array(dword):
-    bits = [x == '1' for x in bin(dword)[2:]]
-    bools = [False for _ in range(32 - len(bits))] + bits
-    bools.reverse()
-    return bools
+    return list(chain.from_iterable(BYTE_BITS[dword >> shift & 0xFF] for shift in range(0, 32, 8)))
+
+
+def _bool_array(data, offset, size, bitset=False):
+    """
+    decodes the ``size`` bytes of BOOL array data at ``offset``, as a ``BitSet`` if ``bitset`` else a list of bools
+    """
+    if bitset:
+        return BitSet(data[offset:offset + size])
+    return unpack_bool_array(data, offset, size)
 
 
 def get_service_status(status):
@@ -407,7 +409,7 @@ def get_service_status(status):
 
 
 def get_extended_status(msg, start):
-    status = unpack_usint(msg[start:start + 1])
+    status = msg[start]
     # send_rr_data
     # 42 General Status
     # 43 Size of additional status
@@ -417,16 +419,16 @@ def get_extended_status(msg, start):
     # 48 General Status
     # 49 Size of additional status
     # 50..n additional status
-    extended_status_size = (unpack_usint(msg[start + 1:start + 2])) * 2
+    extended_status_size = msg[start + 1] * 2
     extended_status = 0
     if extended_status_size != 0:
         # There is an additional status
         if extended_status_size == 1:
-            extended_status = unpack_usint(msg[start + 2:start + 3])
+            extended_status = msg[start + 2]
         elif extended_status_size == 2:
-            extended_status = unpack_uint(msg[start + 2:start + 4])
+            extended_status = unpack_uint(msg, start + 2)
         elif extended_status_size == 4:
-            extended_status = unpack_dint(msg[start + 2:start + 6])
+            extended_status = unpack_dint(msg, start + 2)
         else:
             return 'Extended Status Size Unknown'
     try:
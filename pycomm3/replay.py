@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# replay.py - Record and replay Ethernet/IP traffic for offline testing and profiling
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+"""
+Recording and replaying of the raw packets exchanged with a PLC.
+
+A :class:`RecordingSocket` is used in place of the normal socket to capture a live session to a file,
+then a :class:`ReplaySocket` can be used to play that session back to the driver byte-for-byte without
+any hardware.  This allows the packet encoding and decoding to be tested and profiled using real traffic.
+
+>>> with LogixDriver('10.20.30.100', sock=RecordingSocket('session.bin')) as plc:
+>>>     plc.read('tag1', 'tag2')
+>>> with LogixDriver('10.20.30.100', sock=ReplaySocket('session.bin')) as plc:
+>>>     plc.read('tag1', 'tag2')  # same results, no PLC required
+
+Replay files are a short file header followed by a record for each packet sent or received, each record
+is a USINT record type, a UDINT length, and then the raw packet bytes.
+"""
+
+from typing import Iterator, List, Tuple
+
+from autologging import logged
+
+from . import CommError
+from .bytes_ import pack_usint, pack_udint, unpack_usint, unpack_udint
+from .const import ENCAPSULATION_COMMAND
+from .socket_ import BaseSocket, Socket
+
+REPLAY_FILE_HEADER = b'pycomm3-replay\x00\x01'
+RECORD_SEND = 0x01
+RECORD_RECEIVE = 0x02
+_RECORD_HEADER_SIZE = 5  # USINT record type + UDINT length
+
+
+def iter_records(filename) -> Iterator[Tuple[int, bytes]]:
+    """
+    Iterate over all the records in a replay file.
+
+    :param filename: path to a file created by a :class:`RecordingSocket`
+    :return: a generator of ``(record type, packet bytes)`` tuples
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    if not data.startswith(REPLAY_FILE_HEADER):
+        raise CommError(f'{filename} is not a valid replay file')
+
+    idx = len(REPLAY_FILE_HEADER)
+    while idx < len(data):
+        record_type = unpack_usint(data[idx:idx + 1])
+        length = unpack_udint(data[idx + 1:idx + _RECORD_HEADER_SIZE])
+        idx += _RECORD_HEADER_SIZE
+        yield record_type, data[idx:idx + length]
+        idx += length
+
+
+@logged
+class RecordingSocket(Socket):
+    """
+    A normal TCP socket that also records every packet sent and received to a replay file.
+    All arguments besides ``filename`` are passed to :class:`~pycomm3.socket_.Socket`.
+    """
+
+    def __init__(self, filename, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._filename = filename
+        self._file = open(filename, 'wb')
+        self._file.write(REPLAY_FILE_HEADER)
+
+    def connect(self, host, port):
+        if self._file.closed:  # reconnecting after a close, continue the same recording
+            self._file = open(self._filename, 'ab')
+        super().connect(host, port)
+
+    def _record(self, record_type, data):
+        self._file.write(b''.join((pack_usint(record_type), pack_udint(len(data)), data)))
+
+    def send(self, msg, timeout=0):
+        total_sent = super().send(msg, timeout)
+        self._record(RECORD_SEND, msg if isinstance(msg, bytes) else b''.join(msg))
+        return total_sent
+
+    def receive(self, timeout=0):
+        data = super().receive(timeout)
+        self._record(RECORD_RECEIVE, data)
+        return data
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if not self._file.closed:
+                self._file.close()
+
+
+@logged
+class ReplaySocket(BaseSocket):
+    """
+    Replays a session recorded by a :class:`RecordingSocket`, no network connection is made.
+
+    Replies are returned in the same order they were recorded.  If ``strict`` is set, each request sent
+    is compared with the recorded request and a :class:`~pycomm3.CommError` is raised if they are different.
+    Connected messages (``send_unit_data``) are compared byte-for-byte, all other requests only compare the
+    encapsulation command since they contain the randomly generated connection ids from the Forward Open.
+    """
+
+    def __init__(self, filename, strict=True):
+        self._records: List[Tuple[int, bytes]] = list(iter_records(filename))
+        self._index = 0
+        self._connected = False
+        self.strict = strict
+
+    def _next_record(self, record_type):
+        if not self._connected:
+            raise CommError('Replay socket is not connected')
+        try:
+            _type, data = self._records[self._index]
+        except IndexError:
+            raise CommError('Replay exhausted, no more recorded packets')
+
+        if _type != record_type:
+            raise CommError(f'Replay out of sync, expected record type {record_type} got {_type}')
+        self._index += 1
+        return data
+
+    def connect(self, host, port):
+        """
+        Nothing to connect to, the replay continues from the current record so a session
+        that reconnected while it was recorded can be replayed.
+        """
+        self._connected = True
+
+    def send(self, msg, timeout=0):
+        if not isinstance(msg, bytes):
+            msg = b''.join(msg)
+        recorded = self._next_record(RECORD_SEND)
+        if self.strict and msg != recorded:
+            if msg[:2] == ENCAPSULATION_COMMAND['send_unit_data'] or msg[:2] != recorded[:2]:
+                raise CommError(f'Request does not match recorded request (packet {self._index})')
+        return len(msg)
+
+    def receive(self, timeout=0):
+        return self._next_record(RECORD_RECEIVE)
+
+    def close(self):
+        self._connected = False
+
+    @property
+    def finished(self) -> bool:
+        """
+        True if every recorded packet has been replayed
+        """
+        return self._index >= len(self._records)
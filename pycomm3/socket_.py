@@ -24,53 +24,311 @@
 # SOFTWARE.
 #
 
+import asyncio
+import os
+from abc import ABC, abstractmethod
 import socket
+import struct
+import threading
+from collections import deque
+from typing import Callable, Optional
+
 from autologging import logged
+
 from . import CommError
 from .const import HEADER_SIZE
-import struct
+
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')  # not available on Windows
+
+
+def _iov_max() -> int:
+    try:
+        iov_max = os.sysconf('SC_IOV_MAX')
+    except (AttributeError, ValueError, OSError):
+        iov_max = -1
+    return iov_max if iov_max > 0 else 1024
+
+
+IOV_MAX = _iov_max() if _HAS_SENDMSG else 1  # max number of buffers for one sendmsg call
+
+
+class BaseSocket(ABC):
+    """
+    Interface for the transport used by the :class:`~pycomm3.LogixDriver` to exchange packets with the target.
+
+    ``send`` is given a complete encapsulated packet, either as bytes or a list of buffers to be sent in order,
+    and ``receive`` must return exactly one complete encapsulated reply (header included).
+    Transports may be connected and closed multiple times.
+    """
+
+    @abstractmethod
+    def connect(self, host: str, port: int):
+        ...
+
+    @abstractmethod
+    def send(self, msg: bytes, timeout: float = 0) -> int:
+        ...
+
+    @abstractmethod
+    def receive(self, timeout: float = 0) -> bytes:
+        ...
+
+    @abstractmethod
+    def close(self):
+        ...
+
+
+def _frame_size(buffer) -> int:
+    """
+    Returns the total size of the encapsulated packet at the start of ``buffer``, or 0 if the header is incomplete
+    """
+    if len(buffer) < HEADER_SIZE:
+        return 0
+    return HEADER_SIZE + struct.unpack_from('<H', buffer, 2)[0]
+
+
+def _configure_socket(sock, keepalive, nodelay, send_buffer_size, recv_buffer_size):
+    if keepalive:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if nodelay:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    if send_buffer_size:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer_size)
+    if recv_buffer_size:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer_size)
 
 
 @logged
-class Socket:
+class Socket(BaseSocket):
+    """
+    Blocking TCP transport, the default used by the driver.
 
-    def __init__(self, timeout=5.0):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.settimeout(timeout)
-        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    :param timeout: socket timeout in seconds
+    :param keepalive: enable ``SO_KEEPALIVE``
+    :param nodelay: enable ``TCP_NODELAY``, disables Nagle's algorithm
+    :param quickack: enable ``TCP_QUICKACK`` after every receive to disable delayed ACKs (Linux only, ignored elsewhere)
+    :param send_buffer_size: size for ``SO_SNDBUF``, ``None`` to use the OS default
+    :param recv_buffer_size: size for ``SO_RCVBUF``, ``None`` to use the OS default
+    :param recv_size: max number of bytes requested from the socket for each ``recv`` call
+    """
+
+    def __init__(self, timeout=5.0, keepalive=True, nodelay=False, quickack=False,
+                 send_buffer_size=None, recv_buffer_size=None, recv_size=4096):
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.nodelay = nodelay
+        self.quickack = quickack and hasattr(socket, 'TCP_QUICKACK')
+        self.send_buffer_size = send_buffer_size
+        self.recv_buffer_size = recv_buffer_size
+        self.recv_size = recv_size
+        self.sock = None
+        self._buffer = bytearray()
 
     def connect(self, host, port):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self._buffer = bytearray()
         try:
+            _configure_socket(self.sock, self.keepalive, self.nodelay, self.send_buffer_size, self.recv_buffer_size)
             self.sock.connect((host, port))
         except socket.timeout:
+            self.close()
             raise CommError("Socket timeout during connection.")
+        except Exception:
+            self.close()
+            raise
 
     def send(self, msg, timeout=0):
         if timeout != 0:
             self.sock.settimeout(timeout)
+
+        if isinstance(msg, (bytes, bytearray, memoryview)):
+            buffers = [memoryview(msg)]
+        elif _HAS_SENDMSG:
+            buffers = [memoryview(buf) for buf in msg if len(buf)]
+        else:
+            buffers = [memoryview(b''.join(msg))]
+
         total_sent = 0
-        while total_sent < len(msg):
+        while buffers:
             try:
-                sent = self.sock.send(msg[total_sent:])
+                if len(buffers) == 1:
+                    sent = self.sock.send(buffers[0])
+                else:
+                    sent = self.sock.sendmsg(buffers[:IOV_MAX])  # the rest are sent on the next loop
                 if sent == 0:
                     raise CommError("socket connection broken.")
-                total_sent += sent
             except socket.error:
                 raise CommError("socket connection broken.")
+
+            total_sent += sent
+            # drop the buffers that were sent and slice the partially sent one, memoryview slices do not copy
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers[0])
+                buffers.pop(0)
+            if sent:
+                buffers[0] = buffers[0][sent:]
+
         return total_sent
 
     def receive(self, timeout=0):
         try:
             if timeout != 0:
                 self.sock.settimeout(timeout)
-            data = self.sock.recv(4096)
-            data_len = struct.unpack_from('<H', data, 2)[0]
-            while len(data) - HEADER_SIZE < data_len:
-                data += self.sock.recv(4096)
+            buffer = self._buffer
+            frame_size = _frame_size(buffer)
+            while not frame_size or len(buffer) < frame_size:
+                data = self.sock.recv(self.recv_size)
+                if not data:
+                    raise CommError("socket connection broken.")
+                buffer += data
+                frame_size = _frame_size(buffer)
+
+            if self.quickack:
+                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
 
-            return data
+            frame = bytes(buffer[:frame_size])
+            del buffer[:frame_size]  # keep any extra data for the next receive
+            return frame
         except socket.error as err:
             raise CommError(err)
 
     def close(self):
-        self.sock.close()
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+@logged
+class AsyncioSocket(BaseSocket):
+    """
+    TCP transport using :mod:`asyncio` streams, the socket I/O is done on an event loop instead of the calling thread.
+
+    If ``loop`` is not provided a new event loop is created and run in a daemon thread, it is stopped when the socket
+    is closed.  Many transports can share a single loop, allowing connections to many PLCs to be serviced by one
+    I/O thread.  The loop must not be running in the thread calling the driver, since the driver API blocks waiting
+    for the result.
+
+    :param timeout: timeout in seconds for each operation
+    :param loop: event loop to run the socket on, it must already be running in another thread
+    :param keepalive: enable ``SO_KEEPALIVE``
+    :param nodelay: enable ``TCP_NODELAY``
+    :param quickack: enable ``TCP_QUICKACK`` after every receive to disable delayed ACKs (Linux only, ignored elsewhere)
+    :param send_buffer_size: size for ``SO_SNDBUF``, ``None`` to use the OS default
+    :param recv_buffer_size: size for ``SO_RCVBUF``, ``None`` to use the OS default
+    """
+
+    def __init__(self, timeout=5.0, loop: Optional[asyncio.AbstractEventLoop] = None, keepalive=True, nodelay=False,
+                 quickack=False, send_buffer_size=None, recv_buffer_size=None):
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.nodelay = nodelay
+        self.quickack = quickack and hasattr(socket, 'TCP_QUICKACK')
+        self.send_buffer_size = send_buffer_size
+        self.recv_buffer_size = recv_buffer_size
+        self._loop = loop
+        self._loop_thread = None
+        self._reader = None
+        self._writer = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name='pycomm3-asyncio', daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    def _run(self, coro, timeout=0):
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout or self.timeout)
+        except Exception as err:
+            future.cancel()
+            raise CommError(err)
+
+    async def _connect(self, host, port):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            _configure_socket(sock, self.keepalive, self.nodelay, self.send_buffer_size, self.recv_buffer_size)
+            await asyncio.get_event_loop().sock_connect(sock, (host, port))
+            return await asyncio.open_connection(sock=sock)
+        except BaseException:
+            sock.close()
+            raise
+
+    def connect(self, host, port):
+        self._reader, self._writer = self._run(self._connect(host, port))
+
+    async def _send(self, msg):
+        if isinstance(msg, (bytes, bytearray, memoryview)):
+            self._writer.write(msg)
+        else:
+            self._writer.writelines(msg)
+        await self._writer.drain()
+
+    def send(self, msg, timeout=0):
+        self._run(self._send(msg), timeout)
+        return len(msg) if isinstance(msg, (bytes, bytearray, memoryview)) else sum(len(m) for m in msg)
+
+    async def _receive(self):
+        header = await self._reader.readexactly(HEADER_SIZE)
+        data = await self._reader.readexactly(_frame_size(header) - HEADER_SIZE)
+        if self.quickack:
+            self._writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        return header + data
+
+    def receive(self, timeout=0):
+        return self._run(self._receive(), timeout)
+
+    async def _close(self, writer):
+        writer.close()
+        if hasattr(writer, 'wait_closed'):  # added in 3.7
+            await writer.wait_closed()
+
+    def close(self):
+        writer, self._writer, self._reader = self._writer, None, None
+        try:
+            if writer is not None:
+                self._run(self._close(writer))
+        finally:
+            if self._loop_thread is not None:  # only stop the loop if it was created by this socket
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop_thread.join()
+                self._loop.close()
+                self._loop = self._loop_thread = None
+
+
+@logged
+class LoopbackSocket(BaseSocket):
+    """
+    In-process transport, every packet sent is passed to ``handler`` instead of a network connection.
+
+    The handler is given the encapsulated request and returns the encapsulated reply, or ``None`` if there is no reply
+    to the request (e.g. UnRegister Session).  This allows the driver to be run completely in memory against a
+    simulator, useful for testing and benchmarks.
+    """
+
+    def __init__(self, handler: Callable[[bytes], Optional[bytes]]):
+        self.handler = handler
+        self._replies = deque()
+
+    def connect(self, host, port):
+        self._replies.clear()
+
+    def send(self, msg, timeout=0):
+        msg = bytes(msg) if isinstance(msg, (bytes, bytearray, memoryview)) else b''.join(msg)
+        reply = self.handler(msg)
+        if reply is not None:
+            self._replies.append(reply)
+        return len(msg)
+
+    def receive(self, timeout=0):
+        try:
+            return self._replies.popleft()
+        except IndexError:
+            raise CommError('No reply from loopback handler')
+
+    def close(self):
+        self._replies.clear()
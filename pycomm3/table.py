@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# table.py - Columnar results of reading many tags
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from array import array
+from typing import Any, Callable, Dict, NamedTuple, Sequence
+
+from . import RequestError
+
+#: ``array`` type codes for the value column when every tag read is the same atomic type
+COLUMN_TYPECODES = {
+    'SINT': 'b',
+    'INT': 'h',
+    'DINT': 'i',
+    'LINT': 'q',
+    'USINT': 'B',
+    'UINT': 'H',
+    'UDINT': 'I',
+    'ULINT': 'Q',
+    'REAL': 'f',
+    'LREAL': 'd',
+}
+
+TABLE_OUTPUTS = ('dict', 'arrow', 'pandas')
+
+
+class PacketTimes(NamedTuple):
+    #: index of the request in the requests sent for a read or write
+    index: int
+    #: ``time.time()`` when the request was sent
+    sent: float
+    #: ``time.time()`` when the reply was received
+    received: float
+    #: ``time.perf_counter()`` when the request was sent
+    sent_monotonic: float
+    #: ``time.perf_counter()`` when the reply was received
+    received_monotonic: float
+
+
+_NOT_SENT = PacketTimes(-1, float('nan'), float('nan'), float('nan'), float('nan'))
+
+
+def table_columns(results) -> Dict[str, Sequence]:
+    """
+    Returns the columns of the table for the results of a read, a row for each tag:
+
+        - ``tag``: the tag names
+        - ``value``: the values, an ``array`` if every tag was read successfully and is the same atomic type
+          (e.g. all REAL or all DINT), else a list with ``None`` for the failed reads
+        - ``type``: the data types
+        - ``error``: the errors, ``None`` for the successful reads
+        - ``packet``: an ``array`` of the index of the request each tag was read in, -1 if a tag was not sent
+        - ``sent``, ``received``: ``array`` of the time (``time.time()``) the request with each tag was sent and its
+          reply received, NaN if a tag was not sent
+        - ``sent_monotonic``, ``received_monotonic``: the same as ``sent`` and ``received`` from
+          ``time.perf_counter()``
+    """
+    types = [result.type for result in results]
+    values = [result.value for result in results]
+    typecode = COLUMN_TYPECODES.get(types[0]) if types else None
+    if typecode is not None and all(typ == types[0] for typ in types) and all(results):
+        values = array(typecode, values)
+
+    packets = [result.packet or _NOT_SENT for result in results]
+    index, sent, received, sent_monotonic, received_monotonic = zip(*packets) if packets else ((), ) * 5
+    return {
+        'tag': [result.tag for result in results],
+        'value': values,
+        'type': types,
+        'error': [result.error for result in results],
+        'packet': array('i', index),
+        'sent': array('d', sent),
+        'received': array('d', received),
+        'sent_monotonic': array('d', sent_monotonic),
+        'received_monotonic': array('d', received_monotonic),
+    }
+
+
+def table_builder(output: str) -> Callable[[Dict[str, Sequence]], Any]:
+    """
+    Returns the function to create the table returned by :meth:`~pycomm3.LogixDriver.read_table` from the columns,
+    the library needed for the table is imported so a missing library is found before anything is read.
+
+    :param output: ``'dict'``, ``'arrow'``, or ``'pandas'``
+    :raises RequestError: if ``output`` is invalid or the library it requires is not installed
+    """
+    if output == 'dict':
+        return dict
+
+    if output == 'arrow':
+        try:
+            import pyarrow
+        except ImportError as err:
+            raise RequestError("output='arrow' requires pyarrow to be installed", err)
+        return lambda columns: _arrow_table(pyarrow, columns)
+
+    if output == 'pandas':
+        try:
+            import pandas
+        except ImportError as err:
+            raise RequestError("output='pandas' requires pandas to be installed", err)
+        return pandas.DataFrame
+
+    raise RequestError(f'Invalid table output {output!r}, must be one of: {", ".join(TABLE_OUTPUTS)}')
+
+
+def _arrow_table(pyarrow, columns):
+    """
+    Creates a ``pyarrow.Table`` from the columns, ``array`` columns are used as the Arrow buffers without copying
+    """
+    arrow_types = {
+        'b': pyarrow.int8(), 'h': pyarrow.int16(), 'i': pyarrow.int32(), 'q': pyarrow.int64(),
+        'B': pyarrow.uint8(), 'H': pyarrow.uint16(), 'I': pyarrow.uint32(), 'Q': pyarrow.uint64(),
+        'f': pyarrow.float32(), 'd': pyarrow.float64(),
+    }
+
+    arrays = {}
+    for name, column in columns.items():
+        if isinstance(column, array):
+            arrays[name] = pyarrow.Array.from_buffers(arrow_types[column.typecode], len(column),
+                                                      [None, pyarrow.py_buffer(column)])
+        else:
+            arrays[name] = pyarrow.array(column)
+
+    return pyarrow.table(arrays)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#
+# write_plan.py - Prepared writes of the same tags with new values
+#
+# Copyright (c) 2019 Ian Ottoway <ian@ottoway.dev>
+# Copyright (c) 2014 Agostino Ruscito <ruscito@gmail.com>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple, Union
+
+from autologging import logged
+
+from . import Tag, RequestError
+
+
+class ValueSlot(NamedTuple):
+    #: message the value is written into
+    buffer: bytearray
+    #: offset of the value in the message
+    offset: int
+    #: function to pack a value into the message, called with ``(buffer, offset, value)``
+    pack: Callable[[bytearray, int, Any], None]
+
+
+class BitSlot(NamedTuple):
+    #: message the masks are written into
+    buffer: bytearray
+    #: offset of the OR mask in the message, the AND mask follows it
+    offset: int
+    #: size of each mask in bytes
+    mask_size: int
+    #: the bits written with each Read Modify Write service, as ``(index of value, bit number)``
+    bits: List[Tuple[int, int]]
+
+
+@logged
+class WritePlan:
+    """
+    A prepared write of the same tags, created by :meth:`~pycomm3.LogixDriver.prepare_write`.  The requests are built
+    once when the plan is created, executing the plan only packs the new values into the messages and sends them.
+
+    The plan is only valid for the tag definitions and connection it was created with.  Executing the plan after
+    the tag list is uploaded again raises a ``RequestError``, if the driver reconnects using a different packet size
+    a new plan should be prepared as well.
+    """
+
+    def __init__(self, driver, tags: Sequence[str], parsed_requests: Dict[str, dict], requests: list,
+                 value_slots: Dict[int, ValueSlot], bit_slots: List[BitSlot]):
+        self._driver = driver
+        self._tag_definitions = driver._tags  # the tag list the requests were built from
+        self.tags = tuple(tags)
+        self._parsed_requests = parsed_requests
+        self._requests = requests
+        self._value_slots = value_slots
+        self._bit_slots = bit_slots
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(tags={len(self.tags)}, requests={len(self._requests)})'
+
+    def execute(self, *values: Any) -> Union[Tag, List[Tag]]:
+        """
+        Writes the values to the tags of the plan
+
+        :param values: a value for each tag, in the same order as the tags used to prepare the plan
+        :return: a ``Tag`` for each tag written, like :meth:`~pycomm3.LogixDriver.write`
+        :raises RequestError: if the wrong number of values are given, a value is invalid for its tag, or the
+                              tag list has been reloaded since the plan was prepared
+        """
+        if self._driver._tags is not self._tag_definitions:
+            raise RequestError('Tag definitions have changed since the write plan was prepared')
+        if len(values) != len(self.tags):
+            raise RequestError(f'Expected {len(self.tags)} values, got {len(values)}')
+
+        return self._driver._execute_write_plan(self, values)
+
+    def _pack(self, values: Sequence[Any]):
+        """
+        Packs the values into the request messages
+        """
+        for i, slot in self._value_slots.items():
+            try:
+                slot.pack(slot.buffer, slot.offset, values[i])
+            except Exception as err:
+                raise RequestError(f'Invalid value for {self.tags[i]}', err)
+
+        for slot in self._bit_slots:
+            or_mask, and_mask = 0, (1 << slot.mask_size * 8) - 1
+            for i, bit in slot.bits:
+                if values[i]:
+                    or_mask |= (1 << bit)
+                    and_mask |= (1 << bit)
+                else:
+                    or_mask &= ~(1 << bit)
+                    and_mask &= ~(1 << bit)
+            mask_end = slot.offset + slot.mask_size
+            slot.buffer[slot.offset:mask_end] = or_mask.to_bytes(slot.mask_size, 'little')
+            slot.buffer[mask_end:mask_end + slot.mask_size] = and_mask.to_bytes(slot.mask_size, 'little')
@@ -20,6 +20,8 @@ setup(
     python_requires='>=3.6',
     install_requires=['autologging',
                       'pywin32;platform_system=="Windows"'],
+    extras_require={'arrow': ['pyarrow'],
+                    'pandas': ['pandas']},
     include_package_data=True,
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -3,10 +3,15 @@ from pycomm3 import LogixDriver
 import os
 
 
-PATH = os.environ['PLCPATH']
+@pytest.fixture(scope='session')
+def plc_path():
+    path = os.environ.get('PLCPATH')
+    if not path:
+        pytest.skip('PLCPATH is not set, a PLC is required')
+    return path
 
 
-@pytest.fixture(scope='module', autouse=True)
-def plc():
-    with LogixDriver(PATH) as plc_:
+@pytest.fixture(scope='module')
+def plc(plc_path):
+    with LogixDriver(plc_path) as plc_:
         yield plc_
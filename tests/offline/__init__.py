@@ -0,0 +1,15 @@
+from pycomm3 import LogixDriver
+from pycomm3.socket_ import LoopbackSocket
+from .simulator import Simulator
+
+
+def simulated_plc(sim=None, **kwargs):
+    """
+    Returns a ``LogixDriver`` connected to a simulator (a new one if ``sim`` is not given)
+    """
+    sim = sim or Simulator()
+    kwargs.setdefault('sock', LoopbackSocket(sim.handle))
+    plc = LogixDriver('10.0.0.1', init_info=False, init_tags=False, **kwargs)
+    plc._tags = sim.definitions()
+    plc.open()
+    return plc
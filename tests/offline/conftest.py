@@ -0,0 +1,14 @@
+import pytest
+from . import simulated_plc
+from .simulator import Simulator
+
+
+@pytest.fixture
+def sim():
+    return Simulator()
+
+
+@pytest.fixture
+def plc(sim):
+    with simulated_plc(sim) as plc_:
+        yield plc_
@@ -0,0 +1,515 @@
+"""
+A small in-memory simulation of a Logix controller, used to run the driver without a PLC.
+
+Only the services used by the driver for reading and writing tags are supported, the tag definitions are given to
+the driver directly (``plc._tags = sim.definitions()``) instead of uploading them.
+"""
+
+import socketserver
+import struct
+import threading
+
+DATA_TYPES = {'BOOL': 0xc1, 'SINT': 0xc2, 'INT': 0xc3, 'DINT': 0xc4, 'LINT': 0xc5, 'USINT': 0xc6, 'UINT': 0xc7,
+              'UDINT': 0xc8, 'ULINT': 0xc9, 'REAL': 0xca, 'LREAL': 0xcb, 'DWORD': 0xd3}
+SIZES = {'BOOL': 1, 'SINT': 1, 'INT': 2, 'DINT': 4, 'LINT': 8, 'USINT': 1, 'UINT': 2, 'UDINT': 4, 'ULINT': 8,
+         'REAL': 4, 'LREAL': 8, 'DWORD': 4}
+FORMATS = {'BOOL': 'b', 'SINT': 'b', 'INT': '<h', 'DINT': '<i', 'LINT': '<q', 'USINT': 'B', 'UINT': '<H',
+           'UDINT': '<I', 'ULINT': '<Q', 'REAL': '<f', 'LREAL': '<d', 'DWORD': '<I'}
+
+SERVICE_NOT_SUPPORTED = 0x08
+PATH_DESTINATION_UNKNOWN = 0x04
+INVALID_ELEMENT = 0x05
+INSUFFICIENT_PACKETS = 0x06
+NOT_ENOUGH_DATA = 0x13
+TOO_MUCH_DATA = 0x15
+
+TARGET_CID = b'\x11\x22\x33\x44'
+
+
+def string_type(name, length, handle):
+    size = 4 + length
+    size += (-size) % 4
+    return {
+        'name': name,
+        'internal_tags': {'LEN': {'offset': 0, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 0},
+                          'DATA': {'offset': 4, 'tag_type': 'atomic', 'data_type': 'SINT', 'array': length}},
+        'attributes': ['LEN', 'DATA'],
+        'template': {'structure_size': size, 'structure_handle': handle, 'member_count': 2,
+                     'object_definition_size': 0},
+        'string': length,
+    }
+
+
+STRING = string_type('STRING', 82, 0x0fce)
+STRING20 = string_type('STRING20', 20, 0x1111)
+
+SIMPLE_UDT = {
+    'name': 'SimpleUDT1',
+    'internal_tags': {
+        'ZZZZZZZZZZSimpleUDT0': {'offset': 0, 'tag_type': 'atomic', 'data_type': 'SINT', 'array': 0},
+        'bool': {'offset': 0, 'tag_type': 'atomic', 'data_type': 'BOOL', 'bit': 0},
+        'sint': {'offset': 1, 'tag_type': 'atomic', 'data_type': 'SINT', 'array': 0},
+        'int': {'offset': 2, 'tag_type': 'atomic', 'data_type': 'INT', 'array': 0},
+        'dint': {'offset': 4, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 0},
+        'real': {'offset': 8, 'tag_type': 'atomic', 'data_type': 'REAL', 'array': 0},
+    },
+    'attributes': ['bool', 'sint', 'int', 'dint', 'real'],
+    'template': {'structure_size': 12, 'structure_handle': 0x2222, 'member_count': 6, 'object_definition_size': 0},
+}
+
+MOTOR = {
+    'name': 'Motor',
+    'internal_tags': {
+        'Speed': {'offset': 0, 'tag_type': 'atomic', 'data_type': 'REAL', 'array': 0},
+        'Current': {'offset': 4, 'tag_type': 'atomic', 'data_type': 'REAL', 'array': 0},
+        'Fault': {'offset': 8, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 0},
+        'Hist': {'offset': 12, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 4},
+        'Name': {'offset': 28, 'tag_type': 'struct', 'data_type': STRING20, 'array': 0},
+    },
+    'attributes': ['Speed', 'Current', 'Fault', 'Hist', 'Name'],
+    'template': {'structure_size': 52, 'structure_handle': 0x3333, 'member_count': 5, 'object_definition_size': 0},
+}
+
+# just fits in a standard connection by itself, but not in a Multiple Service Packet reply
+BIG_UDT = {
+    'name': 'BigUDT',
+    'internal_tags': {
+        'A': {'offset': 0, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 0},
+        'B': {'offset': 4, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 0},
+        'Values': {'offset': 8, 'tag_type': 'atomic', 'data_type': 'DINT', 'array': 119},
+    },
+    'attributes': ['A', 'B', 'Values'],
+    'template': {'structure_size': 484, 'structure_handle': 0x4444, 'member_count': 3, 'object_definition_size': 0},
+}
+
+
+def type_size(data_type):
+    return SIZES[data_type] if isinstance(data_type, str) else data_type['template']['structure_size']
+
+
+class CIPError(Exception):
+    pass
+
+
+class SimulatedTag:
+    def __init__(self, name, data_type, dims=(0, 0, 0), instance_id=None):
+        self.name = name
+        self.data_type = data_type
+        self.dims = [d for d in dims if d]
+        self.count = 1
+        for dim in self.dims:
+            self.count *= dim
+        self.elem_size = type_size(data_type)
+        self.data = bytearray(self.elem_size * self.count)
+        self.instance_id = instance_id
+
+    def definition(self):
+        return {
+            'tag_name': self.name,
+            'dim': len(self.dims),
+            'instance_id': self.instance_id,
+            'dimensions': (self.dims + [0, 0, 0])[:3],
+            'alias': False,
+            'external_access': 'Read/Write',
+            'tag_type': 'atomic' if isinstance(self.data_type, str) else 'struct',
+            'data_type': self.data_type,
+        }
+
+
+class Simulator:
+    """
+    Simulates a controller with a fixed set of tags, ``handle`` is used as the handler for a
+    :class:`~pycomm3.socket_.LoopbackSocket`.
+
+    :param frag_align: if set, the data in each fragmented read reply is a multiple of this many bytes
+    :param reply_cap: if set, replies are limited to this size instead of the connection size
+    """
+
+    def __init__(self, frag_align=1, reply_cap=None):
+        self.tags = {}
+        self.session = 0x1234abcd
+        self.connection_size = 500
+        self.frag_align = frag_align
+        self.reply_cap = reply_cap
+        self.violations = []  # requests or replies larger than the connection allows
+        self.services = []  # service code of every connected request
+        self.sequences = []  # sequence count of every connected request
+        self._build()
+
+    @property
+    def capacity(self):
+        return min(self.connection_size, self.reply_cap or self.connection_size)
+
+    def add(self, name, data_type, dims=(0, 0, 0)):
+        tag = SimulatedTag(name, data_type, dims, instance_id=len(self.tags) + 1)
+        self.tags[name] = tag
+        return tag
+
+    def set(self, name, values):
+        tag = self.tags[name]
+        for i, value in enumerate(values):
+            struct.pack_into(FORMATS[tag.data_type], tag.data, i * tag.elem_size, value)
+
+    def get(self, name):
+        tag = self.tags[name]
+        values = [struct.unpack_from(FORMATS[tag.data_type], tag.data, i * tag.elem_size)[0]
+                  for i in range(tag.count)]
+        return values if tag.dims else values[0]
+
+    def definitions(self):
+        return {name: tag.definition() for name, tag in self.tags.items()}
+
+    def _build(self):
+        self.add('DINT1', 'DINT')
+        self.set('DINT1', [20])
+        self.add('SINT1', 'SINT')
+        self.set('SINT1', [5])
+        self.add('INT1', 'INT')
+        self.set('INT1', [256])
+        self.add('REAL1', 'REAL')
+        self.set('REAL1', [100.001])
+        self.add('LINT1', 'LINT')
+        self.set('LINT1', [-(2 ** 40)])
+        self.add('LREAL1', 'LREAL')
+        self.set('LREAL1', [1.5e100])
+        self.add('UDINT1', 'UDINT')
+        self.set('UDINT1', [4000000000])
+        self.add('ULINT1', 'ULINT')
+        self.set('ULINT1', [2 ** 63 + 5])
+        self.add('BOOL1', 'BOOL')
+        self.add('DINT_ARY1', 'DINT', (100, 0, 0))
+        self.set('DINT_ARY1', [i * 1000 for i in range(100)])
+        self.add('INT_ARY1', 'INT', (20, 0, 0))
+        self.set('INT_ARY1', [i * 10 for i in range(20)])
+        self.add('SINT_ARY1', 'SINT', (20, 0, 0))
+        self.set('SINT_ARY1', list(range(20)))
+        self.add('REAL_ARY1', 'REAL', (10, 0, 0))
+        self.set('REAL_ARY1', [i / 10 for i in range(10)])
+        self.add('LREAL_ARY1', 'LREAL', (10, 0, 0))
+        self.set('LREAL_ARY1', [i / 3 for i in range(10)])
+        self.add('DINT_MD', 'DINT', (3, 4, 5))
+        self.set('DINT_MD', list(range(60)))
+        self.add('bool_ary1', 'DWORD', (3, 0, 0))
+        self.set('bool_ary1', [0x5555ffff, 0xffff0000, 0x80000000])
+        self.add('BIG_ARY', 'DINT', (5000, 0, 0))
+        self.set('BIG_ARY', list(range(5000)))
+        self.add('BIG_REAL', 'REAL', (3000, 0, 0))
+        self.set('BIG_REAL', [i * 0.5 for i in range(3000)])
+
+        tag = self.add('STRING1', STRING)
+        _set_string(tag.data, 0, 'A Test String')
+        tag = self.add('STRING_ARY1', STRING, (5, 0, 0))
+        for i, value in enumerate(('first', 'Second', 'THIRD', 'FoUrTh', '5th')):
+            _set_string(tag.data, i * tag.elem_size, value)
+        tag = self.add('STRING20_ARY1', STRING20, (10, 0, 0))
+        for i in range(10):
+            _set_string(tag.data, i * tag.elem_size, f'{i}' * 20)
+
+        tag = self.add('SimpleUDT1_1', SIMPLE_UDT)
+        tag.data[0] = 1
+        tag.data[1] = 100
+        struct.pack_into('<hif', tag.data, 2, -32768, -1, 1.5)
+
+        tag = self.add('Motor1', MOTOR)
+        struct.pack_into('<ffi4i', tag.data, 0, 1750.0, 12.5, 0, 1, 2, 3, 4)
+        _set_string(tag.data, 28, 'Conveyor')
+        tag = self.add('Motor_ARY', MOTOR, (4, 0, 0))
+        for i in range(4):
+            struct.pack_into('<ffi', tag.data, i * tag.elem_size, 100.0 * i, 1.0 * i, i)
+
+        tag = self.add('Big1', BIG_UDT)
+        struct.pack_into('<121i', tag.data, 0, -1, -2, *range(119))
+
+        # added after the tags in the recorded session, so their instance ids are unchanged
+        self.add('BOOL_BIG', 'DWORD', (400, 0, 0))  # 12,800 bits, fragmented with either connection size
+        self.set('BOOL_BIG', [1 << (i % 32) for i in range(400)])
+
+    # ---------------------------------------------------------------- encapsulation
+
+    def handle(self, frame):
+        """
+        Returns the reply for an encapsulated request, or ``None`` if the command has no reply
+        """
+        command, length = struct.unpack_from('<HH', frame, 0)
+        assert len(frame) == 24 + length, f'bad frame length {len(frame)} for {length} bytes of data'
+        context = frame[12:20]
+        data = frame[24:]
+
+        if command == 0x65:  # register session
+            return self._header(command, data[:4], context)
+        if command == 0x66:  # unregister session
+            return None
+        if command == 0x6f:  # send rr data
+            return self._header(command, self._unconnected(data[16:]), context)
+        if command == 0x70:  # send unit data
+            item_length = struct.unpack_from('<H', data, 18)[0]
+            return self._header(command, self._connected(data[20:20 + item_length]), context)
+        raise ValueError(f'unsupported command 0x{command:02x}')
+
+    def _header(self, command, data, context):
+        return struct.pack('<HHII', command, len(data), self.session, 0) + context + b'\x00' * 4 + data
+
+    def _unconnected(self, message):
+        service = message[0]
+        if service in (0x54, 0x5b):  # forward open, large forward open
+            self.connection_size = 4000 if service == 0x5b else 500
+            body = bytes([service | 0x80, 0, 0, 0]) + TARGET_CID + b'\x00' * 26
+        else:
+            body = bytes([service | 0x80, 0, 0, 0]) + b'\x00' * 10
+        return struct.pack('<IHH', 0, 0, 2) + b'\x00\x00\x00\x00\xb2\x00' + struct.pack('<H', len(body)) + body
+
+    def _connected(self, message):
+        if len(message) > self.capacity:
+            self.violations.append(('request too large', len(message), self.capacity))
+        sequence = message[:2]
+        self.sequences.append(struct.unpack('<H', sequence)[0])
+        reply = sequence + self._service(bytes(message[2:]), top=True)
+        if len(reply) > self.connection_size:
+            self.violations.append(('reply too large', len(reply), self.connection_size))
+        return (struct.pack('<IHH', 0, 0, 2) + b'\xa1\x00\x04\x00' + TARGET_CID + b'\xb1\x00' +
+                struct.pack('<H', len(reply)) + reply)
+
+    # ---------------------------------------------------------------- services
+
+    def _service(self, message, top=False, capacity=None):
+        if capacity is None:
+            capacity = self.capacity - 2
+        service = message[0]
+        if top:
+            self.services.append(service)
+        try:
+            if service == 0x0a:
+                return self._multi_service(message)
+            path_size = message[1] * 2
+            location = self._resolve(message[2:2 + path_size])
+            request = message[2 + path_size:]
+            if service == 0x4c:
+                return self._read(location, request, capacity)
+            if service == 0x52:
+                return self._read_fragmented(location, request, capacity)
+            if service == 0x4d:
+                return self._write(location, request)
+            if service == 0x53:
+                return self._write_fragmented(location, request)
+            if service == 0x4e:
+                return self._read_modify_write(location, request)
+            return _error(service, SERVICE_NOT_SUPPORTED)
+        except KeyError:
+            return _error(service, PATH_DESTINATION_UNKNOWN)
+        except CIPError as err:
+            return _error(service, err.args[0])
+
+    def _multi_service(self, message):
+        assert message[1:6] == b'\x02\x20\x02\x24\x01', 'multi service request not sent to the message router'
+        count = struct.unpack_from('<H', message, 6)[0]
+        offsets = struct.unpack_from(f'<{count}H', message, 8)
+        services = message[6:]
+        ends = list(offsets[1:]) + [len(services)]
+        used = 4 + 2 + count * 2
+        replies = []
+        for start, end in zip(offsets, ends):
+            reply = self._service(services[start:end], capacity=max(0, self.capacity - 2 - used - 4))
+            used += len(reply)
+            replies.append(reply)
+
+        out = bytearray(b'\x8a\x00\x00\x00' + struct.pack('<H', count))
+        offset = 2 + 2 * count
+        for reply in replies:
+            out += struct.pack('<H', offset)
+            offset += len(reply)
+        for reply in replies:
+            out += reply
+        return bytes(out)
+
+    def _resolve(self, path):
+        """
+        Returns the tag, data type, byte offset and remaining size of the data for a request path
+        """
+        i = 0
+        tag = data_type = dims = None
+        offset = 0
+        while i < len(path):
+            segment = path[i]
+            if segment == 0x91:  # symbolic segment
+                length = path[i + 1]
+                name = bytes(path[i + 2:i + 2 + length]).decode()
+                i += 2 + length + (length % 2)
+                if tag is None:
+                    tag = self.tags[name]
+                    data_type, dims = tag.data_type, list(tag.dims)
+                else:
+                    data_type, dims, offset = _member(data_type, name, offset)
+            elif segment == 0x20:  # symbol instance id
+                instance = struct.unpack_from('<H', path, i + 4)[0]
+                i += 6
+                tag = next(t for t in self.tags.values() if t.instance_id == instance)
+                data_type, dims = tag.data_type, list(tag.dims)
+            elif segment in (0x28, 0x29, 0x2a):  # element or member id
+                value, i = _logical_value(path, i)
+                if dims:
+                    indexes = [value]
+                    while len(indexes) < len(dims) and i < len(path) and path[i] in (0x28, 0x29, 0x2a):
+                        value, i = _logical_value(path, i)
+                        indexes.append(value)
+                    element = 0
+                    for dim, index in zip(dims, indexes):
+                        if index >= dim:
+                            raise CIPError(INVALID_ELEMENT)
+                        element = element * dim + index
+                    for dim in dims[len(indexes):]:
+                        element *= dim
+                    offset += element * type_size(data_type)
+                    dims = []
+                elif isinstance(data_type, dict):
+                    name = list(data_type['internal_tags'])[value]
+                    data_type, dims, offset = _member(data_type, name, offset)
+                else:
+                    raise CIPError(INVALID_ELEMENT)
+            else:
+                raise CIPError(PATH_DESTINATION_UNKNOWN)
+
+        return tag, data_type, offset, len(tag.data) - offset
+
+    def _read_data(self, location, elements):
+        tag, data_type, offset, remaining = location
+        if isinstance(data_type, tuple):  # BOOL member of a structure
+            return b'\xff' if tag.data[offset] & (1 << data_type[1]) else b'\x00'
+        size = _element_size(data_type) * elements
+        if size > remaining:
+            raise CIPError(INVALID_ELEMENT)
+        return bytes(tag.data[offset:offset + size])
+
+    def _read(self, location, request, capacity):
+        elements = struct.unpack_from('<H', request)[0]
+        data = self._read_data(location, elements)
+        type_header = _type_header(location[1])
+        if 4 + len(type_header) + len(data) > capacity:
+            fits = max(capacity - 4 - len(type_header), 0)
+            return bytes([0xcc, 0, INSUFFICIENT_PACKETS, 0]) + type_header + data[:fits]
+        return b'\xcc\x00\x00\x00' + type_header + data
+
+    def _read_fragmented(self, location, request, capacity):
+        elements, offset = struct.unpack_from('<HI', request)
+        data = self._read_data(location, elements)
+        type_header = _type_header(location[1])
+        room = capacity - 4 - len(type_header)
+        if self.frag_align > 1:
+            room -= room % self.frag_align
+        if room <= 0:
+            return bytes([0xd2, 0, INSUFFICIENT_PACKETS, 0]) + type_header
+        chunk = data[offset:offset + room]
+        status = 0 if offset + len(chunk) >= len(data) else INSUFFICIENT_PACKETS
+        return bytes([0xd2, 0, status, 0]) + type_header + chunk
+
+    def _write(self, location, request):
+        tag, data_type, offset, remaining = location
+        if request[:2] == b'\xa0\x02':
+            request = request[2:]
+        elements = struct.unpack_from('<H', request, 2)[0]
+        data = request[4:]
+        if isinstance(data_type, tuple):
+            if data[0]:
+                tag.data[offset] |= (1 << data_type[1])
+            else:
+                tag.data[offset] &= ~(1 << data_type[1]) & 0xff
+            return b'\xcd\x00\x00\x00'
+        expected = _element_size(data_type) * elements
+        if len(data) != expected:
+            return _error(0x4d, NOT_ENOUGH_DATA if len(data) < expected else TOO_MUCH_DATA)
+        if expected > remaining:
+            return _error(0x4d, INVALID_ELEMENT)
+        tag.data[offset:offset + expected] = data
+        return b'\xcd\x00\x00\x00'
+
+    def _write_fragmented(self, location, request):
+        tag, data_type, offset, remaining = location
+        if request[:2] == b'\xa0\x02':
+            request = request[2:]
+        _, elements, data_offset = struct.unpack_from('<HHI', request)
+        data = request[8:]
+        if data_offset + len(data) > _element_size(data_type) * elements:
+            return _error(0x53, TOO_MUCH_DATA)
+        start = offset + data_offset
+        tag.data[start:start + len(data)] = data
+        return b'\xd3\x00\x00\x00'
+
+    def _read_modify_write(self, location, request):
+        tag, data_type, offset, remaining = location
+        size = struct.unpack_from('<H', request)[0]
+        if isinstance(data_type, str) and SIZES[data_type] != size and data_type != 'DWORD':
+            self.violations.append(('mask size mismatch', data_type, size))
+        or_mask = int.from_bytes(request[2:2 + size], 'little')
+        and_mask = int.from_bytes(request[2 + size:2 + 2 * size], 'little')
+        value = int.from_bytes(tag.data[offset:offset + size], 'little')
+        tag.data[offset:offset + size] = ((value | or_mask) & and_mask).to_bytes(size, 'little')
+        return b'\xce\x00\x00\x00'
+
+
+def _error(service, status):
+    return bytes([service | 0x80, 0, status, 0])
+
+
+def _set_string(buffer, offset, value):
+    encoded = value.encode('latin-1')
+    struct.pack_into('<i', buffer, offset, len(encoded))
+    buffer[offset + 4: offset + 4 + len(encoded)] = encoded
+
+
+def _logical_value(path, i):
+    segment = path[i]
+    if segment == 0x28:
+        return path[i + 1], i + 2
+    if segment == 0x29:
+        return struct.unpack_from('<H', path, i + 2)[0], i + 4
+    return struct.unpack_from('<I', path, i + 2)[0], i + 6
+
+
+def _member(data_type, name, offset):
+    member = data_type['internal_tags'][name]
+    offset += member['offset']
+    if member.get('bit') is not None:
+        return ('BOOL', member['bit']), [], offset
+    return member['data_type'], [member['array']] if member.get('array') else [], offset
+
+
+def _element_size(data_type):
+    return 1 if isinstance(data_type, tuple) else type_size(data_type)
+
+
+def _type_header(data_type):
+    if isinstance(data_type, tuple):
+        return struct.pack('<H', DATA_TYPES['BOOL'])
+    if isinstance(data_type, str):
+        return struct.pack('<H', DATA_TYPES[data_type])
+    return b'\xa0\x02' + struct.pack('<H', data_type['template']['structure_handle'])
+
+
+def serve_tcp(sim):
+    """
+    Serves the simulator on a localhost TCP port, replies are sent in two pieces to exercise the receive framing.
+
+    :return: the server, ``server.server_address`` is the address to connect to
+    """
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            buffer = b''
+            while True:
+                data = self.request.recv(65536)
+                if not data:
+                    return
+                buffer += data
+                while len(buffer) >= 24:
+                    size = 24 + struct.unpack_from('<H', buffer, 2)[0]
+                    if len(buffer) < size:
+                        break
+                    frame, buffer = buffer[:size], buffer[size:]
+                    reply = sim.handle(frame)
+                    if reply:
+                        self.request.sendall(reply[:7])
+                        self.request.sendall(reply[7:])
+
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,50 @@
+import pytest
+
+ATOMIC_TAGS = ['DINT1', 'SINT1', 'INT1', 'REAL1', 'LINT1', 'LREAL1', 'UDINT1', 'ULINT1', 'BOOL1']
+
+LIMITS = [  # (tag, data type, min, max)
+    ('SINT1', 'SINT', -128, 127),
+    ('INT1', 'INT', -32768, 32767),
+    ('DINT1', 'DINT', -2 ** 31, 2 ** 31 - 1),
+    ('LINT1', 'LINT', -2 ** 63, 2 ** 63 - 1),
+    ('UDINT1', 'UDINT', 0, 2 ** 32 - 1),
+    ('ULINT1', 'ULINT', 0, 2 ** 64 - 1),
+    ('REAL1', 'REAL', -3.4028234663852886e38, 3.4028234663852886e38),
+    ('LREAL1', 'LREAL', -1.7976931348623157e308, 1.7976931348623157e308),
+]
+
+
+def test_atomic_reads(plc, sim):
+    expected = [(tag, sim.get(tag), sim.tags[tag].data_type) for tag in ATOMIC_TAGS]
+    # each value is at a different offset in the reply of a multi-request, and at the start of a single read
+    assert [(tag.tag, tag.value, tag.type) for tag in plc.read(*ATOMIC_TAGS)] == expected
+    assert [(tag.tag, tag.value, tag.type) for tag in map(plc.read, ATOMIC_TAGS)] == expected
+
+
+@pytest.mark.parametrize('tag, data_type, minimum, maximum', LIMITS)
+def test_atomic_limits(plc, tag, data_type, minimum, maximum):
+    for value in (minimum, maximum):
+        assert plc.write((tag, value))
+        result = plc.read(tag)
+        assert (result.value, result.type) == (value, data_type)
+
+
+def test_atomic_arrays(plc):
+    results = plc.read('SINT_ARY1[3]{5}', 'INT_ARY1{20}', 'LREAL_ARY1[1]{4}', 'DINT_MD[2,0,0]{5}', 'REAL_ARY1{10}')
+    assert [(tag.value, tag.type) for tag in results] == [
+        ([3, 4, 5, 6, 7], 'SINT[5]'),
+        ([i * 10 for i in range(20)], 'INT[20]'),
+        ([i / 3 for i in range(1, 5)], 'LREAL[4]'),
+        (list(range(40, 45)), 'DINT[5]'),
+        (pytest.approx([i / 10 for i in range(10)]), 'REAL[10]'),
+    ]
+
+    assert plc.write(('SINT_ARY1{4}', [-128, -1, 0, 127]), ('LREAL_ARY1[8]{2}', [-0.5, 2.0 ** 60]))
+    assert plc.read('SINT_ARY1{4}').value == [-128, -1, 0, 127]
+    assert plc.read('LREAL_ARY1[8]{2}').value == [-0.5, 2.0 ** 60]
+
+
+def test_struct_member_values(plc):
+    assert plc.read('SimpleUDT1_1').value == {'bool': True, 'sint': 100, 'int': -32768, 'dint': -1, 'real': 1.5}
+    assert [tag.value for tag in plc.read('SimpleUDT1_1.int', 'SimpleUDT1_1.real', 'Big1.Values[118]')] == [
+        -32768, 1.5, 118]
@@ -0,0 +1,43 @@
+import pytest
+
+from pycomm3 import BitSet
+from . import simulated_plc
+
+BOOL_ARY1 = [bool(dword >> bit & 1) for dword in (0x5555ffff, 0xffff0000, 0x80000000) for bit in range(32)]
+BOOL_BIG = [i % 32 == i // 32 % 32 for i in range(12800)]
+
+
+@pytest.mark.parametrize('bitset', [False, True])
+def test_bool_array_reads(sim, bitset):
+    tags = ['bool_ary1{3}', 'bool_ary1[1]{2}', 'bool_ary1[33]', 'bool_ary1[95]', 'BOOL_BIG{400}']
+    with simulated_plc(sim, bitset_bool_arrays=bitset) as plc:
+        results = plc.read(*tags)
+        assert results == [plc.read(tag) for tag in tags]
+
+    assert [(tag.value, tag.type) for tag in results] == [
+        (BOOL_ARY1, 'BOOL[96]'),
+        (BOOL_ARY1[32:], 'BOOL[64]'),
+        (False, 'BOOL'),
+        (True, 'BOOL'),
+        (BOOL_BIG, 'BOOL[12800]'),
+    ]
+    array_type = BitSet if bitset else list
+    assert [type(tag.value) for tag in results] == [array_type, array_type, bool, bool, array_type]
+    assert not sim.violations
+
+
+def test_bitset_values(sim):
+    with simulated_plc(sim, bitset_bool_arrays=True) as plc:
+        bits = plc.read('BOOL_BIG{400}').value
+
+    assert bits.count() == 400
+    assert bits.indices()[:3] == [0, 33, 66]
+    assert bytes(bits) == bytes(sim.tags['BOOL_BIG'].data)
+
+
+def test_bool_array_writes(plc):
+    results = plc.write(('bool_ary1[0]', False), ('bool_ary1[40]', True), ('bool_ary1[95]', False))
+    assert all(results)
+    expected = BOOL_ARY1.copy()
+    expected[0], expected[40], expected[95] = False, True, False
+    assert plc.read('bool_ary1{3}').value == expected
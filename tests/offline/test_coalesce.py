@@ -0,0 +1,49 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import simulated_plc
+
+
+def test_coalesced_reads(sim):
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        return plc.read('DINT1', f'DINT_ARY1[{i}]', 'REAL1')
+
+    with simulated_plc(sim, coalesce_window=0.05) as plc:
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(worker, range(8)))
+
+    for i, (dint1, element, real1) in enumerate(results):
+        assert dint1.value == 20
+        assert element.tag == f'DINT_ARY1[{i}]' and element.value == i * 1000
+        assert abs(real1.value - 100.001) < 0.0001
+    assert len(sim.services) < 8  # the reads were combined
+
+
+def test_coalesce_while_holding_lock(sim):
+    plc = simulated_plc(sim, coalesce_window=0.2)
+    plc.read('DINT1')  # open the connection first, opening it requires the lock
+    results = {}
+
+    def leader():
+        results['leader'] = plc.read('DINT1')
+
+    def lock_holder():
+        while plc._coalescer._batch is None:  # wait for the leader to start a batch
+            time.sleep(0.001)
+        with plc._lock:  # the leader cannot send its batch until the lock is released
+            results['holder'] = plc.read('REAL1')
+
+    threads = [threading.Thread(target=leader, daemon=True), threading.Thread(target=lock_holder, daemon=True)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert not any(thread.is_alive() for thread in threads)
+    plc.close()
+
+    assert results['leader'].value == 20
+    assert abs(results['holder'].value - 100.001) < 0.0001
@@ -0,0 +1,135 @@
+import pytest
+
+from pycomm3 import CommError
+from pycomm3.clx import _TagResult, _join_split_read
+from pycomm3.socket_ import LoopbackSocket
+from . import simulated_plc
+from .simulator import Simulator
+
+
+class CountingSocket(LoopbackSocket):
+    """
+    Loopback socket that counts round trips and can fail a receive
+    """
+
+    def __init__(self, handler):
+        super().__init__(handler)
+        self.round_trips = 0
+        self.fail_after = None  # number of receives before failing
+        self._sent = False
+
+    def send(self, msg, timeout=0):
+        self._sent = True
+        return super().send(msg, timeout)
+
+    def receive(self, timeout=0):
+        if self._sent:
+            self.round_trips += 1
+            self._sent = False
+        if self.fail_after is not None:
+            if not self.fail_after:
+                raise CommError('connection broken')
+            self.fail_after -= 1
+        return super().receive(timeout)
+
+
+class ShortFragmentSimulator(Simulator):
+    """
+    Replies to fragmented reads with less data than the connection allows, a different amount each time
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.fragments = 0
+
+    def _read_fragmented(self, location, request, capacity):
+        self.fragments += 1
+        return super()._read_fragmented(location, request, capacity - (self.fragments % 3) * 12)
+
+
+@pytest.mark.parametrize('pipeline_depth', [1, 4])
+def test_pipelined_fragments(sim, pipeline_depth):
+    sock = CountingSocket(sim.handle)
+    values = [i * 3 for i in range(5000)]
+    with simulated_plc(sim, sock=sock, large_packets=False, pipeline_depth=pipeline_depth) as plc:
+        plc.read('DINT1')
+        sock.round_trips = 0
+        assert plc.write(('BIG_ARY{5000}', values))
+        write_trips, sock.round_trips = sock.round_trips, 0
+        assert plc.read('BIG_ARY{5000}').value == values
+        read_trips = sock.round_trips
+
+    fragments = sum(service == 0x52 for service in sim.services)
+    if pipeline_depth == 1:
+        assert read_trips == fragments
+    else:
+        assert write_trips < fragments / 2 and read_trips < fragments / 2
+    assert not sim.violations
+
+
+def test_pipelined_short_fragments():
+    sim = ShortFragmentSimulator()
+    with simulated_plc(sim, large_packets=False, pipeline_depth=5) as plc:
+        assert plc.read('BIG_ARY{5000}').value == list(range(5000))
+        stream = [value for _, values in plc.read_stream('BIG_REAL{3000}') for value in values]
+        assert stream == [i * 0.5 for i in range(3000)]
+
+
+def test_failure_mid_pipeline(sim):
+    sock = CountingSocket(sim.handle)
+    with simulated_plc(sim, sock=sock, large_packets=False, pipeline_depth=4) as plc:
+        plc.read('DINT1')
+        sock.fail_after = 6  # first reply, then part of a pipeline
+        result = plc.read('BIG_ARY{5000}')
+        assert result.error is not None
+        assert not plc.connected
+
+        sock.fail_after = None
+        plc.open()
+        assert plc.read('BIG_ARY{5000}').value == list(range(5000))
+        assert plc.read('DINT1').value == 20
+
+
+def test_reply_sequence_mismatch(sim):
+    replies = []
+
+    def handler(msg):
+        reply = sim.handle(msg)
+        replies.append(reply)
+        if len(replies) == 6:  # a reply with the wrong sequence count, like a late reply to an earlier request
+            reply = reply[:44] + bytes([reply[44] ^ 0xff]) + reply[45:]
+        return reply
+
+    with simulated_plc(sim, sock=LoopbackSocket(handler), large_packets=False, pipeline_depth=4) as plc:
+        plc.read('DINT1')
+        result = plc.read('BIG_ARY{5000}')
+        assert 'sequence count' in result.error
+        assert not plc.connected
+
+
+def test_split_large_reads(plc, sim):
+    tags = ['BIG_ARY[10]{1000}', 'DINT1', 'REAL_ARY1{10}']
+    reads, splits = plc._split_large_reads(plc._parse_requested_tags(tags))
+    (split, ) = splits
+    head, tail = split['split']
+    assert head['elements'] + tail['elements'] == 1000
+    assert tail['plc_tag'] == f'BIG_ARY[{10 + head["elements"]}]'
+    assert list(reads)[-1] == f'{tail["plc_tag"]}{{{tail["elements"]}}}'  # the tail is read with the other tags
+
+    big_ary, dint1, real_ary = plc.read(*tags)
+    assert (big_ary.tag, big_ary.type, big_ary.value) == ('BIG_ARY[10]', 'DINT[1000]', list(range(10, 1010)))
+    assert dint1.value == 20
+    assert real_ary.value == pytest.approx([i / 10 for i in range(10)])
+    assert not sim.violations
+
+
+def test_join_split_read():
+    head = _TagResult('BIG_ARY[0]', [0, 1, 2], 'DINT[3]')
+    assert _join_split_read(head, _TagResult('BIG_ARY[3]', [3, 4], 'DINT[2]'), 'BIG_ARY[0]', 5).value == [0, 1, 2, 3, 4]
+    joined = _join_split_read(head, _TagResult('BIG_ARY[3]', 3, 'DINT'), 'BIG_ARY[0]', 4)
+    assert (joined.tag, joined.value, joined.type, joined.error) == ('BIG_ARY[0]', [0, 1, 2, 3], 'DINT[4]', None)
+
+    failed = _join_split_read(head, _TagResult('BIG_ARY[3]', None, None, 'tail failed'), 'BIG_ARY[0]', 5)
+    assert (failed.value, failed.error) == (None, 'tail failed')
+    failed = _join_split_read(_TagResult('BIG_ARY[0]', None, None, 'head failed'), head, 'BIG_ARY[0]', 5)
+    assert (failed.value, failed.error) == (None, 'head failed')
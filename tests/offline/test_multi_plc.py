@@ -0,0 +1,88 @@
+import pytest
+
+from pycomm3 import CommError, LogixDriver, MultiPLCReader
+from pycomm3.socket_ import LoopbackSocket
+from .simulator import Simulator
+
+
+class FlakySocket(LoopbackSocket):
+    """
+    Loopback socket that fails sending once ``fail`` is set
+    """
+
+    def __init__(self, handler):
+        super().__init__(handler)
+        self.fail = False
+        self.closed = False
+
+    def send(self, msg, timeout=0):
+        if self.fail:
+            raise CommError('connection broken')
+        return super().send(msg, timeout)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+@pytest.fixture
+def reader():
+    sims = {'10.0.0.1': Simulator(), '10.0.0.2': Simulator()}
+    sims['10.0.0.2'].set('DINT1', [42])
+    sockets = []
+
+    def sock_factory(path):
+        sockets.append(FlakySocket(sims[path].handle))
+        return sockets[-1]
+
+    reader_ = MultiPLCReader({path: ['DINT1', 'REAL_ARY1{3}'] for path in sims},
+                             sock_factory=sock_factory, init_info=False)
+    for path, sim in sims.items():
+        reader_._tag_definitions[path] = (sim.definitions(), {})
+    reader_.sockets = sockets
+    with reader_:
+        yield reader_
+
+
+def test_sock_not_allowed():
+    with pytest.raises(ValueError):
+        MultiPLCReader({'10.0.0.1': ['DINT1']}, sock=LoopbackSocket(Simulator().handle))
+
+
+def test_multi_plc_read(reader):
+    results = reader.read()
+    assert results['10.0.0.1'] and results['10.0.0.2']
+    assert results['10.0.0.1'].tags[0].value == 20
+    assert results['10.0.0.2'].tags[0].value == 42
+    assert results['10.0.0.2'].tags[1].value == pytest.approx([0, 0.1, 0.2])
+    assert len(reader.sockets) == 2
+
+
+def test_tag_errors_keep_connection(reader):
+    reader.plc_tags['10.0.0.1'] = ['NOT_A_TAG']
+    for _ in range(2):
+        result = reader.read()['10.0.0.1']
+        assert not result
+        assert result.tags[0].error is not None
+    assert len(reader.sockets) == 2
+    assert not any(sock.closed for sock in reader.sockets)
+
+
+def test_comm_error_reconnects(reader):
+    reader.read()
+    sock = reader._drivers['10.0.0.1']._sock
+    sock.fail = True
+    result = reader.read()['10.0.0.1']
+    assert not result
+    assert all(tag.error == 'connection broken' for tag in result.tags)
+    assert sock.closed
+    result = reader.read()['10.0.0.1']
+    assert result and result.tags[0].value == 20
+    assert len(reader.sockets) == 3
+
+
+def test_driver_closed_if_init_fails():
+    sock = FlakySocket(lambda msg: None)  # no reply to register session
+    with pytest.raises(CommError):
+        LogixDriver('10.0.0.1', init_tags=False, sock=sock)
+    assert sock.closed
@@ -0,0 +1,91 @@
+import pytest
+
+from pycomm3.clx import _fold_array_reads
+from pycomm3.packets.requests import _find_member_ids
+from . import simulated_plc
+
+READ_TAGS = [
+    'DINT1', 'SINT1', 'INT1', 'REAL1', 'LINT1', 'BOOL1', 'DINT1.0', 'DINT1.31', 'INT1.8', 'DINT_ARY1[99]', 'SINT_ARY1',
+    'DINT_ARY1[10]{3}', 'INT_ARY1[1]{10}', 'REAL_ARY1[2]{2}', 'DINT_ARY1{100}', 'DINT_MD[1,2,3]',
+    'DINT_ARY1[3]', 'DINT_ARY1[4]', 'DINT_ARY1[5]', 'DINT_ARY1[7]', 'DINT_ARY1[40].3', 'DINT_ARY1[41].4',
+    'bool_ary1[0]', 'bool_ary1[1]', 'bool_ary1[32]', 'bool_ary1[95]', 'bool_ary1{3}',
+    'STRING1', 'STRING_ARY1{5}', 'STRING_ARY1[1]', 'STRING_ARY1[2]', 'STRING20_ARY1{10}',
+    'SimpleUDT1_1', 'SimpleUDT1_1.bool', 'SimpleUDT1_1.int', 'Motor1', 'Motor1.Speed', 'Motor1.Name', 'Motor1.Current',
+    'Motor1.Fault', 'Motor1.Hist', 'Motor1.Hist[1]', 'Motor_ARY[1]', 'Motor_ARY[2].Speed', 'Motor_ARY[3].Speed',
+    'BIG_ARY{5000}', 'BIG_ARY[10]', 'BIG_ARY[11]', 'BIG_ARY[4000]{900}', 'BIG_REAL[0]', 'BIG_REAL[2999]',
+    'NOPE',
+]
+
+
+def _result(tag):
+    return tag.tag, tag.value, tag.type, tag.error
+
+
+@pytest.mark.parametrize('large_packets', [True, False])
+def test_multi_read_matches_single_reads(sim, large_packets):
+    with simulated_plc(sim, large_packets=large_packets) as plc:
+        single = [_result(plc.read(tag)) for tag in READ_TAGS]
+        multi = [_result(tag) for tag in plc.read(*READ_TAGS)]
+
+    assert multi == single
+    assert all(error is None for tag, _, __, error in multi if tag != 'NOPE')
+    assert not sim.violations
+
+
+def test_fold_array_reads(plc, sim):
+    tags = ['DINT_ARY1[1]', 'DINT_ARY1[3]', 'DINT_ARY1[5]{2}', 'DINT_ARY1[2]', 'DINT_ARY1[90]']
+    reads = _fold_array_reads(plc._parse_requested_tags(tags))
+    assert sorted(reads) == ['DINT_ARY1[1]{6}', 'DINT_ARY1[90]']
+
+    plc.read('DINT1')
+    services = len(sim.services)
+    results = plc.read(*tags)
+    assert len(sim.services) == services + 1
+    assert [(tag.tag, tag.value, tag.type) for tag in results] == [
+        ('DINT_ARY1[1]', 1000, 'DINT'),
+        ('DINT_ARY1[3]', 3000, 'DINT'),
+        ('DINT_ARY1[5]', [5000, 6000], 'DINT[2]'),
+        ('DINT_ARY1[2]', 2000, 'DINT'),
+        ('DINT_ARY1[90]', 90000, 'DINT'),
+    ]
+
+
+@pytest.mark.parametrize('large_packets', [True, False])
+def test_struct_reads(sim, large_packets):
+    motor_tags = ['Motor1.Speed', 'Motor1.Current', 'Motor1.Fault', 'Motor1.Hist{4}', 'Motor1.Name']
+    big_tags = ['Big1.Values[0]{119}', 'Big1.A', 'Big1.B']
+    with simulated_plc(sim, large_packets=large_packets) as plc:
+        reads = plc._plan_struct_reads(plc._parse_requested_tags(motor_tags + big_tags))
+        assert 'Motor1' in reads
+        # too large for a Multiple Service Packet reply with a standard connection
+        assert ('Big1' in reads) == large_packets
+
+        results = plc.read(*motor_tags, *big_tags)
+
+    assert [tag.value for tag in results] == [1750.0, 12.5, 0, [1, 2, 3, 4], 'Conveyor', list(range(119)), -1, -2]
+    assert not sim.violations
+
+
+@pytest.mark.parametrize('tag, error', [
+    ('NOPE', 'Failed to parse tag request - Tag not found: NOPE'),
+    ('DINT1.A', 'Failed to parse tag request - Tag not found: DINT1.A'),
+    ('DINT_ARY1{0}', 'Failed to parse tag request - Invalid element count: DINT_ARY1{0}'),
+    ('DINT_ARY1[1', 'Failed to parse tag request - Invalid tag address: DINT_ARY1[1'),
+])
+def test_invalid_tag_errors(plc, tag, error):
+    invalid, dint1 = plc.read(tag, 'DINT1')
+    assert invalid.error == error
+    assert dint1.value == 20
+    invalid, dint1 = plc.write((tag, 1), ('DINT1', 1))
+    assert invalid.error == error
+    assert dint1
+
+
+def test_member_id_reads(plc):
+    tags = ['Motor1.Fault', 'Motor_ARY[2].Speed', 'Motor_ARY[3].Current', 'SimpleUDT1_1.dint', 'Motor1.Name.LEN']
+    expected = [_result(tag) for tag in plc.read(*tags)]
+    assert [_find_member_ids(tag, plc.tags) for tag in tags] == [(2,), (0,), (1,), (4,), (4, 0)]
+
+    plc.use_member_ids = True
+    assert [_result(tag) for tag in plc.read(*tags)] == expected
+    assert [_result(plc.read(tag)) for tag in tags] == expected
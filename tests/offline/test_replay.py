@@ -0,0 +1,72 @@
+"""
+Replays ``session.bin``, a session recorded against the simulator, to re-create it run::
+
+    python -m tests.offline.test_replay
+"""
+
+from pathlib import Path
+
+from pycomm3 import LogixDriver
+from pycomm3.const import ENCAPSULATION_COMMAND
+from pycomm3.replay import RecordingSocket, ReplaySocket, iter_records, RECORD_SEND, RECORD_RECEIVE
+from .simulator import Simulator, serve_tcp
+
+SESSION = Path(__file__).parent / 'session.bin'
+
+
+def run_session(plc):
+    return [
+        plc.read('DINT1', 'REAL1', 'STRING1', 'SimpleUDT1_1'),
+        plc.write(('DINT1', 1234)),
+        plc.read('DINT1'),
+        plc.read('BIG_ARY{600}'),  # fragmented, larger than the standard 500 byte connection
+    ]
+
+
+def _replay_driver(sock):
+    plc = LogixDriver('10.0.0.1', init_info=False, init_tags=False, large_packets=False, sock=sock)
+    plc._tags = Simulator().definitions()
+    return plc
+
+
+def test_replay():
+    replay = ReplaySocket(SESSION)
+    with _replay_driver(replay) as plc:
+        (dint1, real1, string1, udt), write, read_back, big_ary = run_session(plc)
+
+    assert replay.finished
+    assert dint1.value == 20 and dint1.type == 'DINT'
+    assert abs(real1.value - 100.001) < 0.0001
+    assert string1.value == 'A Test String'
+    assert udt.value == {'bool': True, 'sint': 100, 'int': -32768, 'dint': -1, 'real': 1.5}
+    assert write and write.value == 1234
+    assert read_back.value == 1234
+    assert big_ary.type == 'DINT[600]'
+    assert big_ary.value == list(range(600))
+
+
+def test_replay_fragments():
+    sent = [data for record, data in iter_records(SESSION) if record == RECORD_SEND]
+    received = [data for record, data in iter_records(SESSION) if record == RECORD_RECEIVE]
+    connected_replies = [data for data in received if data[:2] == ENCAPSULATION_COMMAND['send_unit_data']]
+    fragment_replies = [data for data in connected_replies if data[46] == 0xd2]  # read tag fragmented replies
+    assert len(fragment_replies) > 1
+    assert len(sent) == len(received) + 1  # unregister session has no reply
+
+
+def record_session(filename=SESSION):
+    server = serve_tcp(Simulator())
+    try:
+        host, port = server.server_address
+        sock = RecordingSocket(filename)
+        plc = _replay_driver(sock)
+        plc.attribs['ip address'], plc.attribs['port'] = host, port
+        with plc:
+            run_session(plc)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    record_session()
@@ -0,0 +1,69 @@
+import socket
+import threading
+
+import pytest
+
+from pycomm3 import LogixDriver
+from pycomm3 import socket_
+from pycomm3.socket_ import BaseSocket, Socket, AsyncioSocket
+from .simulator import Simulator, serve_tcp
+
+
+@pytest.fixture
+def server(sim):
+    server_ = serve_tcp(sim)
+    yield server_
+    server_.shutdown()
+    server_.server_close()
+
+
+def tcp_plc(sim, server, sock):
+    plc = LogixDriver('127.0.0.1', init_info=False, init_tags=False, sock=sock)
+    plc.attribs['port'] = server.server_address[1]
+    plc._tags = sim.definitions()
+    return plc
+
+
+def test_base_socket_is_abstract():
+    with pytest.raises(TypeError):
+        BaseSocket()
+
+
+@pytest.mark.parametrize('sock', [
+    lambda: Socket(nodelay=True, quickack=True, recv_size=100, send_buffer_size=65536),
+    lambda: AsyncioSocket(nodelay=True, quickack=True, send_buffer_size=65536, recv_buffer_size=65536),
+], ids=['Socket', 'AsyncioSocket'])
+def test_tcp_transports(sim, server, sock):
+    plc = tcp_plc(sim, server, sock())
+    for _ in range(2):  # transports may be reconnected after closing
+        with plc:
+            dint1, big_ary = plc.read('DINT1', 'BIG_ARY{2000}')
+            assert dint1.value == 20
+            assert big_ary.value == list(range(2000))
+
+
+def test_asyncio_socket_stops_its_loop(sim, server):
+    sock = AsyncioSocket()
+    with tcp_plc(sim, server, sock) as plc:
+        assert plc.read('DINT1').value == 20
+        thread = sock._loop_thread
+        assert thread.is_alive()
+    assert not thread.is_alive()
+    assert sock._loop is None
+    assert thread not in threading.enumerate()
+
+
+@pytest.mark.skipif(not socket_._HAS_SENDMSG, reason='sendmsg not available')
+def test_socket_send_more_buffers_than_iov_max():
+    sock = Socket()
+    sock.sock, peer = socket.socketpair()
+    try:
+        buffers = [bytes([i % 256]) for i in range(socket_.IOV_MAX * 2 + 10)]
+        assert sock.send(buffers) == len(buffers)
+        received = b''
+        while len(received) < len(buffers):
+            received += peer.recv(65536)
+        assert received == b''.join(buffers)
+    finally:
+        sock.close()
+        peer.close()
@@ -0,0 +1,42 @@
+import pytest
+
+from pycomm3 import RequestError
+from . import simulated_plc
+
+
+def test_string_arrays(plc, sim):
+    strings = ['', 'a', 'x' * 20, 'Line 4']
+    results = plc.write(('STRING20_ARY1[2]{4}', strings), ('STRING_ARY1[1]', 'B' * 82))
+    assert all(results)
+    expected = [f'{i}' * 20 for i in range(10)]
+    expected[2:6] = strings
+    assert plc.read('STRING20_ARY1{10}').value == expected
+    assert plc.read('STRING_ARY1{3}').value == ['first', 'B' * 82, 'THIRD']
+    assert not sim.violations
+
+
+def test_string_truncated(plc, sim):
+    assert plc.write(('STRING20_ARY1[0]', 'y' * 25))
+    assert plc.read('STRING20_ARY1[0]').value == 'y' * 20
+    # the length written is the length of the truncated data
+    assert bytes(sim.tags['STRING20_ARY1'].data[:4]) == (20).to_bytes(4, 'little')
+
+
+def test_string_members(plc):
+    assert plc.write(('Motor1.Name', 'Packer'))
+    assert plc.read('Motor1.Name').value == 'Packer'
+    assert plc.read('Motor1').value['Name'] == 'Packer'
+    assert [motor['Name'] for motor in plc.read('Motor_ARY{4}').value] == [''] * 4
+
+
+def test_string_encoding(sim):
+    value = '€10 — naïve'
+    with simulated_plc(sim, string_encoding='cp1252') as plc:
+        assert plc.write(('STRING1', value))
+        assert plc.read('STRING1').value == value
+        with pytest.raises(RequestError):
+            plc.write(('STRING1', '中'))
+
+    assert bytes(sim.tags['STRING1'].data[4:15]) == value.encode('cp1252')
+    with simulated_plc(sim) as plc:
+        assert plc.read('STRING1').value == value.encode('cp1252').decode('latin-1')
@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+from pycomm3 import RequestError
+
+
+def test_read_table(plc):
+    tags = ['REAL1', 'REAL_ARY1[1]', 'BIG_REAL[2999]']
+    table = plc.read_table(*tags)
+    assert list(table) == ['tag', 'value', 'type', 'error', 'packet', 'sent', 'received', 'sent_monotonic',
+                           'received_monotonic']
+    assert table['tag'] == tags
+    assert table['value'].typecode == 'f'
+    assert list(table['value']) == pytest.approx([100.001, 0.1, 1499.5])
+    assert table['type'] == ['REAL'] * 3
+    assert table['error'] == [None] * 3
+    assert list(table['packet']) == [0, 0, 0]
+    assert all(sent <= received for sent, received in zip(table['sent_monotonic'], table['received_monotonic']))
+
+
+def test_read_table_mixed(plc):
+    table = plc.read_table('DINT1', 'STRING1', 'NOPE', 'BIG_ARY{5000}')
+    assert table['value'][:3] == [20, 'A Test String', None]
+    assert table['value'][3] == list(range(5000))
+    assert table['type'] == ['DINT', 'STRING', None, 'DINT[5000]']
+    assert table['error'][2] == 'Failed to parse tag request - Tag not found: NOPE'
+    assert [packet >= 0 for packet in table['packet']] == [True, True, False, True]
+    assert [math.isnan(sent) for sent in table['sent']] == [False, False, True, False]
+
+
+def test_read_table_output(plc):
+    with pytest.raises(RequestError):
+        plc.read_table('DINT1', output='csv')
+
+    pandas = pytest.importorskip('pandas')
+    frame = plc.read_table('DINT1', 'INT1', output='pandas')
+    assert isinstance(frame, pandas.DataFrame)
+    assert list(frame['value']) == [20, 256]
+
+
+def test_columnar_read(plc):
+    tags = ['DINT1', 'STRING1', 'NOPE', 'BIG_ARY{5000}']
+    columns = plc.read(*tags, columnar=True)
+    table = plc.read_table(*tags)
+    assert columns.tag == table['tag']
+    assert columns.value == table['value']
+    assert columns.type == table['type']
+    assert columns.error == table['error']
+    assert [packet.index if packet else -1 for packet in columns.packet] == list(table['packet'])
+    assert columns.packet[2] is None
+    assert all(packet.sent_monotonic <= packet.received_monotonic for packet in columns.packet if packet)
@@ -0,0 +1,29 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pycomm3.socket_ import LoopbackSocket
+from . import simulated_plc
+
+
+def test_concurrent_reads_and_writes(sim):
+    def handler(msg):
+        time.sleep(0)  # let other threads run while a request is outstanding
+        return sim.handle(msg)
+
+    def worker(i):
+        errors = []
+        for value in range(i * 100, i * 100 + 25):
+            write = plc.write((f'DINT_ARY1[{i}]', value))
+            dint1, element, big_ary, string1 = plc.read('DINT1', f'DINT_ARY1[{i}]', 'BIG_ARY[4000]{1000}', 'STRING1')
+            if not (write and dint1.value == 20 and element.value == value and
+                    big_ary.value == list(range(4000, 5000)) and string1.value == 'A Test String'):
+                errors.append((write, dint1, element, big_ary.error, string1))
+        return errors
+
+    with simulated_plc(sim, sock=LoopbackSocket(handler)) as plc:
+        with ThreadPoolExecutor(8) as executor:
+            errors = [error for errors in executor.map(worker, range(8)) for error in errors]
+
+    assert not errors
+    assert not sim.violations
+    assert sim.sequences == list(range(sim.sequences[0], sim.sequences[0] + len(sim.sequences)))
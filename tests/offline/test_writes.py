@@ -0,0 +1,118 @@
+import pytest
+
+from pycomm3 import RequestError
+from . import simulated_plc
+from .simulator import Simulator
+
+
+class StuckSimulator(Simulator):
+    """
+    Replies to writes of the ``stuck`` tags as if they succeeded without changing their values
+    """
+
+    def __init__(self, *stuck):
+        super().__init__()
+        self.stuck = stuck
+
+    def _write(self, location, request):
+        if location[0].name in self.stuck:
+            return b'\xcd\x00\x00\x00'
+        return super()._write(location, request)
+
+
+def test_write_plan(plc, sim):
+    plan = plc.prepare_write('DINT1', 'REAL_ARY1[2]{3}', 'STRING1', 'DINT1.3', 'bool_ary1[33]')
+    for dint, reals, string, bit in [(5, [1.5, 2.5, 3.5], 'hello', True), (6, [4.5, 5.5, 6.5], 'world', False)]:
+        results = plan.execute(dint, reals, string, bit, bit)
+        assert all(results)
+        assert [tag.type for tag in results] == ['DINT', 'REAL[3]', 'STRING', 'BOOL', 'BOOL']
+        assert plc.read('DINT1').value == dint | (bit << 3)
+        assert plc.read('REAL_ARY1[2]{3}').value == reals
+        assert plc.read('STRING1').value == string
+        assert plc.read('bool_ary1[33]').value is bit
+
+    assert not sim.violations
+
+
+def test_write_plan_tags_reloaded(plc):
+    plan = plc.prepare_write('DINT1')
+    assert plan.execute(5)
+
+    plc._tags = dict(plc._tags)
+    with pytest.raises(RequestError):
+        plan.execute(6)
+    assert plc.read('DINT1').value == 5
+    assert plc.prepare_write('DINT1').execute(6)
+
+
+def test_write_request_error_buffers(plc):
+    request = plc.new_request('write_tag')
+    request.add(f'DINT_ARY1[{2 ** 40}]', b'\x00\x00\x00\x00', 1, plc.tags['DINT_ARY1'])  # index too large to encode
+    assert request.error
+    assert request.value_buffers() == {}
+
+
+@pytest.mark.parametrize('tag, error', [
+    ('SINT1.8', 'Bit out of range for SINT: SINT1.8'),
+    ('DINT1.32', 'Bit out of range for DINT: DINT1.32'),
+    ('STRING1.3', 'Bits of STRING cannot be accessed: STRING1.3'),
+    ('SimpleUDT1_1.real.0', 'Bits of REAL cannot be accessed: SimpleUDT1_1.real.0'),
+])
+def test_invalid_bit_writes(plc, sim, tag, error):
+    error = f'Failed to parse tag request - {error}'
+    invalid, bit = plc.write((tag, True), ('INT1.3', True))
+    assert invalid.error == error
+    assert bit
+    assert plc.read('INT1').value == 256 | 1 << 3
+    assert plc.read(tag).error == error
+    with pytest.raises(RequestError, match='out of range|cannot be accessed'):
+        plc.prepare_write(tag)
+    assert not sim.violations
+
+
+def test_real_bit_write(plc, sim):
+    error = 'Failed to parse tag request - Bits of REAL cannot be accessed: REAL1.3'
+    assert plc.write(('REAL1.3', True)).error == error
+    assert plc.read('REAL1.3').error == error
+    assert plc.read('REAL1').value == sim.get('REAL1') == pytest.approx(100.001)
+    assert sim.services.count(0x4e) == 0  # no Read Modify Write was sent
+
+
+VERIFY_WRITES = [
+    ('DINT1', 1234), ('REAL1', 1.1), ('LREAL1', -2.2), ('INT_ARY1[2]{3}', [-1, 0, 1]), ('STRING1', 'verified'),
+    ('SINT1.2', True), ('bool_ary1[40]', False), ('SimpleUDT1_1.dint', 7), ('DINT_MD[1,2,3]', 5),
+]
+
+
+def test_write_verify(plc, sim):
+    services = len(sim.services)
+    results = plc.write(*VERIFY_WRITES, verify=True)
+    assert [tag.error for tag in results] == [None] * len(VERIFY_WRITES)
+    assert len(sim.services) == services + 1  # the reads fit in the packet with the writes
+    assert not sim.violations
+
+
+def test_write_verify_mismatch():
+    sim = StuckSimulator('REAL1', 'STRING1')
+    with simulated_plc(sim) as plc:
+        results = plc.write(*VERIFY_WRITES, verify=True)
+
+    errors = {tag.tag: tag.error for tag in results if tag.error is not None}
+    assert errors == {
+        'REAL1': 'Write verification failed - read back 100.0009994506836',
+        'STRING1': "Write verification failed - read back 'A Test String'",
+    }
+
+
+def test_write_verify_bits_and_value(plc):
+    results = plc.write(('DINT1', 0x100), ('DINT1.3', True), ('DINT1.8', False), verify=True)
+    assert [tag.error for tag in results] == [None] * 3
+    assert plc.read('DINT1').value == 0x8
+
+
+def test_write_verify_large(plc, sim):
+    values = list(range(5000, 0, -1))
+    result = plc.write(('BIG_ARY{5000}', values), verify=True)
+    assert result.error is None
+    assert plc.read('BIG_ARY{5000}').value == values
+    assert not sim.violations
@@ -0,0 +1,29 @@
+import pytest
+from pycomm3 import RequestError
+from pycomm3.address import parse_tag_address
+
+
+address_tests = [  # (address, (tag, base, base index, members, bit, elements, program))
+    ('DINT1', ('DINT1', 'DINT1', (), (), None, 1, None)),
+    ('DINT1.31', ('DINT1', 'DINT1', (), (), 31, 1, None)),
+    ('DINT_ARY1[3].5', ('DINT_ARY1[3]', 'DINT_ARY1', (3, ), (), 5, 1, None)),
+    ('DINT_ARY1[10]{3}', ('DINT_ARY1[10]', 'DINT_ARY1', (10, ), (), None, 3, None)),
+    ('DINT_MD[1,2,3]', ('DINT_MD[1,2,3]', 'DINT_MD', (1, 2, 3), (), None, 1, None)),
+    ('SimpleUDT1_1.int.15', ('SimpleUDT1_1.int', 'SimpleUDT1_1', (), (('int', ()), ), 15, 1, None)),
+    ('UDT_ARY[1].Values[2,3].1', ('UDT_ARY[1].Values[2,3]', 'UDT_ARY', (1, ), (('Values', (2, 3)), ), 1, 1, None)),
+    ('Program:MainProgram.Tag.Member', ('Program:MainProgram.Tag.Member', 'Program:MainProgram.Tag', (),
+                                        (('Member', ()), ), None, 1, 'MainProgram')),
+    ('Local:1:I.Data.3', ('Local:1:I.Data', 'Local:1:I', (), (('Data', ()), ), 3, 1, None)),
+]
+
+
+@pytest.mark.parametrize('address, expected', address_tests)
+def test_parse_tag_address(address, expected):
+    assert tuple(parse_tag_address(address)) == expected
+
+
+@pytest.mark.parametrize('address', ['', '1DINT', 'DINT1..A', 'DINT_ARY1[1', 'DINT_ARY1[1]]', 'DINT_ARY1{x}',
+                                     'DINT1.', 'DINT_MD[1,2,3,4]', 'DINT_ARY1{0}', 'DINT_ARY1[1]{00}'])
+def test_invalid_tag_address(address):
+    with pytest.raises(RequestError):
+        parse_tag_address(address)
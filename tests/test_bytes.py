@@ -0,0 +1,78 @@
+import pytest
+from pycomm3 import BitSet
+from pycomm3.bytes_ import (PACK_DATA_FUNCTION, UNPACK_DATA_FUNCTION, PACK_DATA_FORMAT, DATA_FUNCTION_SIZE,
+                            pack_array, unpack_array, unpack_bool_array, unpack_udint, string_size, encode_string,
+                            encode_strings, decode_string, decode_strings)
+from pycomm3.packets.responses import dword_to_bool_array
+from pycomm3.const import DATA_TYPE_SIZE
+
+
+codec_tests = [  # (data type, value)
+    ('SINT', -128),
+    ('INT', -32768),
+    ('DINT', -2 ** 31),
+    ('LINT', -2 ** 63),
+    ('USINT', 255),
+    ('UINT', 65535),
+    ('UDINT', 2 ** 32 - 1),
+    ('ULINT', 2 ** 64 - 1),
+    ('REAL', 1.5),
+    ('LREAL', 1.5e100),
+    ('DWORD', 0x8000_0001),
+    ('LWORD', 2 ** 64 - 1),
+    ('LTIME', -1),
+]
+
+
+@pytest.mark.parametrize('data_type, value', codec_tests)
+def test_atomic_codec(data_type, value):
+    data = PACK_DATA_FUNCTION[data_type](value)
+    assert len(data) == DATA_TYPE_SIZE[data_type] == DATA_FUNCTION_SIZE[data_type]
+    assert UNPACK_DATA_FUNCTION[data_type](b'\x00' + data, 1) == value
+
+
+@pytest.mark.parametrize('data_type, value', codec_tests)
+def test_array_codec(data_type, value):
+    data = pack_array(data_type, [value, 0, value], 3)
+    assert data == b''.join(PACK_DATA_FUNCTION[data_type](v) for v in (value, 0, value))
+    assert unpack_array(data_type, b'\x00\x00' + data, 3, 2) == [value, 0, value]
+
+
+def test_codec_tables():
+    assert set(PACK_DATA_FORMAT) <= set(PACK_DATA_FUNCTION) & set(UNPACK_DATA_FUNCTION) & set(DATA_TYPE_SIZE)
+    # every sized type other than the SHORT_STRING structure can be decoded
+    assert set(DATA_TYPE_SIZE) - {'SHORT_STRING'} == set(PACK_DATA_FORMAT)
+
+
+def test_bool_array():
+    data = bytes([0b0000_0101, 0, 0, 0b1000_0000])
+    bools = unpack_bool_array(b'\x00\x00' + data, 2, 4)
+    assert len(bools) == 32
+    assert [i for i, bit in enumerate(bools) if bit] == [0, 2, 31]
+    assert bools == dword_to_bool_array(unpack_udint(data))
+
+
+def test_bitset():
+    data = bytes([0b0000_0101, 0, 0, 0b1000_0000])
+    bits = BitSet(data)
+    assert len(bits) == 32
+    assert bits == unpack_bool_array(data)
+    assert list(bits) == unpack_bool_array(data)
+    assert bits[0] and bits[-1] and not bits[1]
+    assert bits[:3] == [True, False, True]
+    assert bits.count() == 3 and bits.count(False) == 29
+    assert bits.indices() == [0, 2, 31]
+    assert bytes(bits) == data
+    with pytest.raises(IndexError):
+        bits[32]
+
+
+def test_string_codec():
+    size = string_size(20)
+    assert size == 24
+    data = encode_strings(['', 'abc', 'x' * 25], 20, size)
+    assert len(data) == 3 * size
+    assert data[size:2 * size] == b'\x03\x00\x00\x00abc' + bytes(17)
+    assert decode_string(data, size) == 'abc'
+    assert decode_strings(b'\x00' + data, 3, size, 1) == ['', 'abc', 'x' * 20]
+    assert decode_strings(encode_string('€', 20, size, 'cp1252'), 1, size, encoding='cp1252') == ['€']
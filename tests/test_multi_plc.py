@@ -0,0 +1,15 @@
+from pycomm3 import MultiPLCReader
+from . import tag_only
+from .test_reads import atomic_tests
+
+
+def test_multi_plc_read(plc_path):
+    tags = [tag for (tag, _, __) in atomic_tests]
+    with MultiPLCReader({plc_path: tags}) as reader:
+        for _ in range(2):
+            results = reader.read()
+            result = results[plc_path]
+            assert result
+            assert result.error is None
+            assert result.elapsed > 0
+            assert [r.tag for r in result.tags] == [tag_only(tag) for tag in tags]
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from math import isclose
 import pytest
 from itertools import chain
@@ -120,3 +121,60 @@ def test_udt_read(plc, tag_name, data_type, value):
 
 
 
+
+
+def test_coalesced_reads(plc):
+    tags = [tag for (tag, _, __) in atomic_tests]
+    plc.coalesce_window = 0.002
+    try:
+        with ThreadPoolExecutor(max_workers=len(tags)) as executor:
+            results = list(executor.map(plc.read, tags))
+    finally:
+        plc.coalesce_window = 0
+
+    for result, (tag, typ, value) in zip(results, atomic_tests):
+        assert result
+        assert result.tag == tag_only(tag)
+        assert result.type == typ
+        if 'REAL' in typ:
+            if isinstance(value, list):
+                assert all(isclose(rval, val, rel_tol=1e-4) for rval, val in zip(result.value, value))
+            else:
+                assert isclose(result.value, value, rel_tol=1e-4)
+        else:
+            assert result.value == value
+
+
+def test_read_stream(plc):
+    values = []
+    for offset, chunk in plc.read_stream('DINT_ARY1{100}'):
+        assert offset == len(values)
+        values.extend(chunk)
+
+    assert values == plc.read('DINT_ARY1{100}').value
+
+
+def test_columnar_read(plc):
+    tags = [tag for (tag, _, __) in atomic_tests]
+    columns = plc.read(*tags, columnar=True)
+    results = plc.read(*tags)
+    assert columns.tag == [result.tag for result in results]
+    assert columns.type == [result.type for result in results]
+    assert columns.error == [None] * len(tags)
+    assert len(columns.value) == len(tags)
+    assert all(packet.sent_monotonic <= packet.received_monotonic for packet in columns.packet)
+
+
+def test_read_table(plc):
+    tags = [tag for (tag, _, __) in atomic_tests]
+    table = plc.read_table(*tags)
+    results = plc.read(*tags)
+    assert table['tag'] == [result.tag for result in results]
+    assert table['type'] == [result.type for result in results]
+    assert table['error'] == [None] * len(tags)
+    assert all(sent <= received for sent, received in zip(table['sent_monotonic'], table['received_monotonic']))
+    assert min(table['packet']) == 0
+
+    table = plc.read_table('DINT1', 'DINT_ARY1[10]', 'DINT_ARY1[99]')
+    assert table['value'].typecode == 'i'
+    assert list(table['value']) == [20, 10000, 99000]
@@ -0,0 +1,18 @@
+from pycomm3 import LogixDriver
+from pycomm3.replay import RecordingSocket, ReplaySocket
+from .test_reads import atomic_tests
+
+
+def test_record_and_replay(plc_path, tmp_path):
+    filename = tmp_path / 'session.bin'
+    tags = [tag for (tag, _, __) in atomic_tests]
+
+    with LogixDriver(plc_path, sock=RecordingSocket(filename)) as plc:
+        recorded = plc.read(*tags)
+
+    replay = ReplaySocket(filename)
+    with LogixDriver(plc_path, sock=replay) as plc:
+        replayed = plc.read(*tags)
+
+    assert replayed == recorded
+    assert replay.finished
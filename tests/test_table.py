@@ -0,0 +1,28 @@
+import pytest
+from pycomm3 import RequestError
+from pycomm3.clx import _TagResult
+from pycomm3.table import PacketTimes, table_columns, table_builder
+
+
+def test_table_columns():
+    packet = PacketTimes(0, 1.0, 2.0, 10.0, 11.0)
+    results = [_TagResult('REAL1', 1.5, 'REAL', None, packet), _TagResult('REAL2', 2.5, 'REAL', None, packet)]
+    columns = table_columns(results)
+    assert columns['tag'] == ['REAL1', 'REAL2']
+    assert columns['value'].typecode == 'f'
+    assert list(columns['value']) == [1.5, 2.5]
+    assert list(columns['packet']) == [0, 0]
+    assert list(columns['sent']) == [1.0, 1.0]
+    assert list(columns['received_monotonic']) == [11.0, 11.0]
+
+    results.append(_TagResult('NOPE', None, None, 'Invalid tag request'))
+    columns = table_columns(results)
+    assert columns['value'] == [1.5, 2.5, None]
+    assert columns['error'] == [None, None, 'Invalid tag request']
+    assert list(columns['packet']) == [0, 0, -1]
+
+
+def test_table_builder():
+    assert table_builder('dict') is dict
+    with pytest.raises(RequestError):
+        table_builder('csv')
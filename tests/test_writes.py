@@ -51,3 +51,34 @@ def test_atomic_writes(plc, tag_name, data_type, value):
     assert result.error is None
     assert result.tag == tag_only(tag_name)
     assert result.type == data_type
+
+
+def test_bit_writes(plc):
+    plc.write(('DINT3', 0), *((f'bool_ary2[{i}]', False) for i in range(64)))
+    bits = [('DINT3.0', True), ('DINT3.5', True), ('DINT3.31', True), ('DINT3.5', False),
+            *((f'bool_ary2[{i}]', True) for i in range(0, 64, 3))]
+    results = plc.write(*bits)
+    assert all(results)
+    assert [result.tag for result in results] == [tag for tag, _ in bits]
+    assert plc.read('DINT3').value == 0x8000_0001 - 2 ** 32
+    assert [tag.value for tag in plc.read(*(f'bool_ary2[{i}]' for i in range(64)))] == [i % 3 == 0 for i in range(64)]
+
+
+def test_write_verify(plc):
+    tags_values = [(tag, value) for tag, _, value in atomic_tests]
+    results = plc.write(*tags_values, verify=True)
+    for result, (tag, data_type, _) in zip(results, atomic_tests):
+        assert result.error is None
+        assert result.tag == tag_only(tag)
+        assert result.type == data_type
+
+
+def test_write_plan(plc):
+    tags, data_types, values = zip(*(test for test in atomic_tests if 'TestAOI2_1' not in test[0]))
+    plan = plc.prepare_write(*tags)
+    for _ in range(2):
+        results = plan.execute(*values)
+        for result, tag, data_type in zip(results, tags, data_types):
+            assert result
+            assert result.tag == tag_only(tag)
+            assert result.type == data_type